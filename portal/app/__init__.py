@@ -1,20 +1,27 @@
+import click
 from flask import Flask
+from app.utils.json_provider import PortalJSONProvider
 from app.utils.logger import configure_logger
+from config import load_config
 import os
 
 def create_app(config_name=None):
     app = Flask(__name__, static_folder='static')
-
+    # Parse and encode JSON with orjson when it is installed
+    app.json = PortalJSONProvider(app)
 
     # Determine the configuration to use
     config_name = config_name or os.getenv("FLASK_CONFIG", "default")
-    
-    if config_name == "development":
-        app.config.from_object("config.development.DevelopmentConfig")
-    elif config_name == "production":
-        app.config.from_object("config.production.ProductionConfig")
-    else:
-        app.config.from_object("config.default.Config")
+    app.config.from_object(load_config(config_name))
+
+    # `flask run` starts the development server once the app is created
+    cli_context = click.get_current_context(silent=True)
+    if cli_context is not None and cli_context.info_name == "run":
+        check_dev_server(app)
+
+    # Choose where the game state is kept before any request can touch it
+    from app.services import state_backend
+    state_backend.init_app(app)
     
     # Register blueprints
     from app.routes.index import bp as index_bp  # Import from index.py
@@ -27,6 +34,8 @@ def create_app(config_name=None):
     from app.routes.pack_items import bp as pack_bp  # Import from pack.py
     from app.routes.game import bp as game_bp  # Import from game
     from app.routes.monsties import bp as monsties_bp  # Import from monsties.py
+    from app.routes.ingest import bp as ingest_bp  # Import from ingest.py
+    from app.routes.events import bp as events_bp  # Import from events.py
 
     app.register_blueprint(index_bp)  # Register index blueprint
     app.register_blueprint(monsters_bp, url_prefix="/monsters")  # Register monsters blueprint
@@ -38,8 +47,28 @@ def create_app(config_name=None):
     app.register_blueprint(pack_bp, url_prefix="/pack")  # Register pack blueprint
     app.register_blueprint(game_bp, url_prefix="/game")  # Register game blueprint
     app.register_blueprint(monsties_bp, url_prefix="/monsties")  # Register monties
+    app.register_blueprint(ingest_bp, url_prefix="/ingest")  # Register ingest blueprint
+    app.register_blueprint(events_bp, url_prefix="/events")  # Register events blueprint
 
     # Setup logging (pass the app to the logger)
     configure_logger(app)  # Pass the app to the logger setup
 
     return app
+
+
+def check_dev_server(app):
+    """
+    Refuse to serve the app with the Werkzeug development server when its configuration does not
+    allow it (e.g. `FLASK_CONFIG=production`), which must use gunicorn instead.
+
+    Args:
+        app (Flask): The app about to be served.
+
+    Raises:
+        RuntimeError: If the configuration does not allow the development server.
+    """
+    if not app.config.get("ALLOW_DEV_SERVER", True):
+        raise RuntimeError(
+            "The development server is disabled by this configuration; "
+            "run `gunicorn -c gunicorn.conf.py run:app` instead."
+        )
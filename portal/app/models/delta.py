@@ -0,0 +1,89 @@
+"""
+This module defines the models of the delta ingest protocol (see `app.routes.ingest`).
+
+- `DeltaEntry`: The fields of one entity that changed, with the entity's sequence number.
+- `Delta`: The body of POST /ingest/delta: delta entries per section.
+- `ResyncSequences`: The sequence numbers sent with a full resync (POST /ingest/resync), which
+  become the baseline the next deltas must follow.
+
+Returns:
+    None: This module does not return any values.
+"""
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Sections that accept deltas: a single document each, and the monsters keyed by ID
+DOCUMENT_SECTIONS = ("player", "pack", "gamestate", "gamestats")
+DELTA_SECTIONS = DOCUMENT_SECTIONS + ("monsters",)
+
+
+class DeltaEntry(BaseModel):
+    """
+    The fields of one entity that changed since its previous sequence number.
+
+    Attributes:
+        id (Optional[int]): The monster ID (monsters only).
+        seq (int): The entity's sequence number, one more than the previous delta or resync.
+        fields (dict): The changed fields and their new values. Nested objects (e.g. a monster's
+            position) may be sent partially.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    id: Optional[int] = None
+    seq: int = Field(ge=0)
+    fields: dict
+
+
+class Delta(BaseModel):
+    """
+    Delta entries per section. A document section takes one entry or a list of entries; entries
+    of the same entity may be sent in any order.
+
+    Attributes:
+        player (list[DeltaEntry]): Changes to the player.
+        pack (list[DeltaEntry]): Changes to the pack, keyed by inventory letter (None empties a
+            slot).
+        gamestate (list[DeltaEntry]): Changes to the game state.
+        gamestats (list[DeltaEntry]): Changes to the game stats.
+        monsters (list[DeltaEntry]): Changes to monsters, each entry with its monster ID.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    player: list[DeltaEntry] = []
+    pack: list[DeltaEntry] = []
+    gamestate: list[DeltaEntry] = []
+    gamestats: list[DeltaEntry] = []
+    monsters: list[DeltaEntry] = []
+
+    @field_validator(*DOCUMENT_SECTIONS, mode="before")
+    @classmethod
+    def wrap_single_entry(cls, value):
+        """Accepts a single entry for a document section."""
+        return [value] if isinstance(value, dict) else value
+
+    @model_validator(mode="after")
+    def check_monster_ids(self):
+        """Requires the monster ID on every monster entry."""
+        if any(entry.id is None for entry in self.monsters):
+            raise ValueError("every monster entry needs an id")
+        return self
+
+
+class ResyncSequences(BaseModel):
+    """
+    The sequence numbers of the entities sent in a full resync.
+
+    Attributes:
+        player (Optional[int]): The player's sequence number.
+        pack (Optional[int]): The pack's sequence number.
+        gamestate (Optional[int]): The game state's sequence number.
+        gamestats (Optional[int]): The game stats' sequence number.
+        monsters (dict[int, int]): The sequence number of each monster, by ID.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    player: Optional[int] = Field(default=None, ge=0)
+    pack: Optional[int] = Field(default=None, ge=0)
+    gamestate: Optional[int] = Field(default=None, ge=0)
+    gamestats: Optional[int] = Field(default=None, ge=0)
+    monsters: dict[int, int] = {}
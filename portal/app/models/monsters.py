@@ -6,6 +6,10 @@ It includes the following classes:
 1. Position: Represents the position of a monster in the game world, with x and y coordinates.
 2. Monster: Represents a monster's attributes and behaviors, including health, attack speed, 
    defense, damage, and position.
+   `MONSTER_LIST` validates a whole list of monster payloads in one pass, and `monster_errors`
+   lists its errors per item. `MONSTER_CHANGES_LIST` validates only the changed fields of
+   monsters (e.g. from a delta), in one pass too.
+3. MonsterRecord: The compact form in which the `MonsterRegistry` stores a validated Monster.
    
 The Monster class is initialized with various attributes and includes methods for converting the
 instance to a dictionary and logging its initialization.
@@ -16,9 +20,12 @@ for data validation and serialization.
 Module Functions:
 - None
 """
+import json
+import sys
 from typing import Optional
 from datetime import datetime, timezone
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, model_validator
+from typing_extensions import TypedDict
 
 # Defines the Position class for tracking coordinates of a Monster
 class Position(BaseModel):
@@ -76,10 +83,16 @@ class Monster(BaseModel):
     spawn_timestamp: Optional[datetime] = None
     death_timestamp: Optional[datetime] = None
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def stamp_spawn_timestamp(self):
+        """Stamps the spawn time of a monster received without one.
+
+        Runs as a validator rather than in `__init__`, so it also applies when monsters are
+        validated through `MONSTER_LIST` or `model_validate_json`.
+        """
         if not self.spawn_timestamp:
             self.spawn_timestamp = datetime.now(timezone.utc)
+        return self
 
     class Config:
         """Configuration class for Pydantic's alias generation.
@@ -100,3 +113,169 @@ class Monster(BaseModel):
                   with field names in lowercase.
         """
         return self.model_dump(by_alias=True)
+
+
+# Validates a list of monster payloads in one pass through pydantic's compiled validator
+MONSTER_LIST = TypeAdapter(list[Monster], config=ConfigDict(title="monsters"))
+
+# The changed fields of a monster: any Monster field but the ID, each checked against its
+# annotation, so a change is validated without revalidating the fields left unchanged
+MonsterChanges = TypedDict("MonsterChanges", {
+    name: field.annotation for name, field in Monster.model_fields.items() if name != "id"
+}, total=False)
+MONSTER_CHANGES_LIST = TypeAdapter(list[MonsterChanges])
+
+
+def monster_errors(error: ValidationError) -> list:
+    """Lists the errors of a `MONSTER_LIST` validation per item.
+
+    Args:
+        error (ValidationError): The validation error.
+
+    Returns:
+        list: One dictionary per error, with the "index" of the monster in the payload (None if
+              the payload itself is invalid), the "field" (dotted path) and the "message".
+    """
+    errors = []
+    for detail in error.errors(include_url=False):
+        location = detail["loc"]
+        errors.append({
+            "index": location[0] if location else None,
+            "field": ".".join(str(part) for part in location[1:]),
+            "message": detail["msg"],
+        })
+    return errors
+
+
+class MonsterRecord:
+    """Compact stored form of a validated Monster.
+
+    A pydantic model carries a per-instance `__dict__`, the set of fields that were set and a
+    nested `Position` model. A record keeps the same values in slots, with the position flattened
+    into `x` and `y` and the repeated strings (type, name and namespace) interned. Records are
+    converted back to the Monster's API shape only when they are serialized.
+
+    Records are never modified once stored; `replace` builds an updated copy.
+
+    Attributes:
+        The Monster fields, except `position`, which is stored as `x` and `y`.
+    """
+    __slots__ = (
+        "id", "name", "pod_name", "namespace", "type", "hp", "max_hp", "is_dead", "is_admin_kill",
+        "depth", "x", "y", "attack_speed", "movement_speed", "accuracy", "defense", "damage_min",
+        "damage_max", "turns_between_regen", "spawn_timestamp", "death_timestamp",
+    )
+
+    @classmethod
+    def from_monster(cls, monster: Monster) -> "MonsterRecord":
+        """Builds the record of a validated Monster.
+
+        Args:
+            monster (Monster): The monster.
+
+        Returns:
+            MonsterRecord: The record.
+        """
+        record = cls.__new__(cls)
+        record.id = monster.id
+        record.name = sys.intern(monster.name)
+        record.pod_name = monster.pod_name
+        record.namespace = sys.intern(monster.namespace) if monster.namespace else monster.namespace
+        record.type = sys.intern(monster.type)
+        record.hp = monster.hp
+        record.max_hp = monster.max_hp
+        record.is_dead = monster.is_dead
+        record.is_admin_kill = monster.is_admin_kill
+        record.depth = monster.depth
+        record.x = monster.position.x
+        record.y = monster.position.y
+        record.attack_speed = monster.attack_speed
+        record.movement_speed = monster.movement_speed
+        record.accuracy = monster.accuracy
+        record.defense = monster.defense
+        record.damage_min = monster.damage_min
+        record.damage_max = monster.damage_max
+        record.turns_between_regen = monster.turns_between_regen
+        record.spawn_timestamp = monster.spawn_timestamp
+        record.death_timestamp = monster.death_timestamp
+        return record
+
+    @staticmethod
+    def record_fields(changes: dict) -> dict:
+        """Converts validated Monster fields (see `MonsterChanges`) to the record's fields.
+
+        Args:
+            changes (dict): The changed Monster fields.
+
+        Returns:
+            dict: The same changes for `replace`, with the position as `x` and `y` and the
+                repeated strings interned.
+        """
+        fields = dict(changes)
+        position = fields.pop("position", None)
+        if position is not None:
+            fields["x"], fields["y"] = position.x, position.y
+        for name in ("name", "type", "namespace"):
+            if fields.get(name):
+                fields[name] = sys.intern(fields[name])
+        return fields
+
+    def replace(self, **changes) -> "MonsterRecord":
+        """Builds a copy of the record with some fields changed.
+
+        Args:
+            **changes: The fields to change and their new values.
+
+        Returns:
+            MonsterRecord: The updated copy.
+        """
+        record = MonsterRecord.__new__(MonsterRecord)
+        for field in self.__slots__:
+            setattr(record, field, changes[field] if field in changes else getattr(self, field))
+        return record
+
+    @property
+    def position(self) -> Position:
+        """The position of the monster, as a Position model."""
+        return Position.model_construct(x=self.x, y=self.y)
+
+    def dict(self) -> dict:
+        """Converts the record to the Monster's dictionary form (as `Monster.model_dump`).
+
+        Returns:
+            dict: The monster's fields, with the position as a nested dictionary.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "pod_name": self.pod_name,
+            "namespace": self.namespace,
+            "type": self.type,
+            "hp": self.hp,
+            "max_hp": self.max_hp,
+            "is_dead": self.is_dead,
+            "is_admin_kill": self.is_admin_kill,
+            "depth": self.depth,
+            "position": {"x": self.x, "y": self.y},
+            "attack_speed": self.attack_speed,
+            "movement_speed": self.movement_speed,
+            "accuracy": self.accuracy,
+            "defense": self.defense,
+            "damage_min": self.damage_min,
+            "damage_max": self.damage_max,
+            "turns_between_regen": self.turns_between_regen,
+            "spawn_timestamp": self.spawn_timestamp,
+            "death_timestamp": self.death_timestamp,
+        }
+
+    def to_json(self) -> str:
+        """Encodes the record as Monster JSON, which `Monster.model_validate_json` accepts.
+
+        Returns:
+            str: The JSON document.
+        """
+        data = self.dict()
+        for field in ("spawn_timestamp", "death_timestamp"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return json.dumps(data)
@@ -6,4 +6,6 @@ from .gamestate import bp  # Import 'bp' from gamestate.py
 from .gamestats import bp  # Import 'bp' from gamestats.py
 from .equipped_items import bp  # Import 'bp' from items.py
 from .pack_items import bp  # Import 'bp' from pack.py
-from .game import bp  # Import 'bp' from game.py
\ No newline at end of file
+from .game import bp  # Import 'bp' from game.py
+from .ingest import bp  # Import 'bp' from ingest.py
+from .events import bp  # Import 'bp' from events.py
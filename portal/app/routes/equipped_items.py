@@ -2,12 +2,12 @@
 This module defines the `items` blueprint for managing equipped items and exposing 
 related metrics.
 
-It provides routes for receiving equipped item metrics data, updating in-memory storage, 
-and Prometheus metrics. The `EquippedItems` model is used to validate and store the structured 
-data for equipped items, including weapons, armor, and rings.
+It provides routes for receiving equipped item metrics data and updating in-memory storage. The
+`EquippedItems` model is used to validate and store the structured data for equipped items,
+including weapons, armor, and rings.
 
-Prometheus metrics are updated based on the attributes of the equipped items, such as weapon damage 
-and armor defense.
+The related Prometheus metrics, such as weapon damage and armor defense, are read from the stored
+items when `/metrics` is scraped (see `app.services.metrics`).
 
 Returns:
     None: This module does not return values directly but provides Flask routes and 
@@ -16,26 +16,25 @@ Returns:
 
 from flask import Blueprint, request, jsonify, current_app
 from app.models.items import EquippedItems
-from prometheus_client import Gauge
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
+from app.services.state import SnapshotDict
+from app.services.versions import store_versions, versioned, ITEMS
 
 bp = Blueprint('items', __name__)
 
-# Item Metrics (Prometheus Gauges for tracking in-game data)
-item_weapon_damage_min = Gauge('brogue_weapon_damage_min', 'Minimum damage of equipped weapon')
-item_weapon_damage_max = Gauge('brogue_weapon_damage_max', 'Maximum damage of equipped weapon')
-item_armor_defense = Gauge('brogue_armor_defense', 'Defense of equipped armor')
-
 # In-memory storage for equipped items
-equipped_items = {}
+equipped_items = SnapshotDict("items")
 
 @bp.route('/update', methods=['POST'], strict_slashes=False)
+@deduplicated(ITEMS)
 def receive_equipped_items():
     """
-    Receives equipped item metrics data and updates in-memory storage as well as Prometheus metrics.
+    Receives equipped item metrics data and updates in-memory storage.
 
     This route handles POST requests that contain equipped item metrics data (e.g., weapon damage,
-    armor defense). It validates the incoming data using the `EquippedItems` model, updates both the 
-    in-memory `equipped_items` storage, and updates the corresponding Prometheus metrics.
+    armor defense). It validates the incoming data using the `EquippedItems` model, and updates the
+    in-memory `equipped_items` storage.
 
     Returns:
         Response: A JSON response indicating the success or failure of the request, along with the 
@@ -53,20 +52,7 @@ def receive_equipped_items():
         items = EquippedItems(**data)
 
         # Update the in-memory items data
-        equipped_items.update({
-            "weapon": items.weapon,
-            "armor": items.armor,
-            "ringLeft": items.left_ring,
-            "ringRight": items.right_ring
-        })
-
-        # Update Prometheus metrics for weapon damage and armor defense
-        if items.weapon and items.weapon.damage:
-            item_weapon_damage_min.set(items.weapon.damage.min)
-            item_weapon_damage_max.set(items.weapon.damage.max)
-
-        if items.armor:
-            item_armor_defense.set(items.armor.armor)
+        apply_equipped_items(items)
 
         # Return a success response along with the received equipped items data
         return jsonify({"status": "success", "message": "equipped items received"}), 200
@@ -76,7 +62,28 @@ def receive_equipped_items():
         current_app.logger.error(f"Error processing equipped item data: {e}")
         return jsonify({"error": str(e)}), 400
 
+def apply_equipped_items(items: EquippedItems):
+    """
+    Stores validated equipped items in the in-memory storage.
+
+    Args:
+        items (EquippedItems): The validated equipped items.
+    """
+    # Update the in-memory items data
+    equipped_items.update({
+        key: item.model_dump() if item else None for key, item in (
+            ("weapon", items.weapon),
+            ("armor", items.armor),
+            ("ringLeft", items.left_ring),
+            ("ringRight", items.right_ring),
+        )
+    })
+
+    store_versions.bump(ITEMS)
+    event_broker.publish("items")
+
 @bp.route('/data', methods=['GET'], strict_slashes=False)
+@versioned(ITEMS, cache=True)
 def get_equipped_items():
     """
     Returns the current equipped items data.
@@ -89,10 +96,9 @@ def get_equipped_items():
         the data is not available.
     """
     # Check if the equipped items data exists
-    if not equipped_items:
+    items = equipped_items.snapshot()
+    if not items:
         return jsonify({"error": "Equipped items data not available"}), 404
 
     # Return the equipped items data as a JSON response
-    equipped_items_data = {key: item.model_dump() for key, item in equipped_items.items()}
-
-    return jsonify(equipped_items_data)
+    return jsonify(items)
@@ -0,0 +1,88 @@
+"""
+This module defines the `events` blueprint, which streams change events to the dashboards using
+Server-Sent Events.
+
+Instead of polling every data endpoint once a second, the dashboard pages open one `EventSource`
+on this stream and only fetch or patch their data when an event tells them it changed.
+
+Behind several workers sharing a SQLite state backend, each event goes through the backend's event
+log, so a dashboard gets the changes made by every worker, not only the one it is connected to.
+Events that every worker raises on its own (monsties, from each worker's informer) may arrive more
+than once; they carry no data and only ask for a refetch.
+
+An open stream holds one of the worker's threads. So that dashboards never take the threads the
+game's ingest requests need, a worker serves at most `EVENTS_MAX_STREAMS` streams at once and
+answers further ones with a 503 (the dashboard polls meanwhile and tries again later), and every
+stream is closed after `EVENTS_STREAM_MAX_SECONDS`, letting the browser reconnect to any worker.
+
+Endpoints:
+- /: Streams change events as `text/event-stream`.
+
+Event types:
+- monster-spawned, monster-updated, monster-died: The monster's data.
+- player, items, pack, gamestate, gamestats: No data; the matching `/data` endpoint changed.
+- monsties: No data; the monstie Deployments or Pods changed.
+- reset: No data; the game was reset.
+- resync: No data; events were dropped and the dashboard should fetch everything again.
+
+Returns:
+    None: This module does not return values directly but defines routes for the Flask application.
+"""
+import time
+from flask import Blueprint, Response, current_app
+from app.services.events import event_broker
+
+bp = Blueprint('events', __name__)
+
+# Seconds a dashboard refused for lack of stream slots waits before opening a stream again
+REFUSED_RETRY_SECONDS = 10
+
+
+@bp.record_once
+def init_event_broker(state):
+    """
+    Binds the event broker to the app when the blueprint is registered.
+    """
+    event_broker.init_app(state.app)
+
+
+@bp.route('/', methods=['GET'], strict_slashes=False)
+def stream_events():
+    """
+    Streams change events to a dashboard.
+
+    A comment line is sent whenever no event has been sent for `EVENTS_HEARTBEAT_SECONDS`, so
+    proxies keep the connection open and closed connections are noticed.
+
+    Returns:
+        Response: A `text/event-stream` response that stays open until the client disconnects or
+        `EVENTS_STREAM_MAX_SECONDS` pass, or a 503 response if the worker already serves
+        `EVENTS_MAX_STREAMS` streams.
+    """
+    heartbeat = current_app.config.get("EVENTS_HEARTBEAT_SECONDS", 15)
+    lifetime = current_app.config.get("EVENTS_STREAM_MAX_SECONDS", 300)
+    subscription = event_broker.subscribe()
+    if subscription is None:
+        return Response(f"retry: {REFUSED_RETRY_SECONDS * 1000}\n\n", status=503,
+                        mimetype="text/event-stream",
+                        headers={"Retry-After": str(REFUSED_RETRY_SECONDS)})
+
+    def stream():
+        deadline = time.monotonic() + lifetime
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = subscription.get(timeout=min(heartbeat, remaining))
+            if message is None and time.monotonic() >= deadline:
+                return
+            yield message if message is not None else ": keep-alive\n\n"
+
+    response = Response(stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    # Also runs if the stream is closed before it started, unlike a `finally` in the generator
+    response.call_on_close(lambda: event_broker.unsubscribe(subscription))
+    return response
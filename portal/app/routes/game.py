@@ -16,8 +16,13 @@ from app.routes.player import player_data
 from app.routes.equipped_items import equipped_items
 from app.routes.gamestate import game_state_data
 from app.routes.pack_items import pack_items
-from app.routes.monsters import active_monsters, all_monsters, dead_monsters, k8s_service
-from app.routes.monsties import monsties, new_monsties
+from app.routes.monsters import (
+    k8s_service, monster_registry, monster_sequences, monster_sync, MONSTER_NAMESPACE
+)
+from app.routes.ingest import document_sequences
+from app.routes.monsties import monsties
+from app.services.events import event_broker
+from app.services import versions
 
 bp = Blueprint('game', __name__)
 
@@ -67,14 +72,13 @@ def reset_game():
         Response: A JSON response indicating the status of the reset operation.
     """
     # Reset monsters
-    active_monsters.clear()
-    all_monsters.clear()
-    dead_monsters.clear()
-    k8s_service.delete_all_monsters_in_namespace("dungeon-master-system")
+    monster_registry.clear()
+    monster_sequences.clear()
+    monster_sync.clear()  # Pending and in-flight writes would recreate the deleted resources
+    k8s_service.delete_all_monsters_in_namespace(MONSTER_NAMESPACE)
     
     # Reset monsties
     monsties.clear()
-    new_monsties.clear()
 
     # Reset player data
     player_data.clear()
@@ -88,4 +92,13 @@ def reset_game():
     # Reset pack items
     pack_items.clear()
 
+    # Deltas must follow a new full resync
+    document_sequences.clear()
+
+    versions.store_versions.bump(
+        versions.MONSTERS, versions.MONSTIES, versions.PLAYER, versions.ITEMS,
+        versions.GAME_STATE, versions.PACK
+    )
+    event_broker.publish("reset")
+
     return jsonify({"status": "success"}), 200
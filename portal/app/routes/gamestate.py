@@ -3,8 +3,9 @@ This module defines the `gamestate` blueprint for managing the game state and ex
 related metrics.
 
 It provides endpoints for receiving game state data, storing it in memory, and retrieving 
-the current game state. Additionally, it defines Prometheus metrics for tracking various 
-aspects of the game, such as reward rooms, monster spawn fuse, and total gold generated.
+the current game state. The related Prometheus metrics, such as reward rooms, monster spawn fuse, and total gold
+generated, are read from the stored game state when `/metrics` is scraped (see
+`app.services.metrics`).
 
 Returns:
     None: This module does not return values directly but provides Flask routes and 
@@ -12,24 +13,18 @@ Returns:
 """
 from flask import Blueprint, request, jsonify
 from app.models.gamestate import GameState
-from prometheus_client import Gauge
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
+from app.services.state import SnapshotDict
+from app.services.versions import store_versions, versioned, GAME_STATE
 
 bp = Blueprint('gamestate', __name__)
 
-# Game State Metrics (Prometheus gauges for tracking in-game data)
-game_reward_rooms = Gauge('brogue_reward_rooms_generated', 'Number of reward rooms generated')
-game_has_ended = Gauge('brogue_game_has_ended', 'Indicates if the game has ended')
-game_monster_spawn_fuse = Gauge('brogue_monster_spawn_fuse', 'Time until a monster spawns')
-game_gold_generated = Gauge('brogue_gold_generated', 'Total amount of gold generated')
-game_absolute_turn_number = Gauge('brogue_absolute_turn_number',
-                                  'Total turns since the beginning of the game')
-game_milliseconds = Gauge('brogue_milliseconds_since_launch', 'Milliseconds since game launch')
-game_xpxp_this_turn = Gauge('brogue_xpxp_this_turn', 'Squares explored this turn')
-
 # In-memory storage for the current game state
-game_state_data = {}
+game_state_data = SnapshotDict("gamestate")
 
 @bp.route('/update', methods=['POST'], strict_slashes=False)
+@deduplicated(GAME_STATE)
 def receive_game_state():
     """
     Receives game state data and updates the in-memory storage.
@@ -54,8 +49,7 @@ def receive_game_state():
         game_state = GameState(**data)
 
         # Update the in-memory game_state_data with the latest received game state
-        # Use the model's model_dump() method to get the validated data as a dictionary
-        game_state_data.update(game_state.model_dump())
+        apply_game_state(game_state)
 
         # Return a success response along with the received game state data
         return jsonify({"status": "success", "received": game_state.model_dump()}), 200
@@ -64,7 +58,20 @@ def receive_game_state():
         # If an error occurs during parsing or validation, return an error response
         return jsonify({"error": str(e)}), 400
 
+def apply_game_state(game_state: GameState):
+    """
+    Stores a validated game state in the in-memory storage.
+
+    Args:
+        game_state (GameState): The validated game state.
+    """
+    # Use the model's model_dump() method to get the validated data as a dictionary
+    game_state_data.update(game_state.model_dump())
+    store_versions.bump(GAME_STATE)
+    event_broker.publish("gamestate")
+
 @bp.route('/data', methods=['GET'])
+@versioned(GAME_STATE, cache=True)
 def get_game_state():
     """
     Returns the current game state data.
@@ -77,8 +84,9 @@ def get_game_state():
         data is not available.
     """
     # Check if the game state data exists in memory
-    if not game_state_data:
+    data = game_state_data.snapshot()
+    if not data:
         return jsonify({"error": "Game state data not available"}), 404
 
     # Return the game state data as a JSON response
-    return jsonify(game_state_data)
+    return jsonify(data)
@@ -3,9 +3,9 @@ This module defines the `gamestats` blueprint for managing game statistics and e
 related metrics.
 
 It provides endpoints for receiving game stats data, storing it in memory, and retrieving
-the current game stats. Additionally, it defines Prometheus metrics for tracking various
-aspects of the game, such as the number of games played, the highest score, win streaks,
-and other cumulative game stats.
+the current game stats. The related Prometheus metrics, such as the number of games played, the highest score, win
+streaks, and other cumulative game stats, are read from the stored game stats when `/metrics` is
+scraped (see `app.services.metrics`).
 
 Returns:
     None: This module does not return any values directly but provides Flask routes and 
@@ -13,37 +13,18 @@ Returns:
 """
 from flask import Blueprint, request, jsonify
 from app.models.gamestats import GameStats
-from prometheus_client import Gauge
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
+from app.services.state import SnapshotDict
+from app.services.versions import store_versions, versioned, GAME_STATS
 
 bp = Blueprint('gamestats', __name__)
 
-# Prometheus Gauges for Game Stats (These will track various game metrics)
-games_played = Gauge('brogue_games_played', 'Total games played')
-games_escaped = Gauge('brogue_games_escaped', 'Total games escaped')
-games_mastered = Gauge('brogue_games_mastered', 'Total games mastered')
-games_won = Gauge('brogue_games_won', 'Total games won')
-win_rate = Gauge('brogue_win_rate', 'Win rate as a percentage')
-deepest_level = Gauge('brogue_game_deepest_level', 'Deepest level reached')
-cumulative_levels = Gauge('brogue_cumulative_levels',
-                          'Total cumulative levels reached across all games')
-highest_score = Gauge('brogue_highest_score', 'Highest score achieved')
-cumulative_score = Gauge('brogue_cumulative_score', 'Cumulative score across all games')
-most_gold = Gauge('brogue_most_gold', 'Most gold collected in a single game')
-cumulative_gold = Gauge('brogue_cumulative_gold', 'Cumulative gold collected across all games')
-most_lumenstones = Gauge('brogue_most_lumenstones', 'Most lumenstones collected in a single game')
-cumulative_lumenstones = Gauge('brogue_cumulative_lumenstones',
-                               'Cumulative lumenstones collected across all games')
-fewest_turns_win = Gauge('brogue_fewest_turns_win', 'Fewest turns taken to win a game')
-cumulative_turns = Gauge('brogue_cumulative_turns', 'Cumulative turns played across all games')
-longest_win_streak = Gauge('brogue_longest_win_streak', 'Longest win streak')
-longest_mastery_streak = Gauge('brogue_longest_mastery_streak', 'Longest mastery streak')
-current_win_streak = Gauge('brogue_current_win_streak', 'Current win streak')
-current_mastery_streak = Gauge('brogue_current_mastery_streak', 'Current mastery streak')
-
 # In-memory storage for the current game stats
-game_stats_data = {}
+game_stats_data = SnapshotDict("gamestats")
 
 @bp.route('/update', methods=['POST'], strict_slashes=False)
+@deduplicated(GAME_STATS)
 def receive_game_stats():
     """
     Receives game stats data and updates the in-memory storage.
@@ -70,8 +51,7 @@ def receive_game_stats():
         game_stats = GameStats(**data)  # Creates a GameStats instance and validates the data
 
         # Update the in-memory game_stats_data with the latest received game stats
-        # Use model_dump to store the validated fields from the GameStats model
-        game_stats_data.update(game_stats.model_dump())
+        apply_game_stats(game_stats)
 
         # Return the updated game stats in the response
         return jsonify({"status": "success", "message": "game stats received"}), 200
@@ -79,7 +59,20 @@ def receive_game_stats():
         # Return an error response if validation fails or if there's any issue processing the data
         return jsonify({"error": str(e)}), 400
 
+def apply_game_stats(game_stats: GameStats):
+    """
+    Stores validated game stats in the in-memory storage.
+
+    Args:
+        game_stats (GameStats): The validated game stats.
+    """
+    # Use model_dump to store the validated fields from the GameStats model
+    game_stats_data.update(game_stats.model_dump())
+    store_versions.bump(GAME_STATS)
+    event_broker.publish("gamestats")
+
 @bp.route('/data', methods=['GET'])
+@versioned(GAME_STATS, cache=True)
 def get_game_stats():
     """
     Returns the current game stats data.
@@ -93,8 +86,9 @@ def get_game_stats():
         no stats are available.
     """
     # Check if game stats data exists in memory
-    if not game_stats_data:
+    data = game_stats_data.snapshot()
+    if not data:
         return jsonify({"error": "Game stats data not available"}), 404
 
     # Return the game stats data as a JSON response
-    return jsonify(game_stats_data)
+    return jsonify(data)
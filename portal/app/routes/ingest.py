@@ -0,0 +1,456 @@
+"""
+This module defines the `ingest` blueprint for receiving a whole game snapshot in one request.
+
+Instead of posting the player, monsters, equipped items, pack, game state and game stats to six
+separate endpoints every tick, the game can send all of them to `/ingest/tick` in one body. Each
+section is validated with the same pydantic model used by its dedicated route, and the sections
+are only stored once every section present in the body has validated.
+
+The sections of a tick are stored in one state backend transaction (see
+`app.services.state_backend`), so no other write lands between them. With a shared backend, the
+other workers see all of a tick or none of it, store versions included. With the memory backend,
+readers of the worker may see the sections stored one after another.
+
+Like the dedicated routes, the tick route skips a body identical to the last one it accepted (see
+`app.services.ingest_dedup`).
+
+The game can also send only what changed (the delta protocol). Every entity (the player, the
+pack, the game state, the game stats and each monster) carries its own sequence number:
+- `/ingest/resync` stores full sections, like a tick, and sets the sequence numbers the next
+  deltas must follow. The client sends it at startup, after a reset and whenever the portal asks
+  for it.
+- `/ingest/delta` receives the changed fields of entities, each with the entity's next sequence
+  number. The fields of a document are merged into the stored document, and the merged document
+  is validated with its pydantic model. A monster's changed fields are validated on their own,
+  against their `Monster` annotations, and replace the fields of the stored record, so a move
+  neither revalidates nor reindexes the monster. Entries may arrive out of order within a body;
+  stale entries are dropped, and an entity whose sequence has a gap (or was never resynced) is not
+  changed past the gap and is listed in the response's `resync` for the client to resend in full.
+  Equipped items have no delta form. A delta is read, merged, sequenced and stored in one backend
+  transaction, so two deltas of the same entity are merged one after the other rather than from
+  the same stored value.
+
+Endpoints:
+- /tick: Receives a combined game snapshot via a POST request and updates the in-memory storage.
+- /resync: Receives full sections with their sequence numbers, the baseline of later deltas.
+- /delta: Receives the changed fields of entities with their sequence numbers.
+
+Expected payload (every section is optional, but at least one must be present):
+    {
+        "player": {...},       # Same body as POST /player/update
+        "monsters": [...],     # Same body as POST /monsters/update
+        "items": {...},        # Same body as POST /items/update
+        "pack": {...},         # Same body as POST /pack/update
+        "gamestate": {...},    # Same body as POST /gamestate/update
+        "gamestats": {...}     # Same body as POST /gamestats/update
+    }
+
+Resync payload: a tick payload, plus the sequence number of every entity it sends:
+    {
+        "player": {...}, "monsters": [...], ...,
+        "seq": {"player": 12, "monsters": {"7": 40}, ...}
+    }
+
+Delta payload (see `app.models.delta.Delta`):
+    {
+        "player": {"seq": 13, "fields": {"gold": 130}},
+        "pack": {"seq": 5, "fields": {"c": null}},
+        "monsters": [{"id": 7, "seq": 41, "fields": {"position": {"x": 12}}}]
+    }
+"""
+from flask import Blueprint, request, jsonify, current_app
+from pydantic import ValidationError
+from app.models.delta import DOCUMENT_SECTIONS, Delta, ResyncSequences
+from app.models.player import Player
+from app.models.items import EquippedItems, Item, Pack
+from app.models.gamestate import GameState
+from app.models.gamestats import GameStats
+from app.models.monsters import MONSTER_CHANGES_LIST, Monster, MonsterRecord, monster_errors
+from app.routes.player import apply_player, player_data
+from app.routes.monsters import (
+    apply_monster_changes, apply_monsters, monster_registry, monster_sequences, validate_monsters
+)
+from app.routes.equipped_items import apply_equipped_items
+from app.routes.pack_items import apply_pack_items, apply_pack_slots, pack_items, EMPTY_PACK
+from app.routes.gamestate import apply_game_state, game_state_data
+from app.routes.gamestats import apply_game_stats, game_stats_data
+from app.services.delta import follow_sequence, merge_fields
+from app.services.ingest_dedup import deduplicated, TICK
+from app.services.state import SequenceMap
+from app.services.state_backend import get_backend
+from app.services.versions import PLAYER, MONSTERS, ITEMS, PACK, GAME_STATE, GAME_STATS
+
+bp = Blueprint('ingest', __name__)
+
+# Order in which validated sections are applied to the in-memory storage
+TICK_SECTIONS = ("player", "monsters", "items", "pack", "gamestate", "gamestats")
+
+# Last delta sequence number applied to each document section (the monsters' are kept by the
+# monsters blueprint)
+document_sequences = SequenceMap("ingest_sequences")
+
+# Stores and models of the document sections merged field by field (the pack is merged by slot)
+DOCUMENTS = {
+    "player": (player_data, Player),
+    "gamestate": (game_state_data, GameState),
+    "gamestats": (game_stats_data, GameStats),
+}
+
+# Monster fields a delta may change (the ID identifies the monster)
+MONSTER_DELTA_FIELDS = frozenset(Monster.model_fields) - {"id"}
+
+
+def _validate_section(section: str, data):
+    """
+    Validates a single section of a tick payload with its pydantic model.
+
+    Args:
+        section (str): The name of the section (one of `TICK_SECTIONS`).
+        data: The raw section data from the request body.
+
+    Returns:
+        The validated model (or list of models for the monsters section).
+
+    Raises:
+        ValueError, TypeError, KeyError: If the section data is invalid.
+    """
+    if section == "player":
+        Player(**data)
+        return data
+    if section == "monsters":
+        return validate_monsters(data)
+    if section == "items":
+        return EquippedItems(**data)
+    if section == "pack":
+        return Pack(**data)
+    if section == "gamestate":
+        return GameState(**data)
+    return GameStats(**data)
+
+
+def _apply_section(section: str, validated):
+    """
+    Stores a validated section of a tick payload.
+
+    Args:
+        section (str): The name of the section (one of `TICK_SECTIONS`).
+        validated: The value returned by `_validate_section` for this section.
+    """
+    if section == "player":
+        apply_player(validated)
+    elif section == "monsters":
+        apply_monsters(validated)
+    elif section == "items":
+        apply_equipped_items(validated)
+    elif section == "pack":
+        apply_pack_items(validated)
+    elif section == "gamestate":
+        apply_game_state(validated)
+    else:
+        apply_game_stats(validated)
+
+
+@bp.route('/tick', methods=['POST'], strict_slashes=False)
+@deduplicated(TICK, PLAYER, MONSTERS, ITEMS, PACK, GAME_STATE, GAME_STATS)
+def receive_tick():
+    """
+    Receives a combined game snapshot and updates the in-memory storage.
+
+    Every section present in the body is validated before any of them is stored, in one backend
+    transaction. If one or more sections are invalid, nothing is stored and a 400 response listing
+    the errors per section is returned.
+
+    Returns:
+        Response: A JSON response indicating the status of the update and the sections applied.
+    """
+    validated, error = _validate_tick(request.json)
+    if error:
+        return error
+
+    with get_backend().transaction():
+        for section, value in validated.items():
+            _apply_section(section, value)
+
+    return jsonify({"status": "success", "sections": list(validated)}), 200
+
+
+def _validate_tick(data) -> tuple:
+    """
+    Validates every section of a tick payload.
+
+    Args:
+        data: The request body.
+
+    Returns:
+        tuple: The validated sections (see `_validate_section`) in `TICK_SECTIONS` order, and None,
+            or None and the 400 response to return.
+    """
+    if not data or not isinstance(data, dict):
+        return None, (jsonify({"error": "No JSON payload received"}), 400)
+
+    unknown_sections = sorted(set(data) - set(TICK_SECTIONS))
+    if unknown_sections:
+        return None, (jsonify({"error": "Unknown tick sections", "sections": unknown_sections}),
+                      400)
+
+    validated = {}
+    errors = {}
+    for section in TICK_SECTIONS:
+        if not data.get(section):
+            continue
+        try:
+            validated[section] = _validate_section(section, data[section])
+        except (ValueError, TypeError, KeyError) as e:
+            errors[section] = str(e)
+
+    if errors:
+        current_app.logger.error("Error validating tick data: %s", errors)
+        return None, (jsonify({"error": "Invalid tick data", "sections": errors}), 400)
+
+    if not validated:
+        return None, (jsonify({"error": "No tick sections received"}), 400)
+
+    return validated, None
+
+
+@bp.route('/resync', methods=['POST'], strict_slashes=False)
+def receive_resync():
+    """
+    Receives full sections with their sequence numbers and stores them, like a tick. The sequence
+    numbers become the baseline the next deltas of each entity must follow.
+
+    Every document section sent needs a sequence number, as does every monster. The pack sent
+    replaces the whole pack.
+
+    Returns:
+        Response: A JSON response indicating the status of the resync and the sections applied.
+    """
+    data = request.json
+    if not isinstance(data, dict) or "seq" not in data:
+        return jsonify({"error": "A resync needs the sequence numbers of its entities"}), 400
+
+    data = dict(data)
+    try:
+        sequences = ResyncSequences(**data.pop("seq"))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": "Invalid sequence numbers", "message": str(e)}), 400
+
+    validated, error = _validate_tick(data)
+    if error:
+        return error
+
+    missing = [section for section in DOCUMENT_SECTIONS
+               if section in validated and getattr(sequences, section) is None]
+    missing += [f"monsters/{monster.id}" for monster in validated.get("monsters", ())
+                if monster.id not in sequences.monsters]
+    if missing:
+        return jsonify({"error": "Missing sequence numbers", "entities": missing}), 400
+
+    with get_backend().transaction():
+        for section, value in validated.items():
+            if section == "pack":
+                apply_pack_slots({**EMPTY_PACK, **{item.inventory_letter: item.model_dump()
+                                                   for item in value.pack}})
+            else:
+                _apply_section(section, value)
+
+        document_sequences.update({section: getattr(sequences, section)
+                                   for section in DOCUMENT_SECTIONS if section in validated})
+        monster_sequences.update({str(monster.id): sequences.monsters[monster.id]
+                                  for monster in validated.get("monsters", ())})
+
+    return jsonify({"status": "success", "sections": list(validated)}), 200
+
+
+@bp.route('/delta', methods=['POST'], strict_slashes=False)
+def receive_delta():
+    """
+    Receives the changed fields of entities with their sequence numbers, and merges them into the
+    stored entities.
+
+    Every merged entity is validated before any of them is stored; if one is invalid, nothing is
+    stored and a 400 response listing the errors per entity is returned. Entities that cannot be
+    applied are not errors: their stale entries are listed in `stale`, and the entities that need
+    a full resync (a gap in their sequence, or no resync yet) in `resync`.
+
+    Returns:
+        Response: A JSON response listing the entities applied, the stale entries and the entities
+        to resync.
+    """
+    try:
+        delta = Delta(**(request.json or {}))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": "Invalid delta", "message": str(e)}), 400
+
+    # No other write lands between reading the stored entities and storing the merged ones
+    with get_backend().transaction():
+        applied, stale, resync, errors = _apply_delta(delta)
+
+    if errors:
+        current_app.logger.error("Error validating delta data: %s", errors)
+        return jsonify({"error": "Invalid delta data", "entities": errors}), 400
+    return jsonify({"status": "success", "applied": applied, "stale": stale,
+                    "resync": resync}), 200
+
+
+def _apply_delta(delta: Delta) -> tuple:
+    """
+    Merges a delta into the stored entities and stores the entities that follow their sequence.
+    Must hold a backend transaction.
+
+    Args:
+        delta (Delta): The validated delta.
+
+    Returns:
+        tuple: The entities applied, the stale entries, the entities to resync and the validation
+            errors by entity (nothing is stored if there are errors).
+    """
+    stale, resync, errors = [], [], {}
+    advances = {}
+    documents = {}
+    last = document_sequences.snapshot()
+    for section in DOCUMENT_SECTIONS:
+        entries = getattr(delta, section)
+        if not entries:
+            continue
+        sequence, fields, stale_sequences, gap = follow_sequence(entries, last.get(section))
+        stale += [{"entity": section, "seq": seq} for seq in stale_sequences]
+        if gap:
+            resync.append(section)
+        if sequence is None:
+            continue
+        try:
+            documents[section] = _merge_document(section, fields)
+        except (ValueError, TypeError) as e:
+            errors[section] = str(e)
+            continue
+        advances[section] = (last.get(section), sequence)
+
+    monster_changes, monster_advances = _merge_monsters(delta.monsters, stale, resync, errors)
+
+    if errors:
+        return [], stale, resync, errors
+
+    # The sequences were read in this transaction, so they normally all advance; any that do not
+    # are resynced rather than merged twice
+    applied = document_sequences.advance(advances) if advances else set()
+    applied_monsters = monster_sequences.advance(monster_advances) if monster_advances else set()
+    resync += [section for section in advances if section not in applied]
+    resync += [f"monsters/{key}" for key in monster_advances if key not in applied_monsters]
+
+    for section in DOCUMENT_SECTIONS:
+        if section in applied:
+            _apply_document(section, documents[section])
+    monsters = apply_monster_changes({
+        monster_id: fields for monster_id, fields in monster_changes.items()
+        if str(monster_id) in applied_monsters
+    })
+
+    return [section for section in DOCUMENT_SECTIONS if section in applied] \
+        + [f"monsters/{monster.id}" for monster in monsters], stale, resync, errors
+
+
+def _merge_document(section: str, fields: dict):
+    """
+    Merges the changed fields of a document section into the stored document and validates it.
+
+    Args:
+        section (str): The document section (one of `DOCUMENT_SECTIONS`).
+        fields (dict): The changed fields.
+
+    Returns:
+        The value to store with `_apply_document`: the changed pack slots, or the validated model.
+
+    Raises:
+        ValueError, TypeError: If a field is unknown or the merged document is invalid.
+    """
+    if section == "pack":
+        unknown = sorted(set(fields) - set(EMPTY_PACK))
+        if unknown:
+            raise ValueError(f"Unknown inventory letters: {', '.join(unknown)}")
+        merged = merge_fields(pack_items.snapshot(), fields)
+        return {letter: None if merged[letter] is None else Item(**merged[letter]).model_dump()
+                for letter in fields}
+
+    store, model = DOCUMENTS[section]
+    unknown = sorted(set(fields) - set(model.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return model(**merge_fields(store.snapshot(), fields))
+
+
+def _apply_document(section: str, document):
+    """
+    Stores a merged document section.
+
+    Args:
+        section (str): The document section (one of `DOCUMENT_SECTIONS`).
+        document: The value returned by `_merge_document` for this section.
+    """
+    if section == "pack":
+        apply_pack_slots(document)
+    elif section == "player":
+        apply_player(document.model_dump())
+    elif section == "gamestate":
+        apply_game_state(document)
+    else:
+        apply_game_stats(document)
+
+
+def _merge_monsters(entries: list, stale: list, resync: list, errors: dict) -> tuple:
+    """
+    Validates the changed fields of monsters in one pass. Only the changed fields are validated,
+    against their Monster annotations; the stored fields are valid already, and the changes are
+    applied to the stored records with `MonsterRecord.replace`.
+
+    Args:
+        entries (list): The monster `DeltaEntry` objects.
+        stale (list): Receives the stale entries.
+        resync (list): Receives the monsters that need a full resync.
+        errors (dict): Receives the validation errors, by entity.
+
+    Returns:
+        tuple: The changed record fields by monster ID (see `MonsterRecord.record_fields`), and
+            their sequence advances (the monster ID as a string mapped to the expected and new
+            sequence numbers).
+    """
+    by_id = {}
+    for entry in entries:
+        by_id.setdefault(entry.id, []).append(entry)
+
+    last = monster_sequences.snapshot()
+    stored_monsters = monster_registry.get_many(by_id)
+    ids, changes, advances = [], [], {}
+    for monster_id, monster_entries in by_id.items():
+        key = str(monster_id)
+        entity = f"monsters/{monster_id}"
+        stored = stored_monsters.get(monster_id)
+        sequence, fields, stale_sequences, gap = follow_sequence(
+            monster_entries, last.get(key) if stored is not None else None
+        )
+        stale += [{"entity": entity, "seq": seq} for seq in stale_sequences]
+        if gap:
+            resync.append(entity)
+        if sequence is None:
+            continue
+        unknown = sorted(fields.keys() - MONSTER_DELTA_FIELDS)
+        if unknown:
+            errors[entity] = f"Unknown fields: {', '.join(unknown)}"
+            continue
+        if isinstance(fields.get("position"), dict):
+            # Nested objects are merged one level deep, like `merge_fields` does
+            fields = {**fields, "position": {"x": stored.x, "y": stored.y, **fields["position"]}}
+        ids.append(monster_id)
+        changes.append(fields)
+        advances[key] = (last[key], sequence)
+
+    if not changes:
+        return {}, advances
+    try:
+        validated = MONSTER_CHANGES_LIST.validate_python(changes)
+    except ValidationError as e:
+        for error in monster_errors(e):
+            errors[f"monsters/{ids[error['index']]}"] = f"{error['field']}: {error['message']}"
+        return {}, advances
+    return {monster_id: MonsterRecord.record_fields(fields)
+            for monster_id, fields in zip(ids, validated)}, advances
@@ -5,18 +5,64 @@ The blueprint exposes a single route that serves the application metrics in a fo
 suitable for Prometheus scraping. This allows Prometheus to collect and monitor the
 metrics exposed by the application.
 
+When the portal runs several worker processes, the `PROMETHEUS_MULTIPROC_DIR` environment variable
+must point to a directory shared by the workers (and be set before they start). Each worker then
+writes its metrics there, and the endpoint serves them aggregated across every worker instead of
+the metrics of whichever worker answered the scrape.
+
+The game metrics are not updated by the routes that receive game data: the `GameCollector` (see
+`app.services.metrics`) reads them from the stored state at scrape time. Its values come from the
+state backend rather than from per-worker metric files, so in multiprocess mode it is added to the
+aggregating registry as-is.
+
 Endpoints:
 - /: Serves the Prometheus metrics.
 
 Returns:
     None: This module does not return values directly but defines routes for the Flask application.
 """
+import os
 from flask import Blueprint
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+from prometheus_client import multiprocess
+from app.routes.equipped_items import equipped_items
+from app.routes.gamestate import game_state_data
+from app.routes.gamestats import game_stats_data
+from app.routes.monsters import monster_registry
+from app.routes.player import player_data
+from app.services.ingest_dedup import ingest_dedup
+from app.services.metrics import GameCollector
 
 # Register metrics route under the Blueprint
 bp = Blueprint('metrics', __name__)
 
+game_collector = GameCollector(
+    player_data, game_state_data, game_stats_data, equipped_items, monster_registry, ingest_dedup
+)
+REGISTRY.register(game_collector)
+
+
+@bp.record_once
+def configure_game_collector(state):
+    """
+    Applies the app configuration to the game metrics collector when the blueprint is registered.
+    """
+    game_collector.init_app(state.app)
+
+
+def scrape_registry() -> CollectorRegistry:
+    """
+    Returns the registry to serve: one aggregating every worker's metrics in multiprocess mode,
+    otherwise the default registry of this process.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(game_collector)
+    return registry
+
+
 @bp.route('/', methods=['GET'])
 def metrics():
     """
@@ -42,4 +88,4 @@ def metrics():
             - Headers (dict): A dictionary with the `Content-Type` set to `CONTENT_TYPE_LATEST`.
     """
     # Generate the latest Prometheus metrics
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    return generate_latest(scrape_registry()), 200, {'Content-Type': CONTENT_TYPE_LATEST}
@@ -12,48 +12,66 @@ This blueprint includes routes for:
 - Resetting the game state related to monsters.
 - Retrieving timestamps for monster spawn and death.
 
+The monster list endpoints (/all, /dead, /admin-kills and /timestamps) accept optional query
+parameters, which are answered from the `MonsterRegistry` indexes rather than by scanning every monster:
+- depth, type, status (alive or dead): Only return monsters with these values.
+- spawned_after, spawned_before, died_after, died_before: Time windows, as ISO 8601 timestamps
+  or epoch seconds.
+- limit, cursor: Return one page of at most `limit` monsters, in ID order, after the monster ID
+  `cursor`. When more monsters match, the `X-Next-Cursor` response header holds the cursor for
+  the next page.
+
+The /stats endpoint answers analytics questions (e.g. the HP of the live monsters per depth, or
+the mean lifespan per type) from the registry's NumPy column store, with the query parameters
+group_by (depth, type or status), status (alive or dead), field (the histogram attribute) and bins.
+It answers 503 when NumPy is not installed.
+
+Dead monsters are only listed while the registry retains them (see `DEAD_MONSTER_MAX_COUNT` and
+`DEAD_MONSTER_MAX_AGE_SECONDS`); /dead-count and the metrics also count the evicted ones.
+
 Returns:
-    None: This module defines routes for the Flask app to manage monsters and Prometheus metrics.
+    None: This module defines routes for the Flask app to manage monsters.
 """
 from datetime import datetime, timezone
-from app.models.monsters import Monster
+from pydantic import ValidationError
+from app.models.monsters import MONSTER_LIST, Monster, monster_errors
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
 from app.services.k8s_service import KubernetesService
+from app.services import monster_index as index
+from app.services.monster_registry import MonsterRegistry
+from app.services.monster_sync import MonsterSyncQueue
+from app.services.state import SequenceMap
+from app.services.versions import store_versions, versioned, MONSTERS
 from flask import Blueprint, current_app, jsonify, render_template, request
-from kubernetes.client.exceptions import ApiException as KubernetesError
-from prometheus_client import Counter, Gauge, Histogram
 from flask_cors import CORS
 
 bp = Blueprint('monsters', __name__)
 CORS(bp)  # Enable CORS for the blueprint
 
-# Define Prometheus metrics for tracking monsters
-monster_count = Counter('brogue_monster_count',
-                        'Total number of monsters created')
-monster_death_count = Counter('brogue_monster_death_count',
-                              'Total number of monsters that have died')
-
-monster_lifespan_histogram = Histogram(
-    'brogue_monster_lifespan_seconds',
-    'Time (in seconds) monsters stay alive',
-    # Time buckets for monitoring monster lifespan
-    buckets=[10, 30, 60, 300, 600, 1800, 3600, 7200]
-)
-
-last_monster_created = Gauge(
-    'brogue_last_monster_created_timestamp',
-    'Timestamp of the last monster creation'
-)
-last_monster_death = Gauge(
-    'brogue_last_monster_death_timestamp',
-    'Timestamp of the last monster death'
-)
-
-active_monsters = {}
-all_monsters = {}
-dead_monsters = {}
-admin_kills = {}
+# Every monster of the current game, with the indexes used to look up, filter and page them
+monster_registry = MonsterRegistry()
+# Last delta sequence number applied to each monster, by ID (see `app.routes.ingest`)
+monster_sequences = SequenceMap("monster_sequences")
+
+MONSTER_NAMESPACE = "dungeon-master-system"
 
 k8s_service = KubernetesService()
+# Monster resource writes are applied in the background so ingest never waits on the API server
+monster_sync = MonsterSyncQueue(k8s_service)
+
+
+@bp.record_once
+def start_monster_sync(state):
+    """
+    Starts the background Monster resource sync worker when the blueprint is registered, and the
+    watch-backed Monster resource cache if it is enabled. Also applies the retention policy of
+    dead monsters.
+    """
+    monster_sync.init_app(state.app)
+    monster_registry.init_app(state.app)
+    if state.app.config.get("MONSTER_CR_CACHE_ENABLED"):
+        k8s_service.enable_cache(MONSTER_NAMESPACE)
 
 
 @bp.route("/", methods=["GET"])
@@ -65,6 +83,7 @@ def monsters():
 
 
 @bp.route("/active", methods=["GET"])
+@versioned(MONSTERS, cache=True)
 def get_monsters():
     """
     Returns the list of all active monsters.
@@ -75,13 +94,14 @@ def get_monsters():
         Response: A JSON response containing the list of active monsters.
     """
     try:
-        return jsonify([monster.dict() for monster in active_monsters.values()])
+        return jsonify([monster.dict() for monster in monster_registry.active()])
     except (AttributeError, KeyError, TypeError) as e:
         current_app.logger.error(f"Error fetching active monsters data: {e}")
         return jsonify({"error": "Error fetching data"}), 500
 
 
 @bp.route("/count", methods=["GET"])
+@versioned(MONSTERS)
 def get_monster_count():
     """
     Returns the count of live monsters.
@@ -91,11 +111,12 @@ def get_monster_count():
     Returns:
         Response: A JSON response with the current live monster count.
     """
-    count = len(active_monsters)
+    count = monster_registry.count(index.ALIVE)
     return jsonify({"monster_count": count})
 
 
 @bp.route("/dead-count", methods=["GET"])
+@versioned(MONSTERS)
 def get_dead_monster_count():
     """
     Returns the count of dead monsters.
@@ -105,7 +126,7 @@ def get_dead_monster_count():
     Returns:
         Response: A JSON response with the dead monster count.
     """
-    count = len(dead_monsters)
+    count = monster_registry.count(index.DEAD)
     return jsonify({"dead_monster_count": count})
 
 
@@ -125,6 +146,7 @@ def get_monsties_count():
 
 
 @bp.route("/all", methods=["GET"])
+@versioned(MONSTERS, cache=True)
 def get_all_monsters():
     """
     Returns all the monsters, alive and dead.
@@ -134,10 +156,11 @@ def get_all_monsters():
     Returns:
         Response: A JSON response containing all monsters, both alive and dead.
     """
-    return jsonify([monster.dict() for monster in all_monsters.values()])
+    return list_monsters()
 
 
 @bp.route("/dead", methods=["GET"])
+@versioned(MONSTERS, cache=True)
 def get_dead_monsters():
     """
     Returns a list of dead monsters.
@@ -147,23 +170,46 @@ def get_dead_monsters():
     Returns:
         Response: A JSON response containing the list of dead monsters.
     """
-    return jsonify([monster.dict() for monster in dead_monsters.values()])
+    return list_monsters({index.STATUS: index.DEAD})
 
 
 @bp.route("/admin-kills", methods=["GET"])
+@versioned(MONSTERS)
 def get_admin_kill_monsters():
     """
-    Returns a list of admin kill monsters filtered from all_monsters.
+    Returns a list of admin kill monsters.
     """
     try:
-        admin_monsters = [monster for monster in all_monsters.values() if getattr(monster, "is_admin_kill", False)]
-        return jsonify([monster.dict() for monster in admin_monsters])
+        return list_monsters({index.ADMIN_KILL: True})
     except (AttributeError, KeyError, TypeError) as e:
         current_app.logger.error(f"Error fetching admin kill monsters data: {e}")
         return jsonify({"error": "Error fetching data"}), 500
 
 
+@bp.route("/admin-kills/set", methods=["GET"], strict_slashes=False)
+def get_admin_kill_set():
+    """
+    Returns the IDs of all admin-killed monsters along with the current set version.
+
+    The version is an opaque string that changes every time the admin_kills set changes, and
+    after the portal's state is recreated (e.g. a restart with the memory backend). Clients pass
+    the last version they saw as the `since` query parameter; if it is still the current version,
+    an empty 304 response is returned so the game can poll it cheaply every tick. Any other value
+    gets the whole set.
+
+    Returns:
+        Response: A JSON response with the set version and the admin-killed monster IDs, or an
+        empty 304 response if the set is unchanged since the given version.
+    """
+    version = monster_registry.admin_kills_tag
+    if request.args.get("since") == version:
+        return "", 304
+
+    return jsonify({"version": version, "ids": monster_registry.admin_kill_ids()})
+
+
 @bp.route("/admin-kills/<int:monster_id>", methods=["GET"], strict_slashes=False)
+@versioned(MONSTERS)
 def is_admin_kill(monster_id):
     """
     Checks if a monster is in the admin_kills list.
@@ -174,16 +220,17 @@ def is_admin_kill(monster_id):
     Returns:
         Response: A JSON response indicating if the monster is in the admin_kills list.
     """
-    is_id_admin_kill = monster_id in admin_kills
+    is_id_admin_kill = monster_registry.is_admin_kill(monster_id)
     return jsonify({"is_admin_kill": is_id_admin_kill})
 
 
 @bp.route("/timestamps", methods=["GET"], strict_slashes=False)
+@versioned(MONSTERS)
 def get_monster_timestamps():
     """
     Handles the GET request to retrieve the spawn and death timestamps for all monsters.
 
-    This function iterates over the `all_monsters` collection, extracting the `name`, 
+    This function iterates over every stored monster, extracting the `name`, 
     `spawnTimestamp`, and `deathTimestamp` for each monster. It then returns a JSON response 
     containing a list of these timestamps. If either timestamp is missing, it returns "Unknown" 
     as a placeholder value.
@@ -201,24 +248,118 @@ def get_monster_timestamps():
         returned with a 500 status code if an issue occurs during the process.
     """
     try:
-        timestamps = []
-        for monster in all_monsters.values():
-            timestamps.append({
-                "name": monster.name,
-                "spawnTimestamp":
-                    monster.spawn_timestamp.isoformat() if monster.spawn_timestamp else "Unknown",
-                "deathTimestamp":
-                    monster.death_timestamp.isoformat() if monster.death_timestamp else "Unknown",
-            })
-
-        return jsonify(timestamps)
+        return list_monsters(serialize=lambda monster: {
+            "name": monster.name,
+            "spawnTimestamp": monster.spawn_timestamp or "Unknown",
+            "deathTimestamp": monster.death_timestamp or "Unknown",
+        })
 
     except (ValueError, TypeError) as e:
         current_app.logger.error(f"Error retrieving timestamps: {e}")
         return jsonify({"error": "Error retrieving timestamps"}), 500
 
 
+@bp.route("/stats", methods=["GET"], strict_slashes=False)
+@versioned(MONSTERS, cache=True)
+def get_monster_stats():
+    """
+    Returns per-group aggregates and a histogram of the stored monsters.
+
+    The query parameters `group_by` (depth, type or status, default depth), `status` (alive or
+    dead, default both), `field` (the histogram attribute, default hp) and `bins` (default 10, at
+    most 1000) select the stats; see `monster_columns.stats` for the response fields.
+
+    Returns:
+        Response: A JSON response with the stats, a 400 response if a query parameter is invalid,
+        or a 503 response if NumPy is not installed.
+    """
+    if monster_registry.columns is None:
+        return jsonify({"error": "Monster stats are not available: NumPy is not installed"}), 503
+
+    args = request.args
+    try:
+        stats = monster_registry.stats(
+            group_by=args.get("group_by", "depth"),
+            status=args.get("status"),
+            field=args.get("field", "hp"),
+            bins=int(args.get("bins", 10)),
+        )
+    except ValueError as e:
+        return jsonify({"error": "Invalid query parameter", "message": str(e)}), 400
+    return jsonify(stats)
+
+
+def _parse_time(name: str):
+    """
+    Parse a time window query parameter given as an ISO 8601 timestamp or epoch seconds.
+
+    Args:
+        name (str): The query parameter.
+
+    Returns:
+        float or None: The time in epoch seconds, or None if the parameter is missing.
+
+    Raises:
+        ValueError: If the parameter is not a valid timestamp.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+
+
+def list_monsters(filters: dict = None, serialize=None):
+    """
+    Returns one page of the stored monsters that match the request's filters.
+
+    Args:
+        filters (dict): Index filters that always apply to this list.
+        serialize (callable): Converts a monster to its JSON form. Defaults to `MonsterRecord.dict`.
+
+    Returns:
+        Response: A JSON list of monsters, with an `X-Next-Cursor` header if more pages match,
+        or a 400 response if a query parameter is invalid.
+    """
+    args = request.args
+    filters = dict(filters or {})
+    try:
+        if "depth" in args:
+            filters[index.DEPTH] = int(args["depth"])
+        if "type" in args:
+            filters[index.TYPE] = args["type"]
+        if "status" in args:
+            if args["status"] not in (index.ALIVE, index.DEAD):
+                raise ValueError("status must be 'alive' or 'dead'")
+            filters.setdefault(index.STATUS, args["status"])
+        spawned = (_parse_time("spawned_after"), _parse_time("spawned_before"))
+        died = (_parse_time("died_after"), _parse_time("died_before"))
+        cursor = args.get("cursor", type=int)
+        limit = args.get("limit", type=int)
+        if limit is not None:
+            if limit < 1:
+                raise ValueError("limit must be positive")
+            limit = min(limit, current_app.config.get("MONSTER_PAGE_MAX_LIMIT", 1000))
+    except ValueError as e:
+        return jsonify({"error": "Invalid query parameter", "message": str(e)}), 400
+
+    monsters_page, next_cursor = monster_registry.query(filters, spawned, died, cursor, limit)
+    serialize = serialize or (lambda monster: monster.dict())
+    page = [serialize(monster) for monster in monsters_page]
+
+    response = jsonify(page)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return response
+
+
 @bp.route("/update", methods=["POST"], strict_slashes=False)
+@deduplicated(MONSTERS)
 def create():
     """
     Creates or updates monster data.
@@ -235,111 +376,119 @@ def create():
     if not received_data:
         return jsonify({"error": "No JSON payload received"}), 400
 
-    for monster_data in received_data:
-        try:
-            monster = Monster(**monster_data)
-            current_app.logger.info(f"Monster data validated: {monster}")
-        except (ValueError, TypeError) as e:
-            current_app.logger.error(f"Error validating monster data: {e}")
-            return jsonify({"error": "Invalid monster data", "message": str(e)}), 400
-
-        monster_id = monster.id
-        if monster_id is None:
-            current_app.logger.warning(f"Skipping monster entry without 'id': {monster_data}")
-            continue
-
-        if monster_id not in all_monsters:
-            return_value = handle_new_monster(monster)
-            if return_value:
-                return return_value
-        else:
-            handle_existing_monster(monster)
+    try:
+        monsters_received = validate_monsters(received_data)
+    except ValidationError as e:
+        errors = monster_errors(e)
+        current_app.logger.error("Error validating monster data: %d invalid fields", len(errors))
+        return jsonify({"error": "Invalid monster data", "message": str(e), "errors": errors}), 400
 
-        update_monster_status(monster)
+    apply_monsters(monsters_received)
 
     return jsonify({"status": "success", "message": "monster update data received"}), 200
 
 
-def handle_new_monster(monster: Monster):
+def validate_monsters(received_data: list) -> list:
     """
-    Handle the creation of a new monster in the game.
+    Validate a list of monster payloads in one pass using the `Monster` list adapter.
 
     Args:
-        monster: The Monster object that was validated.
+        received_data (list): The raw monster dictionaries received from the game.
 
     Returns:
-        None: If successful, the function returns None. If an error occurs, an error 
-            response is returned.
+        list: The validated Monster objects.
+
+    Raises:
+        ValidationError: If any monster entry fails validation (see `monster_errors`).
     """
-    monster_count.inc()
-    if not monster.spawn_timestamp:
-        monster.spawn_timestamp = datetime.now(timezone.utc)
+    return MONSTER_LIST.validate_python(received_data)
 
-    current_app.logger.info(f"Adding new monster: {monster.name}")
-    current_app.logger.info(f"Monster data: {monster.model_dump()}")
-    all_monsters[monster.id] = monster
 
-    try:
-        k8s_service.create_monster_resource(
-            name=monster.name,
-            namespace="dungeon-master-system",
-            monster_data=monster.model_dump()
-        )
-        current_app.logger.info(f"Monster resource created for {monster.name}.")
-    except KubernetesError as e:
-        current_app.logger.error(f"Failed to create Monster resource for {monster.name}: {e}")
-        return jsonify({"error": "Failed to create Monster resource", "message": str(e)}), 500
+def apply_monsters(monsters_received: list):
+    """
+    Apply validated monster updates to the in-memory storage and queue the matching
+    Kubernetes resource writes.
 
-    return None
+    Args:
+        monsters_received (list): The validated Monster objects.
+    """
+    for monster in monsters_received:
+        is_new = monster_registry.upsert(monster)
+        if is_new is None:
+            # The monster died long ago and was evicted from the registry
+            continue
+        if is_new:
+            handle_new_monster(monster)
+        else:
+            handle_existing_monster(monster)
 
+        if monster.is_dead:
+            event_type = "monster-died"
+        else:
+            event_type = "monster-spawned" if is_new else "monster-updated"
+        event_broker.publish(event_type, monster.model_dump)
 
-def handle_existing_monster(monster: Monster):
-    """
-    Handle updating an existing monster's data.
+    if monsters_received:
+        store_versions.bump(MONSTERS)
 
-    This function checks if the monster is alive before attempting to update its resource
-    in Kubernetes. If the monster is dead, the update is skipped.
+
+def apply_monster_changes(changes: dict) -> list:
+    """
+    Apply validated field changes of stored monsters (e.g. from a delta) to the in-memory storage
+    and queue the matching Kubernetes resource writes.
 
     Args:
-        monster: The Monster object containing the updated data.
-        monster_id: The ID of the monster to update.
+        changes (dict): Monster IDs mapped to the changed record fields (see
+            `MonsterRecord.record_fields`).
 
     Returns:
-        None: If the update is successful, nothing is returned. If an error occurs, an error
-        response is returned.
+        list: The changed MonsterRecords.
     """
-    if not monster.is_dead:
-        try:
-            k8s_service.update_monster_resource(
-                name=monster.name,
-                namespace="dungeon-master-system",
-                monster_data=monster.model_dump()
-            )
-            current_app.logger.info(f"Monster resource updated for {monster.name}.")
-        except KubernetesError as e:
-            current_app.logger.error(f"Failed to update Monster resource for {monster.name}: {e}")
-            return jsonify({"error": "Failed to update Monster resource", "message": str(e)}), 500
+    monsters_changed = monster_registry.patch(changes)
+    for monster in monsters_changed:
+        handle_existing_monster(monster)
+        event_broker.publish("monster-died" if monster.is_dead else "monster-updated",
+                             monster.dict)
+
+    if monsters_changed:
+        store_versions.bump(MONSTERS)
+    return monsters_changed
 
 
-def update_monster_status(monster: Monster):
+def handle_new_monster(monster: Monster):
     """
-    Update the status of a monster, either adding it to the live monsters or marking it as dead.
+    Handle the creation of a new monster in the game, once it is stored in the registry.
+
+    The Monster resource is created in Kubernetes by the background sync worker.
 
     Args:
-        monster: The Monster object whose status needs to be updated.
-        monster_id: The ID of the monster to update.
+        monster: The Monster object that was validated.
+    """
+    current_app.logger.info("Adding new monster: %s", monster.name)
+    monster_sync.enqueue_create(
+        name=monster.name,
+        namespace=MONSTER_NAMESPACE,
+        monster_data=monster.model_dump()
+    )
 
-    Returns:
-        None
+
+def handle_existing_monster(monster: Monster):
     """
-    if not monster.spawn_timestamp:
-        monster.spawn_timestamp = datetime.now(timezone.utc)
-    if not monster.is_dead:
-        active_monsters[monster.id] = monster
-        all_monsters[monster.id] = monster
-    else:
-        monster.death_timestamp = datetime.now(timezone.utc)
-        dead_monsters[monster.id] = monster
+    Handle updating an existing monster's data.
+
+    This function checks if the monster is alive before queueing an update of its resource
+    in Kubernetes. If the monster is dead, or was admin-killed and its resource deleted while the
+    game still reports it alive, the update is skipped.
+
+    Args:
+        monster: The Monster object or stored MonsterRecord containing the updated data.
+    """
+    if not monster.is_dead and not monster.is_admin_kill:
+        monster_sync.enqueue_update(
+            name=monster.name,
+            namespace=MONSTER_NAMESPACE,
+            monster_data=monster.model_dump() if isinstance(monster, Monster) else monster.dict()
+        )
 
 
 @bp.route("/death", methods=["POST"], strict_slashes=False)
@@ -365,34 +514,22 @@ def receive_monster_death():
         except ValueError:
             return jsonify({"error": f"Invalid monster ID: {monster_id}"}), 400
 
-    if monster_id not in all_monsters:
+    monster = monster_registry.get(monster_id)
+    if monster is None:
         return jsonify({"error": f"Monster with ID {monster_id} not found"}), 404
 
-    monster = all_monsters[monster_id]
-    if monster.is_dead:
-        return jsonify({"error": f"Monster with ID {monster.id} is already dead."}), 400
-
-    # Mark monster as dead
-    monster.is_dead = True
-    monster.death_timestamp = datetime.now(timezone.utc)
-
-    # Update the Prometheus metrics
-    monster_death_count.inc()
-    active_monsters.pop(monster.id, None)
-    dead_monsters[monster_id] = monster
+    # Mark monster as dead; None means it is already dead, possibly from a concurrent request
+    monster = monster_registry.mark_dead(monster_id)
+    if monster is None:
+        return jsonify({"error": f"Monster with ID {monster_id} is already dead."}), 400
 
     # Log the updated monster status
     current_app.logger.info(f"Monster marked as dead: {monster.name}, ID: {monster.id}")
 
-    # Call the Kubernetes service to delete the monster resource
-    try:
-        k8s_service.delete_monster_resource(
-            name=monster.name, namespace="dungeon-master-system"
-        )
-        current_app.logger.info(f"Successfully deleted Monster resource: {monster.name}")
-    except KubernetesError as e:
-        current_app.logger.error(f"Failed to delete Monster resource: {monster.name} due to {e}")
-        return jsonify({"error": f"Failed to delete Monster resource: {monster.name}"}), 500
+    # Queue the deletion of the monster resource
+    monster_sync.enqueue_delete(name=monster.name, namespace=MONSTER_NAMESPACE)
+    store_versions.bump(MONSTERS)
+    event_broker.publish("monster-died", monster.dict)
 
     return jsonify({"status": "success", "id": monster.id}), 200
 
@@ -408,12 +545,14 @@ def reset_current_game_monsters():
     Returns:
         Response: A JSON response indicating the status of the reset.
     """
-    active_monsters.clear()
-    all_monsters.clear()
-    dead_monsters.clear()
-    admin_kills.clear()  # Reset the admin_kills list
+    monster_registry.clear()  # Also resets the admin kills
+    monster_sequences.clear()
 
-    k8s_service.delete_all_monsters_in_namespace("dungeon-master-system")
+    # Pending and in-flight writes would recreate the resources being deleted
+    monster_sync.clear()
+    k8s_service.delete_all_monsters_in_namespace(MONSTER_NAMESPACE)
+    store_versions.bump(MONSTERS)
+    event_broker.publish("reset")
 
     current_app.logger.info("Monster data has been reset for a new game.")
     return jsonify({"status": "success"}), 200
@@ -436,53 +575,18 @@ def sanitize_string(input_str):
 
 @bp.route('/admin-kill/pod/<monster_pod_name>', methods=['DELETE', 'GET'])
 def admin_kill_monster_by_pod_name(monster_pod_name):
-    """Kills a monster by id."""
+    """Kills a monster by pod name."""
     current_app.logger.info(f"INFO: Received admin kill request for monster: {monster_pod_name}")
 
-    # Log current monster keys for debugging
-    current_app.logger.info(f"INFO: active_monsters keys: {list(active_monsters.keys())}")
-    
-    # Lookup monster_id by pod_name
-    monster_id = None
-    for monster in active_monsters.values():
-        if monster.pod_name == monster_pod_name:
-            monster_id = monster.id
-            break
-            
-    if monster_id in active_monsters:
-        current_app.logger.info(f"INFO: Monster id {monster_id} found in active_monsters list.")
-        
-        monster = active_monsters.get(monster_id)
-        
-        current_app.logger.info(f"INFO: Monster {monster_id}'s name is {monster.pod_name}.")
-        
-        # Move monster from active to dead
-        monster = active_monsters.pop(monster_id)
-        monster.is_dead = True
-        monster.is_admin_kill = True
-        monster.death_timestamp = datetime.now(timezone.utc)
-        dead_monsters[monster_id] = monster
-        current_app.logger.info(f"INFO: Monster {monster_pod_name} marked as dead")
-    
-        # Add monster to admin_kills list
-        admin_kills[monster_id] = monster
-        current_app.logger.info(f"INFO: Monster {monster_pod_name} added to admin_kills list")
-        
-        # Call the Kubernetes service to delete the monster resource
-        try:
-            k8s_service.delete_monster_resource(
-                name=monster.name, namespace="dungeon-master-system"
-            )
-            current_app.logger.info(f"Successfully deleted Monster resource: {monster.name}")
-        except KubernetesError as e:
-            current_app.logger.error(f"Failed to delete Monster resource: {monster.name} due to {e}")
-            return jsonify({"error": f"Failed to delete Monster resource: {monster.name}"}), 500
-
-        return jsonify({"status": "success", "message": f"INFO: Monster {monster_pod_name} admin killed"}), 200
-    else:
+    # The pod reconciler calls this on every pod deletion, so look the pod name up in the index
+    monster = monster_registry.get_by_pod_name(monster_pod_name)
+    if monster is None or monster.is_dead:
         current_app.logger.warning(f"INFO: Monster with pod_name {monster_pod_name} not found.")
-    
-    return jsonify({"error": f"INFO: Monster with monster_pos_nMW {monster_pod_name} not found"}), 404
+        return jsonify({"error": f"INFO: Monster with pod_name {monster_pod_name} not found"}), 404
+
+    admin_kill(monster.id)
+    current_app.logger.info(f"INFO: Monster {monster_pod_name} admin killed")
+    return jsonify({"status": "success", "message": f"INFO: Monster {monster_pod_name} admin killed"}), 200
 
 
 @bp.route('/admin-kill/<monster_id>', methods=['DELETE', 'GET'])
@@ -490,47 +594,35 @@ def admin_kill_monster_by_id(monster_id):
     """Kills a monster by id."""
     current_app.logger.info(f"INFO: Received admin kill request for monster: {monster_id}")
 
-    # Log current monster keys for debugging
-    current_app.logger.info(f"INFO: active_monsters keys: {list(active_monsters.keys())}")
-    
-     # Convert monster_id to an integer to match active_monsters keys
+     # Convert monster_id to an integer to match the registry keys
     try:
         monster_id = int(monster_id)
     except ValueError:
         return jsonify({"error": f"INFO: Invalid monster_id: {monster_id}"}), 400
-    
-    if monster_id in active_monsters:
-        current_app.logger.info(f"INFO: Monster id {monster_id} found in active_monsters list.")
-        
-        monster = active_monsters.get(monster_id)
-        
-        current_app.logger.info(f"INFO: Monster {monster_id}'s name is {monster.name}.")
-        
-        # Move monster from active to dead
-        monster = active_monsters.pop(monster_id)
-        monster.is_dead = True
-        monster.is_admin_kill = True
-        monster.death_timestamp = datetime.now(timezone.utc)
-        dead_monsters[monster_id] = monster
-        current_app.logger.info(f"INFO: Monster {monster_id} marked as dead")
-    
-        # Add monster to admin_kills list
-        admin_kills[monster_id] = monster
-        current_app.logger.info(f"INFO: Monster {monster_id} added to admin_kills list")
-        
-        # Call the Kubernetes service to delete the monster resource
-        try:
-            k8s_service.delete_monster_resource(
-                name=monster.name, namespace="dungeon-master-system"
-            )
-            current_app.logger.info(f"Successfully deleted Monster resource: {monster.name}")
-        except KubernetesError as e:
-            current_app.logger.error(f"Failed to delete Monster resource: {monster.name} due to {e}")
-            return jsonify({"error": f"Failed to delete Monster resource: {monster.name}"}), 500
-
-        return jsonify({"status": "success", "message": f"INFO: Monster {monster_id} admin killed"}), 200
-    else:
+
+    if admin_kill(monster_id) is None:
         current_app.logger.warning(f"INFO: Monster with id {monster_id} not found.")
-    
-    return jsonify({"error": f"INFO: Monster with monster_id {monster_id} not found"}), 404
+        return jsonify({"error": f"INFO: Monster with monster_id {monster_id} not found"}), 404
+
+    current_app.logger.info(f"INFO: Monster {monster_id} admin killed")
+    return jsonify({"status": "success", "message": f"INFO: Monster {monster_id} admin killed"}), 200
+
+
+def admin_kill(monster_id: int):
+    """
+    Mark a live monster as admin-killed and queue the deletion of its Monster resource.
+
+    Args:
+        monster_id (int): The ID of the monster to kill.
+
+    Returns:
+        MonsterRecord or None: The killed monster, or None if there is no live monster with the ID.
+    """
+    monster = monster_registry.mark_dead(monster_id, admin_kill=True)
+    if monster is None:
+        return None
 
+    monster_sync.enqueue_delete(name=monster.name, namespace=MONSTER_NAMESPACE)
+    store_versions.bump(MONSTERS)
+    event_broker.publish("monster-died", monster.dict)
+    return monster
@@ -14,12 +14,20 @@ The pack items data is stored in an in-memory dictionary and validated using the
 """
 from flask import Blueprint, request, jsonify, current_app
 from app.models.items import Pack
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
+from app.services.state import SnapshotDict
+from app.services.versions import store_versions, versioned, PACK
 
 bp = Blueprint('pack', __name__)
 
-pack_items = {chr(i): None for i in range(ord('a'), ord('z') + 1)}
+# Every inventory slot, empty
+EMPTY_PACK = {chr(i): None for i in range(ord('a'), ord('z') + 1)}
+
+pack_items = SnapshotDict("pack", EMPTY_PACK)
 
 @bp.route('/update', methods=['POST'], strict_slashes=False)
+@deduplicated(PACK)
 def receive_pack_items():
     """
     Receives pack item metrics data and updates in-memory storage as well as Prometheus metrics.
@@ -43,8 +51,7 @@ def receive_pack_items():
         # Validate and parse the incoming JSON using the Pack model
         items = Pack(**data)
 
-        for new_item in items.pack:
-            pack_items[new_item.inventory_letter] = new_item
+        apply_pack_items(items)
 
         return jsonify({"status": "success", "message": "pack items received"}), 200
 
@@ -52,7 +59,28 @@ def receive_pack_items():
         current_app.logger.error(f"Error processing pack item data: {e}")
         return jsonify({"error": str(e)}), 400
 
+def apply_pack_items(items: Pack):
+    """
+    Stores validated pack items in the in-memory storage, keyed by inventory letter.
+
+    Args:
+        items (Pack): The validated pack.
+    """
+    apply_pack_slots({new_item.inventory_letter: new_item.model_dump() for new_item in items.pack})
+
+def apply_pack_slots(slots: dict):
+    """
+    Stores validated pack items in the in-memory storage.
+
+    Args:
+        slots (dict): The inventory letters mapped to their item data, or None for an empty slot.
+    """
+    pack_items.update(slots)
+    store_versions.bump(PACK)
+    event_broker.publish("pack")
+
 @bp.route('/data', methods=['GET'], strict_slashes=False)
+@versioned(PACK, cache=True)
 def get_pack_items():
     """
     Returns the current pack items data.
@@ -67,11 +95,12 @@ def get_pack_items():
         Response: A JSON response containing the current pack items data, or an error message if 
         the data is not available.
     """
-    if not pack_items:
+    items = pack_items.snapshot()
+    if not items:
         return jsonify({"error": "Pack items data not available"}), 404
 
     pack_items_data = {
-        "pack": {letter: item.dict() for letter, item in pack_items.items() if item}
+        "pack": {letter: item for letter, item in items.items() if item}
     }
 
     return jsonify(pack_items_data)
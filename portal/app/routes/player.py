@@ -23,38 +23,18 @@ The player data is stored in an in-memory dictionary and validated using the Pla
 """
 from flask import Blueprint, request, jsonify, render_template, current_app
 from app.models.player import Player
-from prometheus_client import Gauge
+from app.services.events import event_broker
+from app.services.ingest_dedup import deduplicated
+from app.services.state import SnapshotDict
+from app.services.versions import store_versions, versioned, PLAYER
 
 bp = Blueprint('player', __name__)
 
-player_data = {}
-
-# Player Metrics
-player_gold = Gauge('brogue_player_gold', 'Amount of gold collected by the player')
-player_depth = Gauge('brogue_depth_level', 'Current depth level of the player')
-player_deepest_level = Gauge('brogue_deepest_level', 'Deepest level reached by the player')
-player_current_hp = Gauge('brogue_player_current_hp', 'Current hit points of the player')
-player_max_hp = Gauge('brogue_player_max_hp', 'Maximum hit points of the player')
-player_strength = Gauge('brogue_strength', 'Player’s strength')
-player_stealth_range = Gauge('brogue_stealth_range',
-                             'Distance from which monsters will notice the player')
-player_turns = Gauge('brogue_player_turns', 'Total turns played by the player')
-player_regen_per_turn = Gauge('brogue_regen_per_turn', 'HP regeneration per turn')
-player_weakness_amount = Gauge('brogue_weakness_amount', 'Amount of weakness inflicted')
-player_poison_amount = Gauge('brogue_poison_amount', 'Amount of poison inflicted')
-
-# Bonuses and modifiers from rings
-bonus_clairvoyance = Gauge('brogue_clairvoyance_bonus', 'Clairvoyance ring bonus')
-bonus_stealth = Gauge('brogue_stealth_bonus', 'Stealth ring bonus')
-bonus_regeneration = Gauge('brogue_regeneration_bonus', 'Regeneration ring bonus')
-bonus_light_multiplier = Gauge('brogue_light_multiplier', 'Light multiplier ring bonus')
-bonus_awareness = Gauge('brogue_awareness_bonus', 'Awareness ring bonus')
-bonus_transference = Gauge('brogue_transference', 'Transference ring bonus')
-bonus_wisdom = Gauge('brogue_wisdom_bonus', 'Wisdom ring bonus')
-bonus_reaping = Gauge('brogue_reaping_bonus', 'Reaping ring bonus')
+player_data = SnapshotDict("player")
 
 
 @bp.route('/hp', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_hp():
     """
     Returns the current player hp.
@@ -70,6 +50,7 @@ def get_hp():
 
 
 @bp.route('/gold', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_gold():
     """
     Returns the current player gold.
@@ -85,6 +66,7 @@ def get_gold():
 
 
 @bp.route('/depth', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_depth():
     """
     Returns the current player depth.
@@ -100,6 +82,7 @@ def get_depth():
 
 
 @bp.route('/deepest-level', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_deepest_level():
     """
     Returns the current player deepest level.
@@ -115,6 +98,7 @@ def get_deepest_level():
 
 
 @bp.route('/max-hp', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_max_hp():
     """
     Returns the current player max hp.
@@ -130,6 +114,7 @@ def get_max_hp():
 
 
 @bp.route('/strength', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER)
 def get_strength():
     """
     Returns the current player strength.
@@ -158,6 +143,7 @@ def player():
 
 
 @bp.route('/update', methods=['POST'], strict_slashes=False)
+@deduplicated(PLAYER)
 def receive_player():
     """
     Receives player data and updates the in-memory storage.
@@ -176,16 +162,29 @@ def receive_player():
 
     try:
         # Validate the player data using the Player model
-        new_player = Player(**data)
-        player_data.update(data)
-        current_app.logger.info(f"Player data received: {new_player.model_dump()}")
+        Player(**data)
+        apply_player(data)
+        current_app.logger.debug("Player data received: %s", data)
         return jsonify({"status": "success", "portal message": "player data received"}), 200
     except ValueError as e:
         current_app.logger.error(f"Error processing player data: {str(e)}")
         return jsonify({"error": str(e)}), 400
 
 
+def apply_player(data: dict):
+    """
+    Stores validated player data in the in-memory storage.
+
+    Args:
+        data (dict): Player data that has already been validated with the Player model.
+    """
+    player_data.update(data)
+    store_versions.bump(PLAYER)
+    event_broker.publish("player")
+
+
 @bp.route('/data', methods=['GET'], strict_slashes=False)
+@versioned(PLAYER, cache=True)
 def get_player():
     """
     Returns the current player data.
@@ -195,4 +194,4 @@ def get_player():
     Returns:
         Response: A JSON response containing the current player data.
     """
-    return jsonify(player_data)
+    return jsonify(player_data.snapshot())
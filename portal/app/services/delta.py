@@ -0,0 +1,72 @@
+"""
+This module defines the helpers of the delta ingest protocol (see `app.routes.ingest`): ordering
+the delta entries of an entity by sequence number, and merging their changed fields into the
+stored entity.
+
+Every entity (the player, the pack, a monster, ...) has its own sequence number, set by a full
+resync and advanced by one with every delta. `follow_sequence` keeps the entries that continue
+the last applied sequence, in order, and reports the others:
+- Stale entries (a sequence already applied) are dropped.
+- A gap (a missing sequence) stops the run: the entries after it cannot be applied until the
+  client sends a full resync of the entity.
+
+Returns:
+    None: This module does not return any values.
+"""
+
+
+def merge_fields(base: dict, fields: dict) -> dict:
+    """
+    Merge changed fields into a document. Nested objects are merged one level deep, so a delta
+    can send e.g. only the `x` of a position.
+
+    Args:
+        base (dict): The document. It is not modified.
+        fields (dict): The changed fields.
+
+    Returns:
+        dict: The merged document.
+    """
+    merged = dict(base)
+    for key, value in fields.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = {**current, **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def follow_sequence(entries: list, last) -> tuple:
+    """
+    Order the delta entries of one entity and merge the run that continues its last sequence.
+
+    Args:
+        entries (list): The entity's `DeltaEntry` objects, in any order.
+        last (int): The entity's last applied sequence number, or None if it was never resynced.
+
+    Returns:
+        tuple: The new sequence number (None if no entry applies), the merged changed fields, the
+            sequence numbers of the stale entries, and whether the entity needs a full resync.
+    """
+    if last is None:
+        return None, {}, [], True
+    if len(entries) == 1:
+        # The usual case: one change per entity and delta
+        seq = entries[0].seq
+        if seq <= last:
+            return None, {}, [seq], False
+        if seq > last + 1:
+            return None, {}, [], True
+        return seq, dict(entries[0].fields), [], False
+
+    sequence, fields, stale = last, {}, []
+    for entry in sorted(entries, key=lambda entry: entry.seq):
+        if entry.seq <= sequence:
+            stale.append(entry.seq)
+        elif entry.seq == sequence + 1:
+            fields = merge_fields(fields, entry.fields)
+            sequence = entry.seq
+        else:
+            return (sequence if sequence > last else None), fields, stale, True
+    return (sequence if sequence > last else None), fields, stale, False
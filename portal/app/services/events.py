@@ -0,0 +1,280 @@
+"""
+This module defines the `EventBroker` class, which fans out change events from the ingest and admin
+routes to the dashboards connected to the `/events` Server-Sent Events stream.
+
+The routes publish a typed event (e.g. "monster-died" or "player") from the same place they mutate
+the in-memory storage. Each connected dashboard has its own bounded queue; events are encoded once
+per publish, and only if at least one dashboard is connected, so the ingest path does no extra work
+while nobody is watching.
+
+A dashboard that falls too far behind has its queue replaced by a single "resync" event, telling it
+to fetch the full state again instead of replaying a backlog.
+
+With a shared state backend (see `app.services.state_backend`), a dashboard may be connected to
+another worker than the one that handled the change. Events then go through the backend's event
+log instead: `publish` appends the event, and every worker with connected dashboards runs a
+thread that tails the log and fans the events out to its own dashboards. Events appended in a
+transaction (e.g. an ingest tick) reach the dashboards once the transaction commits. Workers with
+dashboards keep a "listened until" time in the backend, so events are only encoded and appended
+while some worker has a dashboard connected. A worker that falls more than `EVENT_LOG_SIZE` events
+behind asks its dashboards to resync.
+
+Returns:
+    None: This module does not return any values.
+"""
+import itertools
+import json
+import queue
+import threading
+import time
+from app.services.state_backend import get_backend
+
+# Sent to a subscriber whose queue overflowed; the dashboard should refetch everything
+RESYNC_EVENT = "resync"
+
+# Backend map holding the time until which some worker has dashboards connected
+LISTENERS = "event_listeners"
+
+
+class Subscription:
+    """
+    The queue of encoded events waiting to be sent to one connected dashboard.
+
+    Methods:
+        get: Wait for the next encoded event.
+    """
+
+    def __init__(self, max_queued: int):
+        """
+        Initialize the subscription.
+
+        Args:
+            max_queued (int): The number of events that can be queued before the subscriber
+                is asked to resync.
+        """
+        self._queue = queue.Queue(maxsize=max_queued)
+
+    def get(self, timeout: float = None):
+        """
+        Wait for the next encoded event.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            str or None: The event in SSE wire format, or None if the timeout expired.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _put(self, message: str, resync_message: str):
+        """
+        Queue an encoded event, replacing the backlog with a resync event if the queue is full.
+        """
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(resync_message)
+
+
+class EventBroker:
+    """
+    Publishes typed change events to every connected dashboard.
+
+    Methods:
+        init_app: Bind the broker to a Flask app.
+        subscribe: Register a new dashboard connection.
+        unsubscribe: Remove a dashboard connection.
+        has_subscribers: Whether any dashboard is connected.
+        publish: Send an event to every connected dashboard.
+    """
+
+    def __init__(self, max_queued: int = 256, max_subscribers: int = 0,
+                 poll_interval: float = 0.2, listener_ttl: float = 30.0, backend=None):
+        """
+        Initialize the broker.
+
+        Args:
+            max_queued (int): The per-subscriber queue size.
+            max_subscribers (int): The maximum number of dashboards connected at once, or 0 for
+                no limit.
+            poll_interval (float): The seconds between two reads of a shared backend's event log.
+            listener_ttl (float): The seconds other workers keep appending events after this
+                one last announced its dashboards.
+            backend (StateBackend): The state backend. Defaults to the app's backend.
+        """
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers
+        self.poll_interval = poll_interval
+        self.listener_ttl = listener_ttl
+        self._backend = backend
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._dumps = json.dumps
+        self._tailer = None
+        self._wake = threading.Event()
+        self._listened_until = 0.0
+
+    def init_app(self, app):
+        """
+        Bind the broker to a Flask app, so events are encoded with the app's JSON provider.
+
+        Args:
+            app (Flask): The Flask application.
+        """
+        self.max_queued = app.config.get("EVENTS_QUEUE_SIZE", self.max_queued)
+        self.max_subscribers = app.config.get("EVENTS_MAX_STREAMS", self.max_subscribers)
+        self.poll_interval = app.config.get("EVENTS_POLL_SECONDS", self.poll_interval)
+        self.listener_ttl = app.config.get("EVENTS_LISTENER_TTL_SECONDS", self.listener_ttl)
+        self._dumps = app.json.dumps
+
+    @property
+    def backend(self):
+        """
+        The state backend whose event log the broker tails when it is shared.
+        """
+        return self._backend or get_backend()
+
+    def subscribe(self):
+        """
+        Register a new dashboard connection. With a shared backend, this starts tailing the event
+        log if no other dashboard of this worker does.
+
+        Returns:
+            Subscription or None: The queue of events for the connection, or None if
+                `max_subscribers` dashboards are already connected.
+        """
+        subscription = Subscription(self.max_queued)
+        backend = self.backend
+        with self._lock:
+            if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+            if backend.shared and self._tailer is None:
+                # Start after the last event, and only then tell the other workers to append
+                self._tailer = threading.Thread(
+                    target=self._tail, args=(backend, backend.event_latest()),
+                    name="event-tailer", daemon=True,
+                )
+                self._announce(backend)
+                self._tailer.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a dashboard connection.
+
+        Args:
+            subscription (Subscription): The subscription returned by `subscribe`.
+        """
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_subscribers(self) -> bool:
+        """
+        Whether any dashboard is connected.
+
+        Returns:
+            bool: True if at least one subscription is registered.
+        """
+        return bool(self._subscribers)
+
+    def publish(self, event_type: str, data=None):
+        """
+        Send an event to every connected dashboard.
+
+        Nothing is encoded when no dashboard is connected. `data` may be a callable, which is
+        only called when the event is actually sent, so callers can avoid building payloads
+        nobody will read.
+
+        Args:
+            event_type (str): The event name (the SSE `event:` field).
+            data: The JSON-serializable event payload, or a callable returning it.
+        """
+        backend = self.backend
+        if backend.shared:
+            if not self._listened(backend):
+                return
+            if callable(data):
+                data = data()
+            backend.event_append(event_type, self._dumps(data if data is not None else {}))
+            self._wake.set()
+            return
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        if callable(data):
+            data = data()
+        self._fan_out(subscribers, next(self._ids), event_type,
+                      self._dumps(data if data is not None else {}))
+
+    def _fan_out(self, subscribers: list, event_id: int, event_type: str, payload: str):
+        """
+        Queue an encoded event for every subscriber.
+        """
+        message = self._encode(event_id, event_type, payload)
+        resync_message = self._encode(event_id, RESYNC_EVENT, "{}")
+        for subscription in subscribers:
+            subscription._put(message, resync_message)  # pylint: disable=protected-access
+
+    @staticmethod
+    def _encode(event_id: int, event_type: str, payload: str) -> str:
+        """
+        Encode an event in the SSE wire format.
+        """
+        return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+    def _listened(self, backend) -> bool:
+        """
+        Whether some worker sharing the backend has dashboards connected.
+        """
+        now = time.time()
+        if self._listened_until > now:
+            return True
+        self._listened_until = (backend.map_snapshot(LISTENERS) or {}).get("until", 0.0)
+        return self._listened_until > now
+
+    def _announce(self, backend):
+        """
+        Tell the other workers sharing the backend that this one has dashboards connected.
+        """
+        backend.map_update(LISTENERS, {"until": time.time() + self.listener_ttl})
+
+    def _tail(self, backend, seq: int):
+        """
+        Tailer loop: fan the events of a shared backend's event log out to this worker's
+        subscribers, until none is left.
+        """
+        announced = time.monotonic()
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                subscribers = list(self._subscribers)
+                if not subscribers:
+                    self._tailer = None
+                    return
+            if time.monotonic() - announced > self.listener_ttl / 3:
+                self._announce(backend)
+                announced = time.monotonic()
+
+            events = backend.event_changes(seq)
+            if events and events[0][0] > seq + 1:
+                # Events this worker did not read yet were dropped from the log
+                self._fan_out(subscribers, events[0][0] - 1, RESYNC_EVENT, "{}")
+            for seq, event_type, payload in events:
+                self._fan_out(subscribers, seq, event_type, payload)
+
+
+event_broker = EventBroker()
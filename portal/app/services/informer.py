@@ -0,0 +1,432 @@
+"""
+This module defines the `Informer` class, a watch-backed local cache of the Kubernetes objects of
+one kind in one namespace, and `MonsterInformer`, the informer for Monster custom resources.
+
+An informer lists the objects once and then follows a watch from the list's resourceVersion,
+keeping a local store up to date. Readers such as `KubernetesService` and `MonstiesService`
+answer existence checks, gets and lists from this store, so in steady state those reads make no
+API calls.
+
+Updates are resourceVersion-aware: an event (or a write-through from a service) only replaces a
+stored object if it is newer, so a late watch event cannot overwrite a fresher object. If the watch
+expires (410 Gone) or fails, the informer relists and resumes watching.
+
+Objects are stored as the plain dictionaries returned by the API server (camelCase keys), for
+built-in kinds as well as custom resources.
+
+Informers can also keep secondary indexes (e.g. Pods by owning ReplicaSet), which are updated
+with every change to the store so lookups by index key never scan the whole store.
+
+Returns:
+    None: This module does not return any values.
+"""
+import copy
+import json
+import logging
+import threading
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger("portal")
+
+
+def _is_newer(candidate: str, current: str) -> bool:
+    """
+    Check whether a resourceVersion is newer than another.
+
+    resourceVersions are opaque strings, but the API server backed by etcd uses increasing
+    integers. If either version is not an integer, the candidate is treated as newer.
+
+    Args:
+        candidate (str): The resourceVersion of the incoming object.
+        current (str): The resourceVersion of the stored object.
+
+    Returns:
+        bool: True if the candidate should replace the stored object.
+    """
+    if not current or not candidate:
+        return True
+    if candidate.isdigit() and current.isdigit():
+        return int(candidate) >= int(current)
+    return True
+
+
+def owner_index(kind: str):
+    """
+    Build an index function that keys objects by the names of their owners of a kind.
+
+    Args:
+        kind (str): The owner kind (e.g. "ReplicaSet").
+
+    Returns:
+        callable: A function returning the names of an object's owners of that kind.
+    """
+    def owners(obj: dict) -> list:
+        references = obj.get("metadata", {}).get("ownerReferences") or []
+        return [reference["name"] for reference in references if reference.get("kind") == kind]
+    return owners
+
+
+class Informer:
+    """
+    Local store of Kubernetes objects kept in sync by a list followed by a watch.
+
+    Methods:
+        start: Start the list/watch thread.
+        stop: Stop the list/watch thread.
+        wait_for_sync: Wait until the initial list has been loaded.
+        has_synced: Whether the store reflects the API server.
+        contains: Whether an object exists in the store.
+        get: Get a copy of a stored object.
+        list: List copies of every stored object.
+        items: List the stored objects without copying them.
+        add_index: Keep a secondary index of the stored objects.
+        by_index: List the stored objects with a given index key without copying them.
+        upsert: Store an object if it is newer than the stored one.
+        remove: Remove an object from the store.
+        replace_all: Replace the store with the result of a list.
+    """
+
+    def __init__(self, api, list_method: str, namespace: str, watch_timeout_seconds: int = 300,
+                 on_change=None, **list_kwargs):
+        """
+        Initialize the informer.
+
+        Args:
+            api: The Kubernetes API object used to list and watch (e.g. `client.CoreV1Api`).
+            list_method (str): The name of the API's namespaced list method
+                (e.g. "list_namespaced_pod").
+            namespace (str): The namespace to watch.
+            watch_timeout_seconds (int): How long each watch request stays open.
+            on_change (callable): Called with no arguments after the store changes.
+            **list_kwargs: Extra arguments for the list method (e.g. the CRD group and plural).
+        """
+        self.api = api
+        self.list_method = list_method
+        self.namespace = namespace
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.on_change = on_change
+        self.list_kwargs = list_kwargs
+
+        self._store = {}
+        self._indexers = {}
+        self._indices = {}
+        self._lock = threading.RLock()
+        self._resource_version = None
+        self._synced = threading.Event()
+        self._stopping = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    def start(self):
+        """
+        Start the list/watch thread if it is not already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self.list_method}-{self.namespace}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the list/watch thread.
+        """
+        self._stopping.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def wait_for_sync(self, timeout: float = None) -> bool:
+        """
+        Wait until the initial list has been loaded.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the store has synced.
+        """
+        return self._synced.wait(timeout)
+
+    def has_synced(self) -> bool:
+        """
+        Whether the store reflects the API server and can be used to answer reads.
+
+        Returns:
+            bool: True once the initial list has been loaded and while the watch is healthy.
+        """
+        return self._synced.is_set()
+
+    def contains(self, name: str) -> bool:
+        """
+        Check if an object is in the store.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            bool: True if the resource exists.
+        """
+        with self._lock:
+            return name in self._store
+
+    def get(self, name: str):
+        """
+        Get a copy of a stored object.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            dict or None: The object or None if it is not in the store.
+        """
+        with self._lock:
+            obj = self._store.get(name)
+        return copy.deepcopy(obj) if obj is not None else None
+
+    def list(self) -> list:
+        """
+        List copies of every stored object.
+
+        Returns:
+            list: The objects in the namespace.
+        """
+        return copy.deepcopy(self.items())
+
+    def items(self) -> list:
+        """
+        List the stored objects without copying them. Callers must not modify the objects.
+
+        Returns:
+            list: The objects in the namespace.
+        """
+        with self._lock:
+            return list(self._store.values())
+
+    def add_index(self, name: str, index_func):
+        """
+        Keep a secondary index of the stored objects, updated with every change to the store.
+
+        Args:
+            name (str): The name of the index.
+            index_func (callable): Returns the list of index keys for an object.
+        """
+        with self._lock:
+            self._indexers[name] = index_func
+            self._indices[name] = {}
+            for obj in self._store.values():
+                self._index_object(name, obj)
+
+    def by_index(self, name: str, key: str) -> list:
+        """
+        List the stored objects with an index key without copying them. Callers must not modify
+        the objects.
+
+        Args:
+            name (str): The name of the index.
+            key (str): The index key.
+
+        Returns:
+            list: The objects with the key.
+        """
+        with self._lock:
+            names = self._indices[name].get(key, ())
+            return [self._store[object_name] for object_name in names]
+
+    def _index_object(self, name: str, obj: dict):
+        """
+        Add an object to one index. Must hold the lock.
+        """
+        object_name = obj["metadata"]["name"]
+        index = self._indices[name]
+        for key in self._indexers[name](obj):
+            index.setdefault(key, set()).add(object_name)
+
+    def _unindex_object(self, name: str, obj: dict):
+        """
+        Remove an object from one index. Must hold the lock.
+        """
+        object_name = obj["metadata"]["name"]
+        index = self._indices[name]
+        for key in self._indexers[name](obj):
+            names = index.get(key)
+            if names is not None:
+                names.discard(object_name)
+                if not names:
+                    del index[key]
+
+    def upsert(self, obj: dict):
+        """
+        Store an object if it is at least as new as the stored one.
+
+        Args:
+            obj (dict): The object.
+        """
+        metadata = obj.get("metadata", {})
+        name = metadata.get("name")
+        if not name:
+            return
+        with self._lock:
+            stored = self._store.get(name)
+            stored_version = stored["metadata"].get("resourceVersion") if stored else None
+            if not _is_newer(metadata.get("resourceVersion"), stored_version):
+                return
+            for index_name in self._indexers:
+                if stored is not None:
+                    self._unindex_object(index_name, stored)
+                self._index_object(index_name, obj)
+            self._store[name] = obj
+        self._changed()
+
+    def remove(self, name: str, resource_version: str = None):
+        """
+        Remove an object from the store.
+
+        Args:
+            name (str): The name of the object.
+            resource_version (str): The resourceVersion of the deletion, if known. The stored
+                object is kept if it is newer than the deletion.
+        """
+        with self._lock:
+            stored = self._store.get(name)
+            if stored is None:
+                return
+            if not _is_newer(resource_version, stored["metadata"].get("resourceVersion")):
+                return
+            for index_name in self._indexers:
+                self._unindex_object(index_name, stored)
+            del self._store[name]
+        self._changed()
+
+    def replace_all(self, items: list, resource_version: str):
+        """
+        Replace the store with the result of a list.
+
+        Args:
+            items (list): The listed objects.
+            resource_version (str): The resourceVersion of the list.
+        """
+        with self._lock:
+            self._store = {
+                item["metadata"]["name"]: item for item in items
+                if item.get("metadata", {}).get("name")
+            }
+            for index_name in self._indexers:
+                self._indices[index_name] = {}
+                for obj in self._store.values():
+                    self._index_object(index_name, obj)
+            self._resource_version = resource_version
+        self._synced.set()
+        self._changed()
+
+    def _changed(self):
+        """
+        Notify the `on_change` callback that the store has changed.
+        """
+        if self.on_change is not None:
+            self.on_change()
+
+    def _list(self):
+        """
+        List every object and replace the store.
+
+        The response is decoded as plain JSON rather than into client models, so built-in kinds
+        are stored in the same shape as custom resources.
+        """
+        response = getattr(self.api, self.list_method)(
+            namespace=self.namespace,
+            _preload_content=False,
+            **self.list_kwargs,
+        )
+        result = json.loads(response.data)
+        self.replace_all(
+            result.get("items", []), result.get("metadata", {}).get("resourceVersion")
+        )
+
+    def _run(self):
+        """
+        List, then watch from the list's resourceVersion; relist whenever the watch breaks.
+        """
+        backoff = 1
+        while not self._stopping.is_set():
+            try:
+                self._list()
+                backoff = 1
+                self._watch_events()
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info(
+                        "Watch of %s in %s expired; relisting", self.list_method, self.namespace
+                    )
+                    continue
+                logger.error("Watch of %s in %s failed: %s", self.list_method, self.namespace, e)
+                self._synced.clear()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Watch of %s in %s failed: %s", self.list_method, self.namespace, e)
+                self._synced.clear()
+
+            if self._stopping.wait(backoff):
+                return
+            backoff = min(backoff * 2, 30)
+
+    def _watch_events(self):
+        """
+        Follow the watch until it times out, then continue from the last seen resourceVersion.
+        """
+        while not self._stopping.is_set():
+            self._watch = watch.Watch()
+            for event in self._watch.stream(
+                getattr(self.api, self.list_method),
+                namespace=self.namespace,
+                resource_version=self._resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=self.watch_timeout_seconds,
+                **self.list_kwargs,
+            ):
+                self._handle_event(event["type"], event["raw_object"])
+
+    def _handle_event(self, event_type: str, obj: dict):
+        """
+        Apply a single watch event to the store.
+
+        Args:
+            event_type (str): ADDED, MODIFIED, DELETED or BOOKMARK.
+            obj (dict): The object carried by the event.
+        """
+        metadata = obj.get("metadata", {})
+        resource_version = metadata.get("resourceVersion")
+
+        if event_type in ("ADDED", "MODIFIED"):
+            self.upsert(obj)
+        elif event_type == "DELETED":
+            self.remove(metadata.get("name"), resource_version)
+
+        if resource_version:
+            with self._lock:
+                self._resource_version = resource_version
+
+
+class MonsterInformer(Informer):
+    """
+    Informer for the `kaschaefer.com/v1` Monster custom resources in one namespace.
+    """
+
+    def __init__(self, api, namespace: str, group: str = "kaschaefer.com",
+                 version: str = "v1", plural: str = "monsters", **kwargs):
+        """
+        Initialize the informer.
+
+        Args:
+            api (client.CustomObjectsApi): The API used to list and watch Monster resources.
+            namespace (str): The namespace to watch.
+            group (str): The Monster CRD group.
+            version (str): The Monster CRD version.
+            plural (str): The Monster CRD plural name.
+            **kwargs: Extra arguments for `Informer`.
+        """
+        super().__init__(
+            api, "list_namespaced_custom_object", namespace,
+            group=group, version=version, plural=plural, **kwargs
+        )
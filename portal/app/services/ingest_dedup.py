@@ -0,0 +1,150 @@
+"""
+This module defines the `IngestDedup` class, which remembers the last payload accepted by each
+ingest stream, and the `deduplicated` decorator, which answers a repeated payload without
+validating or storing it again.
+
+The game resends the player, items, pack, game state and game stats every tick whether or not they
+changed. A decorated ingest route hashes the raw request body; when the digest matches the last
+payload the stream accepted, the route answers 200 at once and the payload is counted as
+deduplicated (see `brogue_ingest_deduplicated` in `app.services.metrics`).
+
+Each accepted digest is recorded with the versions of the stores the stream writes (see
+`app.services.versions`), and a payload is only skipped while those versions are unchanged. Any
+other write to the stores, e.g. a game reset, an admin kill or another worker's ingest, makes the
+next payload be applied again even if its body is identical. A digest is not recorded when another
+write landed on the same stores while the payload was being applied, since the stores may then no
+longer hold the payload.
+
+The digests and the counts live in the state backend, so every worker sharing the state skips
+the same payloads.
+
+Returns:
+    None: This module does not return any values.
+"""
+import functools
+import hashlib
+from flask import current_app, jsonify, request
+from app.services.state_backend import get_backend
+from app.services.versions import (
+    store_versions, PLAYER, MONSTERS, ITEMS, PACK, GAME_STATE, GAME_STATS
+)
+
+# Backend map of the last accepted payload of each stream: [digest, store versions]
+DIGESTS = "ingest_digests"
+
+# Ingest streams, one per deduplicated route: the store each route writes, plus the combined tick
+TICK = "tick"
+STREAMS = (PLAYER, MONSTERS, ITEMS, PACK, GAME_STATE, GAME_STATS, TICK)
+
+
+class IngestDedup:
+    """
+    Last accepted payload of each ingest stream, kept in the state backend.
+
+    Methods:
+        digest: Hash a request body.
+        is_duplicate: Whether a payload is the last one a stream accepted, with unchanged stores.
+        record: Remember the payload a stream just accepted.
+        deduplicated: Count a skipped payload.
+        counts: Get the number of skipped payloads per stream.
+    """
+
+    @staticmethod
+    def digest(body: bytes) -> str:
+        """
+        Hash a request body.
+
+        Args:
+            body (bytes): The raw request body.
+
+        Returns:
+            str: The hex digest.
+        """
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def is_duplicate(self, stream: str, digest: str, versions: list) -> bool:
+        """
+        Whether a payload is the last one the stream accepted and its stores did not change since.
+
+        Args:
+            stream (str): The ingest stream.
+            digest (str): The digest of the payload.
+            versions (list): The current versions of the stores the stream writes.
+
+        Returns:
+            bool: True if the payload can be skipped.
+        """
+        last = (get_backend().map_snapshot(DIGESTS) or {}).get(stream)
+        return last is not None and last[0] == digest and last[1] == versions
+
+    def record(self, stream: str, digest: str, before: list, after: list):
+        """
+        Remember the payload a stream just accepted, unless another write to its stores may have
+        overwritten it.
+
+        Args:
+            stream (str): The ingest stream.
+            digest (str): The digest of the payload.
+            before (list): The versions of the stores before the payload was applied.
+            after (list): The versions of the stores after the payload was applied.
+        """
+        if all(new - old <= 1 for old, new in zip(before, after)):
+            get_backend().map_update(DIGESTS, {stream: [digest, after]})
+
+    @staticmethod
+    def deduplicated(stream: str):
+        """
+        Count a skipped payload.
+
+        Args:
+            stream (str): The ingest stream.
+        """
+        get_backend().incr(f"ingest_deduplicated:{stream}")
+
+    @staticmethod
+    def counts() -> dict:
+        """
+        Get the number of skipped payloads per stream.
+
+        Returns:
+            dict: The stream mapped to its count.
+        """
+        counters = get_backend().counters([f"ingest_deduplicated:{stream}" for stream in STREAMS])
+        return {stream: counters[f"ingest_deduplicated:{stream}"] for stream in STREAMS}
+
+
+ingest_dedup = IngestDedup()
+
+
+def deduplicated(stream: str, *stores: str):
+    """
+    Decorate an ingest view so a payload identical to the last one it accepted is skipped.
+
+    Args:
+        stream (str): The ingest stream (one of `STREAMS`).
+        *stores (str): The names of the stores the view writes, by default the stream's store.
+
+    Returns:
+        callable: The decorator.
+    """
+    stores = stores or (stream,)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("INGEST_DEDUP_ENABLED", True):
+                return view(*args, **kwargs)
+
+            digest = ingest_dedup.digest(request.get_data(cache=True))
+            before = store_versions.versions(*stores)
+            if ingest_dedup.is_duplicate(stream, digest, before):
+                ingest_dedup.deduplicated(stream)
+                return jsonify({"status": "success", "message": "payload unchanged"}), 200
+
+            response = view(*args, **kwargs)
+            status = response[1] if isinstance(response, tuple) else response.status_code
+            if status == 200:
+                ingest_dedup.record(stream, digest, before, store_versions.versions(*stores))
+            return response
+        return wrapper
+    return decorator
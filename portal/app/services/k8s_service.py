@@ -11,7 +11,9 @@ integrates with Flask's logging system to log operations and errors related to M
 Features:
 - Create, update, and delete Monster resources in Kubernetes.
 - List and retrieve Monster resources by name and namespace.
-- Bulk delete Monster resources within a namespace.
+- Bulk delete Monster resources within a namespace with a single label-selected collection delete.
+- Single-round-trip writes ("patch" mode): merge-patch updates and unchecked creates/deletes.
+- Optional watch-backed local cache that answers existence checks, gets and lists.
 - Integration with Prometheus for monitoring (via logging).
 
 Prometheus integration:
@@ -29,10 +31,93 @@ Methods:
     - get_monster: Retrieve a specific Monster custom resource by name.
     - delete_all_monsters_in_namespace: Delete all Monster resources in a namespace.
 """
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
 from kubernetes import config, client
 from kubernetes.client.rest import ApiException
+from app.utils.config import Config
+from app.services.informer import MonsterInformer
+
+# Write modes for Monster resources
+WRITE_MODE_PATCH = "patch"      # One API call per write; 404/409 are handled as results
+WRITE_MODE_REPLACE = "replace"  # Existence check, GET and replace (original behaviour)
+WRITE_MODES = (WRITE_MODE_PATCH, WRITE_MODE_REPLACE)
+
+# Label put on every Monster resource created by the portal, which selects them on reset
+MANAGED_BY_LABEL = "app.kubernetes.io/managed-by"
+MANAGED_BY_VALUE = "k8s-dungeon-crawl-portal"
+_api_client = None
+_api_client_lock = threading.Lock()
+
+
+def get_api_client() -> client.ApiClient:
+    """
+    Return the Kubernetes API client shared by every service in the portal.
+
+    The first call loads the Kubernetes configuration from within the cluster, falling back to
+    the kubeconfig file for local development. All API objects built on the returned client share
+    one connection pool, sized by the `K8S_CONNECTION_POOL_MAXSIZE` environment variable.
+
+    Returns:
+        client.ApiClient: The shared API client.
+
+    Raises:
+        config.ConfigException: If neither in-cluster config nor kubeconfig is available.
+    """
+    global _api_client  # pylint: disable=global-statement
+    with _api_client_lock:
+        if _api_client is None:
+            try:
+                config.load_incluster_config()  # Load config from the cluster if running inside K8s
+            except config.ConfigException:
+                config.load_kube_config()  # Fallback to kubeconfig for local development
+
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = int(
+                Config.get("K8S_CONNECTION_POOL_MAXSIZE", "16")
+            )
+            _api_client = client.ApiClient(configuration)
+        return _api_client
+
+
+def to_monster_spec(monster_data: dict) -> dict:
+    """
+    Convert monster data from the portal's snake_case fields to the Monster CRD's camelCase spec.
+
+    Fields without a value are left out: in a JSON merge patch, a null would delete the field
+    from the resource.
+
+    Args:
+        monster_data (dict): Dictionary containing the monster-specific data.
+
+    Returns:
+        dict: The Monster resource spec.
+    """
+    spec = {
+        "accuracy": monster_data.get("accuracy"),
+        "attackSpeed": monster_data.get("attack_speed"),
+        "damageMax": monster_data.get("damage_max"),
+        "damageMin": monster_data.get("damage_min"),
+        "deathTimestamp": monster_data.get("death_timestamp"),
+        "defense": monster_data.get("defense"),
+        "depth": monster_data.get("depth"),
+        "hp": monster_data.get("hp"),
+        "id": monster_data.get("id"),
+        "isDead": monster_data.get("is_dead"),
+        "isAdminKill": monster_data.get("is_admin_kill"),
+        "maxHp": monster_data.get("max_hp"),
+        "movementSpeed": monster_data.get("movement_speed"),
+        "name": monster_data.get("name"),
+        "podName": monster_data.get("pod_name"),
+        "position": monster_data.get("position"),
+        "spawnTimestamp": monster_data.get("spawn_timestamp"),
+        "turnsBetweenRegen": monster_data.get("turns_between_regen"),
+        "type": monster_data.get("type"),
+    }
+    return {field: value for field, value in spec.items() if value is not None}
+
 
 class KubernetesService:
     """
@@ -51,7 +136,7 @@ class KubernetesService:
         delete_all_monsters_in_namespace: Delete all Monster resources in a given namespace.
     """
 
-    def __init__(self):
+    def __init__(self, write_mode: str = None):
         """
         Initialize the Kubernetes client.
 
@@ -59,15 +144,72 @@ class KubernetesService:
         If the app is running outside of a Kubernetes cluster, it falls back to loading
         the kubeconfig file for local development.
 
+        Args:
+            write_mode (str): How Monster resources are written. In "patch" mode (the default)
+                creates, updates and deletes are a single API call: updates are sent as a JSON
+                merge patch, a 409 on create or a 404 on delete is handled as a normal result
+                instead of being prevented by an existence check, and an update that gets a 404
+                is skipped, like in "replace" mode. "replace" mode keeps the existence check and
+                GET-then-replace updates. Defaults to the `MONSTER_CR_WRITE_MODE` environment
+                variable.
+
         Raises:
             config.ConfigException: If neither in-cluster config nor kubeconfig is available.
+            ValueError: If the write mode is not supported.
         """
-        try:
-            config.load_incluster_config()  # Load config from the cluster if running inside K8s
-        except config.ConfigException:
-            config.load_kube_config()  # Fallback to kubeconfig for local development
+        self.write_mode = write_mode or Config.get("MONSTER_CR_WRITE_MODE", WRITE_MODE_PATCH)
+        if self.write_mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported Monster resource write mode: {self.write_mode}")
+        self.delete_workers = int(Config.get("MONSTER_DELETE_WORKERS", "8"))
 
-        self.api = client.CustomObjectsApi()
+        self.api = client.CustomObjectsApi(get_api_client())
+        self._informers = {}
+
+    def enable_cache(self, namespace: str) -> MonsterInformer:
+        """
+        Keep a local, watch-backed store of the Monster resources in a namespace.
+
+        Once the informer has synced, `resource_exists`, `get_monster` and
+        `list_monsters_in_namespace` are answered from the store instead of the API server.
+        Until then, and whenever the watch is broken, reads fall back to the API server.
+
+        Args:
+            namespace (str): The Kubernetes namespace to cache.
+
+        Returns:
+            MonsterInformer: The informer backing the cache.
+        """
+        informer = self._informers.get(namespace)
+        if informer is None:
+            informer = MonsterInformer(self.api, namespace)
+            self._informers[namespace] = informer
+        informer.start()
+        return informer
+
+    def _cache_for(self, namespace: str):
+        """
+        Returns the synced informer for a namespace, or None if reads must go to the API server.
+        """
+        informer = self._informers.get(namespace)
+        if informer is not None and informer.has_synced():
+            return informer
+        return None
+
+    def _cache_upsert(self, namespace: str, obj):
+        """
+        Write an object returned by the API server through to the namespace's cache.
+        """
+        informer = self._informers.get(namespace)
+        if informer is not None and isinstance(obj, dict):
+            informer.upsert(obj)
+
+    def _cache_remove(self, namespace: str, name: str):
+        """
+        Remove a deleted object from the namespace's cache.
+        """
+        informer = self._informers.get(namespace)
+        if informer is not None:
+            informer.remove(name)
 
     def resource_exists(self, name: str, namespace: str) -> bool:
         """
@@ -80,6 +222,10 @@ class KubernetesService:
         Returns:
             bool: True if the resource exists, False otherwise.
         """
+        cache = self._cache_for(namespace)
+        if cache is not None:
+            return cache.contains(name)
+
         try:
             self.api.get_namespaced_custom_object(
                 group="kaschaefer.com",
@@ -107,51 +253,40 @@ class KubernetesService:
         Raises:
             Exception: If there is an error creating the Monster resource.
         """
-        if self.resource_exists(name, namespace):
+        if self.write_mode == WRITE_MODE_REPLACE and self.resource_exists(name, namespace):
             current_app.logger.warning(f"Monster resource {name} already exists in namespace \
                 {namespace} - unable to create")
             return
 
         # Convert keys in monster_data to camelCase
-        monster_data = {
-            "accuracy": monster_data.get("accuracy"),
-            "attackSpeed": monster_data.get("attack_speed"),
-            "damageMax": monster_data.get("damage_max"),
-            "damageMin": monster_data.get("damage_min"),
-            "deathTimestamp": monster_data.get("death_timestamp"),
-            "defense": monster_data.get("defense"),
-            "depth": monster_data.get("depth"),
-            "hp": monster_data.get("hp"),
-            "id": monster_data.get("id"),
-            "isDead": monster_data.get("is_dead"),
-            "isAdminKill": monster_data.get("is_admin_kill"),
-            "maxHp": monster_data.get("max_hp"),
-            "movementSpeed": monster_data.get("movement_speed"),
-            "name": monster_data.get("name"),
-            "podName": monster_data.get("pod_name"),
-            "position": monster_data.get("position"),
-            "spawnTimestamp": monster_data.get("spawn_timestamp"),
-            "turnsBetweenRegen": monster_data.get("turns_between_regen"),
-            "type": monster_data.get("type"),
-        }
+        monster_data = to_monster_spec(monster_data)
 
         monster_manifest = {
             "apiVersion": "kaschaefer.com/v1",
             "kind": "Monster",
-            "metadata": {"name": name, "namespace": namespace},
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "labels": {MANAGED_BY_LABEL: MANAGED_BY_VALUE},
+            },
             "spec": monster_data,
         }
 
         try:
-            self.api.create_namespaced_custom_object(
+            created = self.api.create_namespaced_custom_object(
                 group="kaschaefer.com",
                 version="v1",
                 namespace=namespace,
                 plural="monsters",
                 body=monster_manifest,
             )
+            self._cache_upsert(namespace, created)
             current_app.logger.info(f"Created Monster resource: {name}")
         except client.exceptions.ApiException as e:
+            if e.status == 409:
+                current_app.logger.warning(f"Monster resource {name} already exists in namespace \
+                    {namespace} - unable to create")
+                return
             current_app.logger.error(f"Failed to create Monster resource: {e}")
             raise RuntimeError(f"Failed to create Monster resource: {e}") from e
 
@@ -170,34 +305,18 @@ class KubernetesService:
             ValueError: If the resource does not have a 'spec' field.
             client.exceptions.ApiException: If there is an error with the API request.
         """
+        if self.write_mode == WRITE_MODE_PATCH:
+            self._patch_monster_resource(name, namespace, to_monster_spec(monster_data))
+            return
+
+        # Convert keys in monster_data to camelCase
+        monster_data = to_monster_spec(monster_data)
+
         if not self.resource_exists(name, namespace):
             current_app.logger.warning(f"Monster resource {name} does not exist in namespace \
                 {namespace} - unable to update")
             return
 
-        # Convert keys in monster_data to camelCase
-        monster_data = {
-            "accuracy": monster_data.get("accuracy"),
-            "attackSpeed": monster_data.get("attack_speed"),
-            "damageMax": monster_data.get("damage_max"),
-            "damageMin": monster_data.get("damage_min"),
-            "deathTimestamp": monster_data.get("death_timestamp"),
-            "defense": monster_data.get("defense"),
-            "depth": monster_data.get("depth"),
-            "hp": monster_data.get("hp"),
-            "id": monster_data.get("id"),
-            "isDead": monster_data.get("is_dead"),
-            "isAdminKill": monster_data.get("is_admin_kill"),
-            "maxHp": monster_data.get("max_hp"),
-            "movementSpeed": monster_data.get("movement_speed"),
-            "name": monster_data.get("name"),
-            "podName": monster_data.get("pod_name"),
-            "position": monster_data.get("position"),
-            "spawnTimestamp": monster_data.get("spawn_timestamp"),
-            "turnsBetweenRegen": monster_data.get("turns_between_regen"),
-            "type": monster_data.get("type"),
-        }
-
         for attempt in range(retries):
             try:
                 current_resource = self.api.get_namespaced_custom_object(
@@ -213,7 +332,7 @@ class KubernetesService:
 
                 current_resource["spec"].update(monster_data)
 
-                self.api.replace_namespaced_custom_object(
+                replaced = self.api.replace_namespaced_custom_object(
                     group="kaschaefer.com",
                     version="v1",
                     namespace=namespace,
@@ -221,6 +340,7 @@ class KubernetesService:
                     name=name,
                     body=current_resource,
                 )
+                self._cache_upsert(namespace, replaced)
 
                 current_app.logger.info(f"Updated Monster resource: {name}")
                 return
@@ -236,6 +356,41 @@ class KubernetesService:
                 current_app.logger.error(f"Invalid resource structure: {e}")
                 raise e
 
+    def _patch_monster_resource(self, name: str, namespace: str, spec: dict):
+        """
+        Update a Monster custom resource's spec with a single JSON merge patch.
+
+        A merge patch carries no resourceVersion, so it cannot conflict and needs no retries. Like
+        the replace mode, an update of a missing resource (e.g. an admin-killed monster the game
+        still reports alive) is logged and skipped, so it never brings the resource back.
+
+        Args:
+            name (str): The name of the Monster resource.
+            namespace (str): The Kubernetes namespace where the resource is located.
+            spec (dict): The camelCase spec fields to update.
+
+        Raises:
+            client.exceptions.ApiException: If there is an error with the API request.
+        """
+        try:
+            patched = self.api.patch_namespaced_custom_object(
+                group="kaschaefer.com",
+                version="v1",
+                namespace=namespace,
+                plural="monsters",
+                name=name,
+                body={"spec": spec},
+            )
+            self._cache_upsert(namespace, patched)
+            current_app.logger.info(f"Updated Monster resource: {name}")
+        except ApiException as e:
+            if e.status == 404:
+                current_app.logger.warning(f"Monster resource {name} does not exist in namespace \
+                    {namespace} - unable to update")
+                return
+            current_app.logger.error(f"Failed to update Monster resource: {e}")
+            raise e
+
     def delete_monster_resource(self, name: str, namespace: str):
         """
         Delete a specific Monster custom resource.
@@ -247,7 +402,7 @@ class KubernetesService:
         Raises:
             client.exceptions.ApiException: If there is an error with the API request.
         """
-        if not self.resource_exists(name, namespace):
+        if self.write_mode == WRITE_MODE_REPLACE and not self.resource_exists(name, namespace):
             current_app.logger.warning(f"Monster resource {name} does not exist in namespace \
                 {namespace} - unable to delete")
             return
@@ -260,10 +415,16 @@ class KubernetesService:
                 plural="monsters",
                 name=name,
             )
+            self._cache_remove(namespace, name)
             current_app.logger.info(
                 f"Successfully deleted Monster resource: {name} in namespace {namespace}"
             )
         except client.exceptions.ApiException as e:
+            if e.status == 404:
+                self._cache_remove(namespace, name)
+                current_app.logger.warning(f"Monster resource {name} does not exist in namespace \
+                    {namespace} - unable to delete")
+                return
             current_app.logger.error(
                 f"Failed to delete Monster resource {name} in namespace {namespace}: {e}"
             )
@@ -287,6 +448,10 @@ class KubernetesService:
         Raises:
             client.exceptions.ApiException: If there is an error with the API request.
         """
+        cache = self._cache_for(namespace)
+        if cache is not None:
+            return cache.list()
+
         try:
             monsters = self.api.list_namespaced_custom_object(
                 group="kaschaefer.com",
@@ -313,6 +478,13 @@ class KubernetesService:
         Raises:
             client.exceptions.ApiException: If there is an error with the API request.
         """
+        cache = self._cache_for(namespace)
+        if cache is not None:
+            monster = cache.get(name)
+            if monster is None:
+                current_app.logger.warning(f"Monster resource not found: {name}")
+            return monster
+
         try:
             return self.api.get_namespaced_custom_object(
                 group="kaschaefer.com",
@@ -332,26 +504,65 @@ class KubernetesService:
         """
         Delete all Monster custom resources in a specific namespace.
 
+        Every Monster resource created by the portal is labeled, so they are removed with a single
+        label-selected collection delete. Any resources the collection delete did not cover
+        (e.g. created before resources were labeled, or if the collection delete is not allowed)
+        are deleted one by one on a bounded pool of `MONSTER_DELETE_WORKERS` threads.
+
         Args:
             namespace (str): The Kubernetes namespace containing the resources to delete.
 
         Raises:
             client.exceptions.ApiException: If there is an error with the API request.
         """
+        label_selector = f"{MANAGED_BY_LABEL}={MANAGED_BY_VALUE}"
         try:
-            monsters = self.list_monsters_in_namespace(namespace)
+            self.api.delete_collection_namespaced_custom_object(
+                group="kaschaefer.com",
+                version="v1",
+                namespace=namespace,
+                plural="monsters",
+                label_selector=label_selector,
+            )
+            collection_deleted = True
+            current_app.logger.info(
+                f"Deleted Monster resources matching {label_selector} in namespace {namespace}"
+            )
+        except client.exceptions.ApiException as e:
+            collection_deleted = False
+            current_app.logger.warning(f"\
+                Collection delete of Monster resources in namespace {namespace} failed, \
+                deleting one by one: {e}")
 
-            if not monsters:
-                current_app.logger.info(f"No Monster resources found in namespace {namespace}")
+        try:
+            remaining = [
+                monster for monster in self.list_monsters_in_namespace(namespace)
+                if not monster.get("metadata", {}).get("deletionTimestamp")
+                and not (collection_deleted and monster.get("metadata", {}).get(
+                    "labels", {}).get(MANAGED_BY_LABEL) == MANAGED_BY_VALUE)
+            ]
+
+            if not remaining:
+                current_app.logger.info(f"No remaining Monster resources in namespace {namespace}")
                 return
 
-            for monster in monsters:
+            names = []
+            for monster in remaining:
                 name = monster.get("metadata", {}).get("name")
-                if name and self.resource_exists(name, namespace):
-                    self.delete_monster_resource(name, namespace)
+                if name:
+                    names.append(name)
                 else:
-                    current_app.logger.warning(f"\
-                        Monster resource missing 'name' field or does not exist: {monster}")
+                    current_app.logger.warning(f"Monster resource missing 'name' field: {monster}")
+
+            app = current_app._get_current_object()  # pylint: disable=protected-access
+
+            def delete_one(name):
+                with app.app_context():
+                    self.delete_monster_resource(name, namespace)
+
+            with ThreadPoolExecutor(max_workers=self.delete_workers) as executor:
+                # Consume the results so the first failure is raised here
+                list(executor.map(delete_one, names))
 
         except client.exceptions.ApiException as e:
             current_app.logger.error(f"\
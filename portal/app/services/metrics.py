@@ -1,202 +1,306 @@
 """
-This module defines the `MetricsService` class, which is responsible for managing and updating
-Prometheus metrics related to the game, including player stats, game events, and monster data.
+This module defines the `GameCollector` class, the single source of the portal's game metrics.
 
-It uses the `prometheus_client` library to expose various metrics such as the amount of gold
-collected by the player, the player's current depth level, the number of games played, and monster 
-creation and death data.
-
-The class also integrates logging to track metric updates and events.
+The collector is registered with the Prometheus registry and reads the current values from the
+state stores and the monster registry only when `/metrics` is scraped, so ingesting game data does
+no metric work and the metrics can never drift from the stored state. Values the game has not sent
+yet are left out of the scrape rather than reported as 0.
 
 Prometheus Metrics:
-- `brogue_player_gold`: Amount of gold collected by the player.
-- `brogue_depth_level`: Current depth level of the player.
-- `brogue_player_current_hp`: Current hit points of the player.
-- `brogue_games_played`: Total number of games played.
-- `brogue_games_won`: Total number of games won.
-- `brogue_monster_count`: Total number of monsters created.
-- `brogue_monster_death_count`: Total number of monsters that have died.
-- `brogue_monster_lifespan_seconds`: Time (in seconds) that monsters stay alive.
-- `brogue_last_monster_created_timestamp`: Timestamp of the last monster created.
+- Player (`PLAYER_GAUGES`): e.g. `brogue_player_gold`, `brogue_depth_level`, `brogue_strength`.
+- Game state (`GAME_STATE_GAUGES`): e.g. `brogue_reward_rooms_generated`, `brogue_game_has_ended`.
+- Game stats (`GAME_STATS_GAUGES`): e.g. `brogue_games_played`, `brogue_win_rate`.
+- Equipped items (`ITEM_GAUGES`): `brogue_weapon_damage_min`, `brogue_weapon_damage_max` and
+  `brogue_armor_defense`.
+- `brogue_monster_count`: Total number of monsters created in the current game.
+- `brogue_monster_death_count`: Total number of monsters that have died in the current game.
+- `brogue_monster_lifespan_seconds`: Time (in seconds) dead monsters stayed alive.
+- `brogue_last_monster_created_timestamp`: Timestamp of the last monster creation.
 - `brogue_last_monster_death_timestamp`: Timestamp of the last monster death.
-
-This service is designed to update and track the game's key metrics in real-time.
+- `brogue_monsters_alive`, `brogue_monster_deaths`, `brogue_monster_hp`: Live monsters, monster
+  deaths and the HP of the live monsters, labeled by `depth` and `type`.
+- `brogue_monster_metric_series_dropped`: Number of (depth, type) series merged into `other`.
+- `brogue_ingest_deduplicated`: Ingest payloads skipped because they were identical to the last
+  one accepted, labeled by `stream` (see `app.services.ingest_dedup`).
+
+The depth and type labels are bounded: only the depths and types with the most monsters get their
+own label value (at most `max_depth_labels` and `max_type_labels`), and the others are merged
+into the `other` value. The labeled metrics are built from the running totals the monster index
+keeps per (depth, type), so a scrape costs time proportional to the number of label values rather
+than to the number of monsters.
 
 Returns:
     None: This module does not return any values.
 """
-import time
-import logging
-from prometheus_client import Gauge, Counter, Histogram
-from typing import Dict
-
-# Configure logging
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-class MetricsService:
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+from app.services import monster_index as index
+from app.services.monster_registry import LIFESPAN_BUCKETS
+
+# (metric name, description, store key) of the gauges read from each store
+PLAYER_GAUGES = (
+    ("brogue_player_gold", "Amount of gold collected by the player", "gold"),
+    ("brogue_depth_level", "Current depth level of the player", "depth_level"),
+    ("brogue_deepest_level", "Deepest level reached by the player", "deepest_level"),
+    ("brogue_player_current_hp", "Current hit points of the player", "current_hp"),
+    ("brogue_player_max_hp", "Maximum hit points of the player", "max_hp"),
+    ("brogue_strength", "Player’s strength", "strength"),
+    ("brogue_stealth_range", "Distance from which monsters will notice the player",
+     "stealth_range"),
+    ("brogue_player_turns", "Total turns played by the player", "player_turn_number"),
+    ("brogue_regen_per_turn", "HP regeneration per turn", "regen_per_turn"),
+    ("brogue_weakness_amount", "Amount of weakness inflicted", "weakness_amount"),
+    ("brogue_poison_amount", "Amount of poison inflicted", "poison_amount"),
+    # Bonuses and modifiers from rings
+    ("brogue_clairvoyance_bonus", "Clairvoyance ring bonus", "clairvoyance"),
+    ("brogue_stealth_bonus", "Stealth ring bonus", "stealth_bonus"),
+    ("brogue_regeneration_bonus", "Regeneration ring bonus", "regeneration_bonus"),
+    ("brogue_light_multiplier", "Light multiplier ring bonus", "light_multiplier"),
+    ("brogue_awareness_bonus", "Awareness ring bonus", "awareness_bonus"),
+    ("brogue_transference", "Transference ring bonus", "transference"),
+    ("brogue_wisdom_bonus", "Wisdom ring bonus", "wisdom_bonus"),
+    ("brogue_reaping_bonus", "Reaping ring bonus", "reaping"),
+)
+
+GAME_STATE_GAUGES = (
+    ("brogue_reward_rooms_generated", "Number of reward rooms generated",
+     "reward_rooms_generated"),
+    ("brogue_game_has_ended", "Indicates if the game has ended", "game_has_ended"),
+    ("brogue_monster_spawn_fuse", "Time until a monster spawns", "monster_spawn_fuse"),
+    ("brogue_gold_generated", "Total amount of gold generated", "gold_generated"),
+    ("brogue_absolute_turn_number", "Total turns since the beginning of the game",
+     "absolute_turn_number"),
+    ("brogue_milliseconds_since_launch", "Milliseconds since game launch", "milliseconds"),
+    ("brogue_xpxp_this_turn", "Squares explored this turn", "xpxp_this_turn"),
+)
+
+GAME_STATS_GAUGES = (
+    ("brogue_games_played", "Total games played", "games_played"),
+    ("brogue_games_escaped", "Total games escaped", "games_escaped"),
+    ("brogue_games_mastered", "Total games mastered", "games_mastered"),
+    ("brogue_games_won", "Total games won", "games_won"),
+    ("brogue_win_rate", "Win rate as a percentage", "win_rate"),
+    ("brogue_game_deepest_level", "Deepest level reached", "deepest_level"),
+    ("brogue_cumulative_levels", "Total cumulative levels reached across all games",
+     "cumulative_levels"),
+    ("brogue_highest_score", "Highest score achieved", "highest_score"),
+    ("brogue_cumulative_score", "Cumulative score across all games", "cumulative_score"),
+    ("brogue_most_gold", "Most gold collected in a single game", "most_gold"),
+    ("brogue_cumulative_gold", "Cumulative gold collected across all games", "cumulative_gold"),
+    ("brogue_most_lumenstones", "Most lumenstones collected in a single game",
+     "most_lumenstones"),
+    ("brogue_cumulative_lumenstones", "Cumulative lumenstones collected across all games",
+     "cumulative_lumenstones"),
+    ("brogue_fewest_turns_win", "Fewest turns taken to win a game", "fewest_turns_win"),
+    ("brogue_cumulative_turns", "Cumulative turns played across all games", "cumulative_turns"),
+    ("brogue_longest_win_streak", "Longest win streak", "longest_win_streak"),
+    ("brogue_longest_mastery_streak", "Longest mastery streak", "longest_mastery_streak"),
+    ("brogue_current_win_streak", "Current win streak", "current_win_streak"),
+    ("brogue_current_mastery_streak", "Current mastery streak", "current_mastery_streak"),
+)
+
+# (metric name, description, path of the value in the equipped items store)
+ITEM_GAUGES = (
+    ("brogue_weapon_damage_min", "Minimum damage of equipped weapon", ("weapon", "damage", "min")),
+    ("brogue_weapon_damage_max", "Maximum damage of equipped weapon", ("weapon", "damage", "max")),
+    ("brogue_armor_defense", "Defense of equipped armor", ("armor", "armor")),
+)
+
+# Label value of the depths and types beyond the label caps
+OTHER = "other"
+
+
+def _number(value):
+    """
+    Convert a stored value to a sample value, or None if it is missing or not a number.
     """
-    A service class to manage Prometheus metrics for the game.
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    return None
 
-    This class provides methods to update and track various metrics related to the player,
-    game events, and monsters. It uses Prometheus client libraries to define and update gauges, 
-    counters, and histograms for tracking in-game statistics. Metrics are logged for monitoring
-    purposes.
 
-    Attributes:
-        player_gold (Gauge): Tracks the amount of gold collected by the player.
-        player_depth (Gauge): Tracks the player's current depth level in the game.
-        player_current_hp (Gauge): Tracks the player's current health points.
-        games_played (Counter): Tracks the total number of games played.
-        games_won (Counter): Tracks the total number of games won.
-        monster_count (Counter): Tracks the total number of monsters created.
-        monster_death_count (Counter): Tracks the total number of monster deaths.
-        monster_lifespan_histogram (Histogram): Tracks how long monsters stay alive in the game.
-        last_monster_created (Gauge): Tracks the timestamp of the last monster created.
-        last_monster_death (Gauge): Tracks the timestamp of the last monster death.
+def _top_values(totals: dict, limit: int) -> set:
+    """
+    Get the keys with the largest totals, at most `limit` of them (ties broken by key).
+    """
+    ranked = sorted(totals, key=lambda value: (-totals[value], str(value)))
+    return set(ranked[:max(limit, 0)])
 
-    Methods:
-        update_player_metrics: Updates the player's metrics based on provided data.
-        record_game_event: Records a game event such as "played" or "won".
-        record_monster_creation: Records the creation of a new monster.
-        record_monster_death: Records the death of a monster and updates related metrics.
-        reset_metrics: Resets all metrics, typically for starting a new game.
+
+def _lookup(data: dict, path: tuple):
+    """
+    Follow a path of keys through nested dicts, or return None if a key is missing.
     """
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
 
-    def __init__(self):
-        """
-        Initialize Prometheus metrics for the game.
 
-        Sets up all the required Prometheus metrics for tracking player data, game events, 
-        and monster stats. This method configures gauges, counters, and histograms for the 
-        different game metrics, and logs the successful initialization of metrics.
+class GameCollector(Collector):
+    """
+    Prometheus collector reading the game metrics from the stores at scrape time.
 
-        Raises:
-            None
-        """
-        # Player Metrics
-        self.player_gold = Gauge('brogue_player_gold', 'Amount of gold collected by the player')
-        self.player_depth = Gauge('brogue_depth_level', 'Current depth level of the player')
-        self.player_current_hp = Gauge('brogue_player_current_hp',
-                                       'Current hit points of the player')
-
-        # Game Metrics
-        self.games_played = Counter('brogue_games_played', 'Total games played')
-        self.games_won = Counter('brogue_games_won', 'Total games won')
-
-        # Monster Metrics
-        self.monster_count = Counter('brogue_monster_count', 'Total number of monsters created')
-        self.monster_death_count = Counter('brogue_monster_death_count',
-                                           'Total number of monsters that have died')
-        self.monster_lifespan_histogram = Histogram(
-            'brogue_monster_lifespan_seconds', 
-            'Time (in seconds) monsters stay alive',
-            buckets=[10, 30, 60, 300, 600, 1800, 3600, 7200]
-        )
-        self.last_monster_created = Gauge('brogue_last_monster_created_timestamp',
-                                          'Timestamp of the last monster creation')
-        self.last_monster_death = Gauge('brogue_last_monster_death_timestamp',
-                                        'Timestamp of the last monster death')
+    Attributes:
+        max_depth_labels (int): The maximum number of depth label values, besides `other`.
+        max_type_labels (int): The maximum number of type label values, besides `other`.
 
-        logger.info("Initialized Prometheus metrics.")
+    Methods:
+        init_app: Read the label caps from the app configuration.
+        collect: Build the metric families from the current stored state.
+        describe: Describe the metric families without reading the stores.
+    """
 
-    def update_player_metrics(self, data: Dict[str, float]) -> None:
+    def __init__(self, player, game_state, game_stats, equipped_items, monsters, ingest=None,
+                 max_depth_labels: int = 40, max_type_labels: int = 25):
         """
-        Update Prometheus player metrics.
-
-        Updates the player's metrics such as gold collected, depth level, and current health points.
-        The method checks if the relevant data keys exist in the provided dictionary and updates the
-        corresponding Prometheus metrics.
+        Initialize the collector.
 
         Args:
-            data (Dict[str, float]): A dictionary containing player metrics (e.g., gold, depth, HP).
-
-        Raises:
-            None
+            player (SnapshotDict): The player data.
+            game_state (SnapshotDict): The game state data.
+            game_stats (SnapshotDict): The game stats data.
+            equipped_items (SnapshotDict): The equipped items, stored as dicts.
+            monsters (MonsterRegistry): The monsters of the current game.
+            ingest (IngestDedup): The deduplicated ingest payload counts, or None to leave them out.
+            max_depth_labels (int): The maximum number of depth label values, besides `other`.
+            max_type_labels (int): The maximum number of type label values, besides `other`.
         """
-        if 'gold' in data:
-            self.player_gold.set(data['gold'])
-        if 'depthLevel' in data:
-            self.player_depth.set(data['depthLevel'])
-        if 'currentHP' in data:
-            self.player_current_hp.set(data['currentHP'])
-        logger.info("Updated player metrics: %s", data)
-
-    def record_game_event(self, event: str) -> None:
+        self.player = player
+        self.game_state = game_state
+        self.game_stats = game_stats
+        self.equipped_items = equipped_items
+        self.monsters = monsters
+        self.ingest = ingest
+        self.max_depth_labels = max_depth_labels
+        self.max_type_labels = max_type_labels
+
+    def init_app(self, app):
         """
-        Record a game-related event in Prometheus metrics.
-
-        This method increments the respective game event counters based on the provided event type
-        ('played' or 'won').
+        Read the label caps from the app configuration.
 
         Args:
-            event (str): The type of game event ('played', 'won').
-
-        Raises:
-            None
+            app (Flask): The Flask application.
         """
-        if event == 'played':
-            self.games_played.inc()
-        elif event == 'won':
-            self.games_won.inc()
-        logger.info("Recorded game event: %s", event)
+        self.max_depth_labels = app.config.get("METRICS_MAX_DEPTH_LABELS", self.max_depth_labels)
+        self.max_type_labels = app.config.get("METRICS_MAX_TYPE_LABELS", self.max_type_labels)
 
-    def record_monster_creation(self, monster_id: str) -> None:
+    def describe(self):
         """
-        Record the creation of a new monster.
-
-        This method increments the monster creation counter and logs the timestamp of the last 
-        monster created.
+        Describe the metric families, so registering the collector does not read the stores.
 
-        Args:
-            monster_id (str): Unique identifier for the monster.
+        Returns:
+            list: Empty, which skips the registry's duplicate name check for this collector.
+        """
+        return []
 
-        Raises:
-            None
+    def collect(self):
         """
-        self.monster_count.inc()
-        self.last_monster_created.set_to_current_time()
-        logger.info("Recorded monster creation: %s", monster_id)
+        Build the metric families from the current stored state.
 
-    def record_monster_death(self, monster_id: str, creation_time: float) -> None:
+        Yields:
+            Metric: The metric families.
+        """
+        for gauges, store in ((PLAYER_GAUGES, self.player),
+                              (GAME_STATE_GAUGES, self.game_state),
+                              (GAME_STATS_GAUGES, self.game_stats)):
+            data = store.snapshot()
+            for name, documentation, key in gauges:
+                yield from self._gauge(name, documentation, data.get(key))
+
+        items = self.equipped_items.snapshot()
+        for name, documentation, path in ITEM_GAUGES:
+            yield from self._gauge(name, documentation, _lookup(items, path))
+
+        yield from self._monster_metrics()
+
+        if self.ingest is not None:
+            deduplicated = CounterMetricFamily(
+                "brogue_ingest_deduplicated",
+                "Number of ingest payloads skipped because they were unchanged", labels=["stream"],
+            )
+            for stream, count in self.ingest.counts().items():
+                deduplicated.add_metric([stream], count)
+            yield deduplicated
+
+    def _monster_metrics(self):
+        """
+        Build the monster metric families from the monster registry.
         """
-        Record the death of a monster and update metrics.
+        created = CounterMetricFamily("brogue_monster_count", "Total number of monsters created")
+        created.add_metric([], self.monsters.created_count())
+        yield created
+
+        died = CounterMetricFamily("brogue_monster_death_count",
+                                   "Total number of monsters that have died")
+        died.add_metric([], self.monsters.count(index.DEAD))
+        yield died
+
+        buckets, count, total = self.monsters.lifespans()
+        lifespan = HistogramMetricFamily(
+            "brogue_monster_lifespan_seconds", "Time (in seconds) monsters stay alive",
+            buckets=[(str(bound), buckets[position])
+                     for position, bound in enumerate(LIFESPAN_BUCKETS)] + [("+Inf", count)],
+            sum_value=total,
+        )
+        yield lifespan
 
-        This method calculates the lifespan of the monster based on the creation time, increments
-        the monster death counter, records the monster's lifespan, and logs the timestamp of the
-        last monster death.
+        last_created, last_death = self.monsters.latest_times()
+        yield from self._gauge("brogue_last_monster_created_timestamp",
+                               "Timestamp of the last monster creation", last_created)
+        yield from self._gauge("brogue_last_monster_death_timestamp",
+                               "Timestamp of the last monster death", last_death)
 
-        Args:
-            monster_id (str): Unique identifier for the monster.
-            creation_time (float): Timestamp when the monster was created.
+        yield from self._group_metrics()
 
-        Raises:
-            None
+    def _group_metrics(self):
         """
-        lifespan = time.time() - creation_time
-        self.monster_death_count.inc()
-        self.monster_lifespan_histogram.observe(lifespan)
-        self.last_monster_death.set_to_current_time()
-        logger.info("Recorded monster death: %s (lifespan: %.2f seconds)", monster_id, lifespan)
-
-    def reset_metrics(self) -> None:
+        Build the monster metric families labeled by depth and type, with bounded label values.
         """
-        Reset all metrics, typically for a new game.
-
-        This method sets all tracked metrics (e.g., player gold, health, and depth level) to zero,
-        effectively resetting the metrics for a new game session.
-
-        Args:
-            None
+        groups = self.monsters.groups()
+        depth_totals = {}
+        type_totals = {}
+        for (depth, monster_type), (alive, dead, _) in groups.items():
+            depth_totals[depth] = depth_totals.get(depth, 0) + alive + dead
+            type_totals[monster_type] = type_totals.get(monster_type, 0) + alive + dead
+        depths = _top_values(depth_totals, self.max_depth_labels)
+        types = _top_values(type_totals, self.max_type_labels)
+
+        series = {}
+        for (depth, monster_type), totals in groups.items():
+            labels = (str(depth) if depth in depths else OTHER,
+                      str(monster_type) if monster_type in types else OTHER)
+            merged = series.setdefault(labels, [0, 0, 0])
+            for position, value in enumerate(totals):
+                merged[position] += value
+
+        alive = GaugeMetricFamily("brogue_monsters_alive", "Number of live monsters",
+                                  labels=["depth", "type"])
+        deaths = CounterMetricFamily("brogue_monster_deaths", "Number of monsters that have died",
+                                     labels=["depth", "type"])
+        hp = GaugeMetricFamily("brogue_monster_hp", "Total hit points of the live monsters",
+                               labels=["depth", "type"])
+        for labels, (alive_count, dead_count, hp_total) in sorted(series.items()):
+            alive.add_metric(labels, alive_count)
+            deaths.add_metric(labels, dead_count)
+            hp.add_metric(labels, hp_total)
+        yield alive
+        yield deaths
+        yield hp
+
+        dropped = GaugeMetricFamily(
+            "brogue_monster_metric_series_dropped",
+            "Number of (depth, type) series merged into the other label value",
+            value=len(groups) - len(series),
+        )
+        yield dropped
 
-        Raises:
-            None
+    @staticmethod
+    def _gauge(name: str, documentation: str, value):
+        """
+        Build a gauge family with one sample, or nothing if the value is missing.
         """
-        self.player_gold.set(0)
-        self.player_depth.set(0)
-        self.player_current_hp.set(0)
-        logger.info("Metrics reset for a new game.")
+        value = _number(value)
+        if value is not None:
+            yield GaugeMetricFamily(name, documentation, value=value)
@@ -0,0 +1,250 @@
+"""
+This module defines the `MonsterColumns` class, a NumPy column store of the numeric monster
+attributes, and the `stats` function that answers analytics questions from it (e.g. the HP of the
+live monsters per depth, or the mean lifespan per type) with vectorized operations.
+
+The `MonsterRegistry` keeps the column store up to date with every monster it stores or drops,
+so a stats query copies the columns once and never touches the monster records. Rows are kept
+dense: dropping a monster moves the last row into its place.
+
+NumPy is optional. Without it, `COLUMNS_AVAILABLE` is False, the registry keeps no column store
+and the stats endpoint answers 503.
+
+Returns:
+    None: This module does not return any values.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+COLUMNS_AVAILABLE = np is not None
+
+# Integer attributes stored as columns, queryable by `stats`
+FIELDS = (
+    "hp", "max_hp", "depth", "attack_speed", "movement_speed", "accuracy", "defense",
+    "damage_min", "damage_max",
+)
+# Attributes the stats can be grouped by
+GROUP_BY = ("depth", "type", "status")
+# Largest number of histogram bins, so a request cannot make the worker allocate huge arrays
+MAX_BINS = 1000
+ALIVE = "alive"
+DEAD = "dead"
+
+
+class MonsterColumns:
+    """
+    Column store of the numeric attributes of the stored monsters, one row per monster.
+
+    Methods:
+        update: Store a monster's attributes, adding its row if needed.
+        remove: Drop a monster's row.
+        clear: Drop every row.
+        snapshot: Copy the columns of every row.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty column store.
+
+        Args:
+            capacity (int): The initial number of rows allocated.
+        """
+        self._capacity = capacity
+        self._rows = {}
+        self._ids = []
+        self._types = {}
+        self._type_names = []
+        self._columns = self._allocate(capacity)
+
+    @staticmethod
+    def _allocate(capacity: int) -> dict:
+        """
+        Allocate empty columns.
+        """
+        columns = {field: np.zeros(capacity, dtype=np.int64) for field in FIELDS}
+        columns["type"] = np.zeros(capacity, dtype=np.int32)
+        columns["dead"] = np.zeros(capacity, dtype=bool)
+        columns["spawned"] = np.full(capacity, np.nan)
+        columns["died"] = np.full(capacity, np.nan)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(self, monster):
+        """
+        Store a monster's attributes, adding its row if the monster is new.
+
+        Args:
+            monster (MonsterRecord): The stored monster.
+        """
+        row = self._rows.get(monster.id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._capacity:
+                self._grow()
+            self._rows[monster.id] = row
+            self._ids.append(monster.id)
+
+        columns = self._columns
+        for field in FIELDS:
+            columns[field][row] = getattr(monster, field)
+        type_code = self._types.get(monster.type)
+        if type_code is None:
+            type_code = self._types[monster.type] = len(self._type_names)
+            self._type_names.append(monster.type)
+        columns["type"][row] = type_code
+        columns["dead"][row] = monster.is_dead
+        columns["spawned"][row] = _epoch(monster.spawn_timestamp)
+        columns["died"][row] = _epoch(monster.death_timestamp)
+
+    def remove(self, monster_id: int):
+        """
+        Drop a monster's row, moving the last row into its place.
+
+        Args:
+            monster_id (int): The monster ID.
+        """
+        row = self._rows.pop(monster_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            last_id = self._ids[last]
+            for column in self._columns.values():
+                column[row] = column[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._ids.pop()
+
+    def clear(self):
+        """
+        Drop every row.
+        """
+        self._rows.clear()
+        self._ids.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Copy the columns of every row, so they can be queried without holding the registry lock.
+
+        Returns:
+            dict: The column name mapped to its array, plus "type_names" (the type of each type
+                code).
+        """
+        size = len(self._ids)
+        snapshot = {name: column[:size].copy() for name, column in self._columns.items()}
+        snapshot["type_names"] = list(self._type_names)
+        return snapshot
+
+    def _grow(self):
+        """
+        Double the number of allocated rows.
+        """
+        capacity = self._capacity * 2
+        columns = self._allocate(capacity)
+        for name, column in self._columns.items():
+            columns[name][:self._capacity] = column
+        self._columns = columns
+        self._capacity = capacity
+
+
+def _epoch(timestamp) -> float:
+    """
+    Convert an optional datetime to epoch seconds, NaN if it is missing.
+    """
+    return timestamp.timestamp() if timestamp is not None else float("nan")
+
+
+def stats(columns: dict, group_by: str = "depth", status: str = None, field: str = "hp",
+          bins: int = 10) -> dict:
+    """
+    Compute per-group aggregates and a histogram from a column snapshot.
+
+    Args:
+        columns (dict): A `MonsterColumns.snapshot()`.
+        group_by (str): The attribute to group by: "depth", "type" or "status".
+        status (str): Only include "alive" or "dead" monsters, or None for both.
+        field (str): The attribute of the histogram (one of `FIELDS`, or "lifespan").
+        bins (int): The number of histogram bins, from 1 to `MAX_BINS`.
+
+    Returns:
+        dict: The number of monsters ("count"), the per-group aggregates ("groups": the group key,
+            the count, the min, mean and max of every other field, and the mean lifespan of the
+            dead monsters) and the histogram ("histogram": the field, the bin edges and the
+            counts).
+
+    Raises:
+        ValueError: If an argument is not supported.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+    if status not in (None, ALIVE, DEAD):
+        raise ValueError("status must be 'alive' or 'dead'")
+    if field not in FIELDS and field != "lifespan":
+        raise ValueError(f"field must be one of {', '.join(FIELDS)} or lifespan")
+    if not 1 <= bins <= MAX_BINS:
+        raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+
+    dead = columns["dead"]
+    mask = np.ones(len(dead), dtype=bool) if status is None else dead == (status == DEAD)
+    selected = {name: column[mask] for name, column in columns.items() if name != "type_names"}
+    lifespan = selected["died"] - selected["spawned"]
+    count = int(mask.sum())
+
+    if group_by == "status":
+        keys = selected["dead"].astype(np.int64)
+    else:
+        keys = selected[group_by]
+
+    groups = []
+    if count:
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, count])
+        aggregates = {}
+        for name in FIELDS:
+            if name == group_by:
+                continue
+            values = selected[name][order]
+            aggregates[name] = (np.minimum.reduceat(values, starts),
+                                np.add.reduceat(values, starts) / sizes,
+                                np.maximum.reduceat(values, starts))
+        lifespans = lifespan[order]
+        known = ~np.isnan(lifespans)
+        lifespan_counts = np.add.reduceat(known.astype(np.int64), starts)
+        lifespan_sums = np.add.reduceat(np.where(known, lifespans, 0.0), starts)
+
+        for position, start in enumerate(starts):
+            key = sorted_keys[start]
+            group = {group_by: _group_key(group_by, key, columns["type_names"]),
+                     "count": int(sizes[position])}
+            for name, (minimums, means, maximums) in aggregates.items():
+                group[name] = {"min": int(minimums[position]), "mean": float(means[position]),
+                               "max": int(maximums[position])}
+            group["mean_lifespan"] = float(lifespan_sums[position] / lifespan_counts[position]) \
+                if lifespan_counts[position] else None
+            groups.append(group)
+
+    values = lifespan[~np.isnan(lifespan)] if field == "lifespan" else selected[field]
+    counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(bins), [])
+    return {
+        "count": count,
+        "groups": groups,
+        "histogram": {"field": field, "edges": [float(edge) for edge in edges],
+                      "counts": [int(value) for value in counts]},
+    }
+
+
+def _group_key(group_by: str, key, type_names: list):
+    """
+    Convert a group key from its column value to its JSON form.
+    """
+    if group_by == "type":
+        return type_names[key]
+    if group_by == "status":
+        return DEAD if key else ALIVE
+    return int(key)
@@ -0,0 +1,325 @@
+"""
+This module defines the `MonsterIndex` class, which keeps secondary indexes over the stored monsters
+so list endpoints can filter and paginate without scanning or serializing every monster.
+
+Each index maps a key (e.g. a depth, a type or a status) to the sorted list of monster IDs with
+that key. Spawn and death times are kept in sorted (epoch, id) lists so time windows are found by
+bisection. The index only stores IDs; callers look the monsters up in their own storage.
+
+The index also keeps running totals per (depth, type) group: live monsters, dead monsters and
+the HP of the live monsters, so metrics broken down by depth and type cost time proportional to the
+number of groups rather than to the number of stored monsters.
+
+Queries are paginated by monster ID: a page starts after the `cursor` ID, and the query walks the
+smallest matching index from there, so a page costs time proportional to its size rather than to
+the number of stored monsters.
+
+Returns:
+    None: This module does not return any values.
+"""
+import bisect
+import itertools
+import threading
+
+# Fields kept in per-key ID lists
+DEPTH = "depth"
+TYPE = "type"
+STATUS = "status"
+ADMIN_KILL = "admin_kill"
+
+ALIVE = "alive"
+DEAD = "dead"
+
+
+def _epoch(timestamp):
+    """
+    Convert an optional datetime to epoch seconds.
+    """
+    return timestamp.timestamp() if timestamp is not None else None
+
+
+def _remove(sorted_list: list, value):
+    """
+    Remove a value from a sorted list if it is present.
+    """
+    position = bisect.bisect_left(sorted_list, value)
+    if position < len(sorted_list) and sorted_list[position] == value:
+        del sorted_list[position]
+
+
+class MonsterIndex:
+    """
+    Secondary indexes over stored monsters, keyed by ID.
+
+    Methods:
+        update: Index a monster, or reindex it after it changed.
+        remove: Stop indexing a monster.
+        clear: Drop every indexed monster.
+        count: Count the monsters with an index key.
+        ids: List the IDs of the monsters with an index key.
+        latest_times: Get the latest spawn and death times.
+        oldest_death: Get the earliest death time and the ID of that monster.
+        groups: Get the running totals per (depth, type) group.
+        query: Find one page of monster IDs matching a set of filters.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty indexes.
+        """
+        self._lock = threading.Lock()
+        self._ids = []
+        self._keys = {}
+        self._lists = {}
+        self._spawned = []
+        self._died = []
+        # (depth, type) -> [live monsters, dead monsters, HP of the live monsters]
+        self._groups = {}
+        # Monster ID -> the (group, status, hp) it is counted under
+        self._grouped = {}
+
+    def update(self, monster):
+        """
+        Index a monster, or reindex it after it changed. Only changed keys are touched.
+
+        Args:
+            monster (Monster): The stored monster.
+        """
+        keys = {
+            DEPTH: monster.depth,
+            TYPE: monster.type,
+            STATUS: DEAD if monster.is_dead else ALIVE,
+            ADMIN_KILL: bool(monster.is_admin_kill),
+        }
+        spawned = _epoch(monster.spawn_timestamp)
+        died = _epoch(monster.death_timestamp)
+        monster_id = monster.id
+
+        with self._lock:
+            self._regroup(monster_id, (monster.depth, monster.type), keys[STATUS], monster.hp)
+            previous = self._keys.get(monster_id)
+            if previous is None:
+                bisect.insort(self._ids, monster_id)
+                previous = ({}, None, None)
+            old_keys, old_spawned, old_died = previous
+            if old_keys == keys and old_spawned == spawned and old_died == died:
+                return
+
+            for field, value in keys.items():
+                if field in old_keys and old_keys[field] == value:
+                    continue
+                if field in old_keys:
+                    _remove(self._lists[(field, old_keys[field])], monster_id)
+                bisect.insort(self._lists.setdefault((field, value), []), monster_id)
+
+            for times, old, new in ((self._spawned, old_spawned, spawned),
+                                    (self._died, old_died, died)):
+                if old == new:
+                    continue
+                if old is not None:
+                    _remove(times, (old, monster_id))
+                if new is not None:
+                    bisect.insort(times, (new, monster_id))
+
+            self._keys[monster_id] = (keys, spawned, died)
+
+    def remove(self, monster_id: int):
+        """
+        Stop indexing a monster, e.g. when it is evicted from the registry.
+
+        Args:
+            monster_id (int): The monster ID.
+        """
+        with self._lock:
+            previous = self._keys.pop(monster_id, None)
+            if previous is None:
+                return
+            keys, spawned, died = previous
+            _remove(self._ids, monster_id)
+            for field, value in keys.items():
+                _remove(self._lists[(field, value)], monster_id)
+            if spawned is not None:
+                _remove(self._spawned, (spawned, monster_id))
+            if died is not None:
+                _remove(self._died, (died, monster_id))
+            grouped = self._grouped.pop(monster_id, None)
+            if grouped is not None:
+                self._add_to_group(*grouped, sign=-1)
+
+    def clear(self):
+        """
+        Drop every indexed monster.
+        """
+        with self._lock:
+            self._ids.clear()
+            self._keys.clear()
+            self._lists.clear()
+            self._spawned.clear()
+            self._died.clear()
+            self._groups.clear()
+            self._grouped.clear()
+
+    def count(self, field: str, value) -> int:
+        """
+        Count the monsters with an index key.
+
+        Args:
+            field (str): The indexed field (e.g. `STATUS`).
+            value: The key value (e.g. `DEAD`).
+
+        Returns:
+            int: The number of monsters with the key.
+        """
+        with self._lock:
+            return len(self._lists.get((field, value), ()))
+
+    def ids(self, field: str, value) -> list:
+        """
+        List the IDs of the monsters with an index key, in ID order.
+
+        Args:
+            field (str): The indexed field (e.g. `DEPTH`).
+            value: The key value (e.g. 3).
+
+        Returns:
+            list: A copy of the matching IDs.
+        """
+        with self._lock:
+            return list(self._lists.get((field, value), ()))
+
+    def latest_times(self) -> tuple:
+        """
+        Get the latest spawn and death times of the indexed monsters.
+
+        Returns:
+            tuple: The latest spawn and death times in epoch seconds, each None if no monster
+                spawned or died.
+        """
+        with self._lock:
+            return (self._spawned[-1][0] if self._spawned else None,
+                    self._died[-1][0] if self._died else None)
+
+    def oldest_death(self):
+        """
+        Get the earliest death time of the indexed monsters and the ID of that monster.
+
+        Returns:
+            tuple or None: The (epoch seconds, monster ID) of the earliest death, or None if no
+                monster died.
+        """
+        with self._lock:
+            return self._died[0] if self._died else None
+
+    def groups(self) -> dict:
+        """
+        Get the running totals per (depth, type) group.
+
+        Returns:
+            dict: (depth, type) mapped to a (live monsters, dead monsters, HP of the live monsters)
+                tuple.
+        """
+        with self._lock:
+            return {group: tuple(totals) for group, totals in self._groups.items()}
+
+    def query(self, filters: dict = None, spawned: tuple = (None, None), died: tuple = (None, None),
+              cursor: int = None, limit: int = None) -> tuple:
+        """
+        Find one page of monster IDs matching a set of filters, in ID order.
+
+        Args:
+            filters (dict): Indexed fields mapped to the required value (e.g. {DEPTH: 3}).
+            spawned (tuple): The (after, before) epoch-seconds window for the spawn time.
+            died (tuple): The (after, before) epoch-seconds window for the death time.
+            cursor (int): Only return IDs greater than this one.
+            limit (int): The maximum number of IDs to return, or None for all of them.
+
+        Returns:
+            tuple: The list of matching IDs and the cursor for the next page (None on the
+            last page).
+        """
+        filters = filters or {}
+        # Position of each time in the stored (keys, spawned, died) entries
+        windows = {
+            index: window for index, window in ((1, spawned), (2, died)) if window != (None, None)
+        }
+        with self._lock:
+            # Walk the smallest candidate list; time windows are sized by bisection and only
+            # sorted into ID order if one of them is the smallest
+            candidates = [(len(self._ids), self._ids)]
+            for field, value in filters.items():
+                ids = self._lists.get((field, value), [])
+                candidates.append((len(ids), ids))
+            for index, window in windows.items():
+                times = self._spawned if index == 1 else self._died
+                low, high = self._window(times, *window)
+                candidates.append((high - low, (times, low, high)))
+            _, driver = min(candidates, key=lambda candidate: candidate[0])
+            if isinstance(driver, tuple):
+                times, low, high = driver
+                driver = sorted(monster_id for _, monster_id in times[low:high])
+
+            start = bisect.bisect_right(driver, cursor) if cursor is not None else 0
+            ids = []
+            for monster_id in itertools.islice(driver, start, None):
+                if self._matches(monster_id, filters, windows):
+                    if limit is not None and len(ids) == limit:
+                        return ids, ids[-1]
+                    ids.append(monster_id)
+            return ids, None
+
+    def _regroup(self, monster_id: int, group: tuple, status: str, hp: int):
+        """
+        Move a monster's contribution to the group totals. Must hold the lock.
+        """
+        hp = hp or 0
+        current = (group, status, hp)
+        previous = self._grouped.get(monster_id)
+        if previous == current:
+            return
+        if previous is not None:
+            self._add_to_group(*previous, sign=-1)
+        self._add_to_group(*current, sign=1)
+        self._grouped[monster_id] = current
+
+    def _add_to_group(self, group: tuple, status: str, hp: int, sign: int):
+        """
+        Add (or with a sign of -1, remove) one monster to the totals of a group. Must hold the lock.
+        """
+        totals = self._groups.setdefault(group, [0, 0, 0])
+        if status == ALIVE:
+            totals[0] += sign
+            totals[2] += sign * hp
+        else:
+            totals[1] += sign
+        if totals[0] == 0 and totals[1] == 0:
+            del self._groups[group]
+
+    @staticmethod
+    def _window(times: list, after, before) -> tuple:
+        """
+        Returns the (low, high) slice bounds of a sorted time list inside a window. Must hold
+        the lock.
+        """
+        low = bisect.bisect_left(times, (after,)) if after is not None else 0
+        high = bisect.bisect_right(times, (before, float("inf"))) if before is not None \
+            else len(times)
+        return low, high
+
+    def _matches(self, monster_id: int, filters: dict, windows: dict) -> bool:
+        """
+        Check an ID's indexed keys against the filters and time windows. Must hold the lock.
+        """
+        entry = self._keys[monster_id]
+        keys = entry[0]
+        for field, value in filters.items():
+            if keys[field] != value:
+                return False
+        for index, (after, before) in windows.items():
+            timestamp = entry[index]
+            if timestamp is None:
+                return False
+            if after is not None and timestamp < after:
+                return False
+            if before is not None and timestamp > before:
+                return False
+        return True
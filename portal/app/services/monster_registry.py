@@ -0,0 +1,759 @@
+"""
+This module defines the `MonsterRegistry` class, which owns the in-memory monster storage and
+every transition a monster goes through (spawned, updated, killed, admin-killed, reset).
+
+The monster routes used to mutate four loose dicts (all, active, dead and admin-killed monsters)
+from several places, which let them drift apart (e.g. a monster reported dead by the game stayed
+in the active dict). The registry keeps them consistent and maintains secondary indexes:
+- pod name -> ID and name -> ID, for O(1) lookups such as the admin kill by pod name that the
+  pod reconciler calls on every pod deletion.
+- depth, type, status and admin-kill flag -> IDs, and spawn/death time windows, through a
+  `MonsterIndex` used for counts, filters and pagination.
+
+Dead monsters are kept for a limited time: with a retention policy (`max_dead` and
+`max_dead_age`), the oldest dead monsters are evicted and compacted into running totals (deaths,
+admin kills, lifespans and deaths per depth and type) kept in the backend's "monster_history" map.
+Counts, group totals, lifespans and metrics include the evicted monsters, so they stay correct
+while the memory used by dead monsters stays bounded. Only the IDs of the last `max_evicted_ids`
+evicted monsters are kept, so a late update of an evicted monster is ignored instead of spawning it
+again. Monster IDs are not evicted in ID order, so an ID high-water mark would also reject live
+monsters; a bounded set of the latest evictions covers the updates still in flight when a monster
+is evicted, and an update of a monster evicted longer ago is stored as a new monster.
+
+When NumPy is installed, the registry also keeps a `MonsterColumns` column store of the numeric
+attributes of the stored monsters, which `stats` queries with vectorized operations.
+
+Monsters are stored as compact `MonsterRecord`s rather than pydantic models: readers get records,
+which serialize to the same dictionaries as `Monster` (`record.dict()`).
+
+The registry is safe to use from several threads. Transitions hold a lock so the storage and the
+indexes change together, and stored monsters are never modified in place: a transition stores an
+updated copy, so a reader serializing a monster never sees a half-applied change.
+
+With a shared state backend (see `app.services.state_backend`), every stored monster is also
+written to the backend's "monsters" records, and each process replays the records written by the
+others into its own storage and indexes before reading. Transitions run in a backend transaction,
+so two workers updating the same monster are serialized. The transaction is opened before the
+registry lock is taken, so a route can apply the registry and other stores in one transaction.
+
+Returns:
+    None: This module does not return any values.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from app.models.monsters import Monster, MonsterRecord
+from app.services import monster_columns
+from app.services import monster_index as index
+from app.services.state_backend import get_backend
+
+RECORDS = "monsters"
+ADMIN_KILLS_COUNTER = "admin_kills"
+HISTORY = "monster_history"
+
+# Record fields that no index or column reads, so a patch changing only these skips the reindex
+UNINDEXED_FIELDS = frozenset({"x", "y", "namespace", "turns_between_regen"})
+
+# Upper bounds (in seconds) of the lifespan histogram buckets
+LIFESPAN_BUCKETS = (10, 30, 60, 300, 600, 1800, 3600, 7200)
+
+
+def _lifespan(monster):
+    """
+    Get the seconds a dead monster stayed alive, or None if a timestamp is missing.
+    """
+    if monster.spawn_timestamp is None or monster.death_timestamp is None:
+        return None
+    return max((monster.death_timestamp - monster.spawn_timestamp).total_seconds(), 0)
+
+
+class MonsterRegistry:
+    """
+    In-memory storage of the game's monsters, with secondary indexes.
+
+    Attributes:
+        admin_kills_version (int): Incremented every time the set of admin-killed monsters
+            changes, so clients can skip unchanged sets.
+        admin_kills_tag (str): An opaque version of the set of admin-killed monsters for clients:
+            the version prefixed with the backend's token, so a version of another state (e.g.
+            from before a restart of the memory backend) never matches.
+        max_dead (int): The maximum number of dead monsters kept, or 0 for no limit.
+        max_dead_age (float): The seconds dead monsters are kept after their death, or 0 for no
+            limit.
+        max_evicted_ids (int): The number of evicted monster IDs kept to ignore late updates.
+
+    Methods:
+        init_app: Read the retention policy from the app configuration.
+        get: Get a monster by ID.
+        get_many: Get several monsters by ID.
+        get_by_pod_name: Get a monster by pod name.
+        get_by_name: Get a monster by name.
+        ids_at_depth: List the IDs of the monsters spawned at a depth.
+        all: List every monster.
+        active: List the live monsters.
+        dead: List the dead monsters.
+        admin_kill_ids: List the IDs of the admin-killed monsters.
+        is_admin_kill: Whether a monster was admin-killed.
+        count: Count the monsters with a status.
+        created_count: Count every monster of the current game.
+        history: Get the running totals of the evicted dead monsters.
+        lifespans: Get the lifespan histogram of the dead monsters.
+        stats: Compute per-group aggregates and a histogram of the stored monsters.
+        latest_times: Get the latest spawn and death times.
+        groups: Get the running totals per (depth, type) group.
+        upsert: Store a monster reported by the game.
+        patch: Change some fields of stored monsters.
+        mark_dead: Mark a live monster as dead.
+        clear: Drop every monster.
+        query: Find one page of monsters matching a set of filters.
+    """
+
+    def __init__(self, backend=None, max_dead: int = 0, max_dead_age: float = 0,
+                 max_evicted_ids: int = 10000):
+        """
+        Initialize an empty registry.
+
+        Args:
+            backend (StateBackend): The state backend. Defaults to the app's backend.
+            max_dead (int): The maximum number of dead monsters kept, or 0 for no limit.
+            max_dead_age (float): The seconds dead monsters are kept after their death, or 0 for
+                no limit.
+            max_evicted_ids (int): The number of evicted monster IDs kept to ignore late updates.
+        """
+        self._backend = backend
+        self.max_dead = max_dead
+        self.max_dead_age = max_dead_age
+        self.max_evicted_ids = max_evicted_ids
+        self._all = {}
+        self._active = {}
+        self._dead = {}
+        self._admin_kills = {}
+        self._by_pod_name = {}
+        self._by_name = {}
+        # Evicted monster IDs, oldest eviction first (a dict used as an ordered set)
+        self._evicted_ids = {}
+        self.index = index.MonsterIndex()
+        self.columns = monster_columns.MonsterColumns() if monster_columns.COLUMNS_AVAILABLE \
+            else None
+        self._lock = threading.RLock()
+        # Last replayed record sequence number and table generation of a shared backend
+        self._seq = 0
+        self._generation = 0
+
+    def init_app(self, app):
+        """
+        Read the retention policy of dead monsters from the app configuration.
+
+        Args:
+            app (Flask): The app, configured with `DEAD_MONSTER_MAX_COUNT`,
+                `DEAD_MONSTER_MAX_AGE_SECONDS` and `DEAD_MONSTER_MAX_EVICTED_IDS`.
+        """
+        self.max_dead = app.config.get("DEAD_MONSTER_MAX_COUNT", self.max_dead)
+        self.max_dead_age = app.config.get("DEAD_MONSTER_MAX_AGE_SECONDS", self.max_dead_age)
+        self.max_evicted_ids = app.config.get("DEAD_MONSTER_MAX_EVICTED_IDS",
+                                              self.max_evicted_ids)
+
+    @property
+    def backend(self):
+        """
+        The state backend the registry shares its monsters through.
+        """
+        return self._backend or get_backend()
+
+    @property
+    def admin_kills_version(self) -> int:
+        return self.backend.counters([ADMIN_KILLS_COUNTER])[ADMIN_KILLS_COUNTER]
+
+    @property
+    def admin_kills_tag(self) -> str:
+        backend = self.backend
+        return f"{backend.token}-{backend.counters([ADMIN_KILLS_COUNTER])[ADMIN_KILLS_COUNTER]}"
+
+    def __contains__(self, monster_id: int) -> bool:
+        with self._lock:
+            self._sync()
+            return monster_id in self._all
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._all)
+
+    def get(self, monster_id: int):
+        """
+        Get a monster by ID.
+
+        Args:
+            monster_id (int): The monster ID.
+
+        Returns:
+            MonsterRecord or None: The monster, or None if it is not stored.
+        """
+        with self._lock:
+            self._sync()
+            return self._all.get(monster_id)
+
+    def get_many(self, monster_ids) -> dict:
+        """
+        Get several monsters by ID, reading the shared backend once.
+
+        Args:
+            monster_ids (iterable): The monster IDs.
+
+        Returns:
+            dict: The IDs of the stored monsters mapped to their MonsterRecord.
+        """
+        with self._lock:
+            self._sync()
+            return {monster_id: self._all[monster_id]
+                    for monster_id in monster_ids if monster_id in self._all}
+
+    def get_by_pod_name(self, pod_name: str):
+        """
+        Get a monster by the name of its pod.
+
+        Args:
+            pod_name (str): The pod name.
+
+        Returns:
+            MonsterRecord or None: The monster, or None if no monster has the pod name.
+        """
+        with self._lock:
+            self._sync()
+            monster_id = self._by_pod_name.get(pod_name)
+            return self._all.get(monster_id) if monster_id is not None else None
+
+    def get_by_name(self, name: str):
+        """
+        Get a monster by name.
+
+        Args:
+            name (str): The monster (and Monster resource) name.
+
+        Returns:
+            MonsterRecord or None: The monster, or None if no monster has the name.
+        """
+        with self._lock:
+            self._sync()
+            monster_id = self._by_name.get(name)
+            return self._all.get(monster_id) if monster_id is not None else None
+
+    def ids_at_depth(self, depth: int) -> list:
+        """
+        List the IDs of the monsters spawned at a depth, in ID order.
+
+        Args:
+            depth (int): The dungeon depth.
+
+        Returns:
+            list: The monster IDs.
+        """
+        with self._lock:
+            self._sync()
+            return self.index.ids(index.DEPTH, depth)
+
+    def all(self) -> list:
+        """
+        List every monster, alive and dead.
+
+        Returns:
+            list: The monster records.
+        """
+        with self._lock:
+            self._sync()
+            return list(self._all.values())
+
+    def active(self) -> list:
+        """
+        List the live monsters.
+
+        Returns:
+            list: The monster records.
+        """
+        with self._lock:
+            self._sync()
+            return list(self._active.values())
+
+    def dead(self) -> list:
+        """
+        List the dead monsters.
+
+        Returns:
+            list: The monster records.
+        """
+        with self._lock:
+            self._sync()
+            return list(self._dead.values())
+
+    def admin_kill_ids(self) -> list:
+        """
+        List the IDs of the admin-killed monsters.
+
+        Returns:
+            list: The monster IDs.
+        """
+        with self._lock:
+            self._sync()
+            return list(self._admin_kills)
+
+    def is_admin_kill(self, monster_id: int) -> bool:
+        """
+        Check whether a monster was admin-killed.
+
+        Args:
+            monster_id (int): The monster ID.
+
+        Returns:
+            bool: True if the monster was admin-killed.
+        """
+        with self._lock:
+            self._sync()
+            return monster_id in self._admin_kills
+
+    def count(self, status: str) -> int:
+        """
+        Count the monsters with a status. Dead monsters include the evicted ones.
+
+        Args:
+            status (str): `monster_index.ALIVE` or `monster_index.DEAD`.
+
+        Returns:
+            int: The number of monsters.
+        """
+        with self._lock:
+            self._sync()
+            if status == index.ALIVE:
+                return len(self._active)
+            return len(self._dead) + self.history().get("dead", 0)
+
+    def created_count(self) -> int:
+        """
+        Count every monster of the current game, alive, dead and evicted.
+
+        Returns:
+            int: The number of monsters.
+        """
+        with self._lock:
+            self._sync()
+            return len(self._all) + self.history().get("dead", 0)
+
+    def history(self) -> dict:
+        """
+        Get the running totals of the evicted dead monsters.
+
+        Returns:
+            dict: The totals: "dead" and "admin_kills" counts, "lifespan_count", "lifespan_sum"
+                and "lifespan_buckets" (cumulative counts per `LIFESPAN_BUCKETS` bound),
+                "groups" ([depth, type, deaths] lists) and "last_death" (epoch seconds). Empty if
+                no monster was evicted.
+        """
+        return self.backend.map_snapshot(HISTORY) or {}
+
+    def lifespans(self) -> tuple:
+        """
+        Get the lifespan histogram of the dead monsters, including the evicted ones.
+
+        Returns:
+            tuple: The cumulative counts per `LIFESPAN_BUCKETS` bound, the number of lifespans
+                and their sum in seconds.
+        """
+        with self._lock:
+            self._sync()
+            history = self.history()
+            buckets = list(history.get("lifespan_buckets") or [0] * len(LIFESPAN_BUCKETS))
+            count = history.get("lifespan_count", 0)
+            total = history.get("lifespan_sum", 0.0)
+            for monster in self._dead.values():
+                lifespan = _lifespan(monster)
+                if lifespan is None:
+                    continue
+                count += 1
+                total += lifespan
+                for position, bound in enumerate(LIFESPAN_BUCKETS):
+                    if lifespan <= bound:
+                        buckets[position] += 1
+        return buckets, count, total
+
+    def stats(self, **query) -> dict:
+        """
+        Compute per-group aggregates and a histogram of the stored monsters (evicted monsters are
+        not included).
+
+        Args:
+            **query: The `monster_columns.stats` arguments (group_by, status, field, bins).
+
+        Returns:
+            dict: The stats (see `monster_columns.stats`).
+
+        Raises:
+            RuntimeError: If NumPy is not installed.
+            ValueError: If a query argument is not supported.
+        """
+        if self.columns is None:
+            raise RuntimeError("Monster stats need NumPy")
+        with self._lock:
+            self._sync()
+            columns = self.columns.snapshot()
+        return monster_columns.stats(columns, **query)
+
+    def latest_times(self) -> tuple:
+        """
+        Get the latest spawn and death times of the monsters.
+
+        Returns:
+            tuple: The latest spawn and death times in epoch seconds, each None if no monster
+                spawned or died.
+        """
+        with self._lock:
+            self._sync()
+            last_created, last_death = self.index.latest_times()
+            evicted_death = self.history().get("last_death")
+        if evicted_death is not None and (last_death is None or evicted_death > last_death):
+            last_death = evicted_death
+        return last_created, last_death
+
+    def groups(self) -> dict:
+        """
+        Get the running totals per (depth, type) group. Dead monsters include the evicted ones.
+
+        Returns:
+            dict: (depth, type) mapped to a (live monsters, dead monsters, HP of the live monsters)
+                tuple.
+        """
+        with self._lock:
+            self._sync()
+            groups = self.index.groups()
+            evicted = self.history().get("groups", ())
+        for depth, monster_type, dead in evicted:
+            alive, stored_dead, hp = groups.get((depth, monster_type), (0, 0, 0))
+            groups[(depth, monster_type)] = (alive, stored_dead + dead, hp)
+        return groups
+
+    def upsert(self, monster) -> bool:
+        """
+        Store a monster reported by the game, replacing the stored monster with the same ID.
+
+        The game does not send timestamps or admin kills, so an updated monster keeps the spawn
+        time and admin-kill flag of the stored one, and a dead monster keeps its first death time.
+        Updates of evicted monsters are ignored.
+
+        Args:
+            monster (Monster): The validated monster.
+
+        Returns:
+            bool or None: True if the monster was not stored before, None if it was evicted.
+        """
+        with self.backend.transaction(), self._lock:
+            self._sync()
+            monster_id = monster.id
+            if monster_id in self._evicted_ids:
+                return None
+            previous = self._all.get(monster_id)
+            # Fill in the fields the game does not send before the monster is visible to readers
+            if previous is not None:
+                monster.spawn_timestamp = previous.spawn_timestamp or monster.spawn_timestamp
+            if monster.is_dead:
+                if previous is not None and previous.is_dead and previous.death_timestamp:
+                    monster.death_timestamp = previous.death_timestamp
+                else:
+                    monster.death_timestamp = datetime.now(timezone.utc)
+            if monster_id in self._admin_kills:
+                monster.is_admin_kill = True
+
+            record = MonsterRecord.from_monster(monster)
+            self._store(record, previous)
+            self._write(record)
+            self._enforce_retention()
+            return previous is None
+
+    def patch(self, changes: dict) -> list:
+        """
+        Change some fields of stored monsters, e.g. from a delta, like `upsert` would store the
+        merged monsters: the spawn time, first death time and admin-kill flag are kept. The
+        monsters are changed in one transaction, and a change that no index reads (e.g. a move)
+        only replaces the stored record.
+
+        Args:
+            changes (dict): Monster IDs mapped to the changed record fields (see
+                `MonsterRecord.record_fields`).
+
+        Returns:
+            list: The changed MonsterRecords. Monsters that are not stored (e.g. evicted) are
+                skipped.
+        """
+        changed = []
+        with self.backend.transaction(), self._lock:
+            self._sync()
+            for monster_id, fields in changes.items():
+                previous = self._all.get(monster_id)
+                if previous is None:
+                    continue
+                fields = dict(fields)
+                if previous.spawn_timestamp:
+                    fields.pop("spawn_timestamp", None)
+                dead = fields.get("is_dead", previous.is_dead)
+                if dead and ("is_dead" in fields or "death_timestamp" in fields):
+                    fields["death_timestamp"] = previous.death_timestamp \
+                        if previous.is_dead and previous.death_timestamp \
+                        else datetime.now(timezone.utc)
+                if "is_admin_kill" in fields and monster_id in self._admin_kills:
+                    fields["is_admin_kill"] = True
+
+                monster = previous.replace(**fields)
+                self._store(monster, previous, reindex=not fields.keys() <= UNINDEXED_FIELDS)
+                self._write(monster)
+                changed.append(monster)
+            if changed:
+                self._enforce_retention()
+        return changed
+
+    def mark_dead(self, monster_id: int, admin_kill: bool = False):
+        """
+        Mark a live monster as dead.
+
+        Args:
+            monster_id (int): The monster ID.
+            admin_kill (bool): Whether the monster was killed from the portal.
+
+        Returns:
+            MonsterRecord or None: The dead monster, or None if there is no live monster with the
+                ID.
+        """
+        with self.backend.transaction(), self._lock:
+            self._sync()
+            previous = self._active.get(monster_id)
+            if previous is None:
+                return None
+
+            update = {"is_dead": True, "death_timestamp": datetime.now(timezone.utc)}
+            if admin_kill:
+                update["is_admin_kill"] = True
+            monster = previous.replace(**update)
+            self._store(monster, previous)
+            self._write(monster)
+            if admin_kill:
+                self.backend.incr(ADMIN_KILLS_COUNTER)
+            self._enforce_retention()
+            return monster
+
+    def clear(self):
+        """
+        Drop every monster, e.g. when a new game starts.
+        """
+        backend = self.backend
+        with backend.transaction(), self._lock:
+            self._clear_local()
+            if backend.shared:
+                self._generation = backend.record_clear(RECORDS)
+            backend.map_clear(HISTORY)
+            backend.incr(ADMIN_KILLS_COUNTER)
+
+    def query(self, filters: dict = None, spawned: tuple = (None, None),
+              died: tuple = (None, None), cursor: int = None, limit: int = None) -> tuple:
+        """
+        Find one page of monsters matching a set of filters, in ID order.
+
+        Args:
+            filters (dict): Indexed fields mapped to the required value (see `MonsterIndex`).
+            spawned (tuple): The (after, before) epoch-seconds window for the spawn time.
+            died (tuple): The (after, before) epoch-seconds window for the death time.
+            cursor (int): Only return monsters with an ID greater than this one.
+            limit (int): The maximum number of monsters to return, or None for all of them.
+
+        Returns:
+            tuple: The list of monster records and the cursor for the next page (None on the last
+                page).
+        """
+        with self._lock:
+            self._sync()
+            ids, next_cursor = self.index.query(filters, spawned, died, cursor, limit)
+            monsters = [self._all[monster_id] for monster_id in ids if monster_id in self._all]
+        return monsters, next_cursor
+
+    def _sync(self):
+        """
+        Replay the monsters other processes wrote to a shared backend. Must hold the lock.
+        """
+        backend = self.backend
+        if not backend.shared:
+            return
+
+        generation, records = backend.record_changes(RECORDS, self._seq)
+        if generation != self._generation:
+            # Another process reset the monsters: start over from the remaining records
+            self._clear_local()
+            self._seq = 0
+            generation, records = backend.record_changes(RECORDS, 0)
+            self._generation = generation
+        for seq, monster_id, data in records:
+            if data:
+                monster = MonsterRecord.from_monster(Monster.model_validate_json(data))
+                self._store(monster, self._all.get(monster.id))
+            else:
+                # Evicted by another process, which also compacted it into the history
+                self._remove(monster_id)
+                self._evict_id(monster_id)
+            self._seq = seq
+
+    def _write(self, monster):
+        """
+        Write a stored monster to a shared backend. Must hold the lock and a backend transaction.
+        """
+        backend = self.backend
+        if backend.shared:
+            self._seq = backend.record_put(RECORDS, monster.id, monster.to_json())
+
+    def _store(self, monster, previous, reindex: bool = True):
+        """
+        Store a monster in place of its previous version and update the indexes, unless
+        `reindex` is False because no indexed field changed. Must hold the lock.
+        """
+        monster_id = monster.id
+        if previous is not None and reindex:
+            self._unindex_names(previous)
+        self._all[monster_id] = monster
+        if monster.is_dead:
+            self._active.pop(monster_id, None)
+            self._dead[monster_id] = monster
+        else:
+            self._dead.pop(monster_id, None)
+            self._active[monster_id] = monster
+        if monster.is_admin_kill:
+            self._admin_kills[monster_id] = monster
+        if not reindex:
+            return
+        self._index_names(monster)
+        self.index.update(monster)
+        if self.columns is not None:
+            self.columns.update(monster)
+
+    def _enforce_retention(self):
+        """
+        Evict the oldest dead monsters beyond the retention policy and add them to the history.
+        Must hold the lock and a backend transaction.
+        """
+        if not self.max_dead and not self.max_dead_age:
+            return
+        expired = time.time() - self.max_dead_age if self.max_dead_age else None
+        backend = self.backend
+        evicted = []
+        while True:
+            oldest = self.index.oldest_death()
+            if oldest is None:
+                break
+            died, monster_id = oldest
+            over_count = self.max_dead and len(self._dead) > self.max_dead
+            if not over_count and (expired is None or died >= expired):
+                break
+            evicted.append(self._remove(monster_id))
+            self._evict_id(monster_id)
+            if backend.shared:
+                self._seq = backend.record_delete(RECORDS, monster_id)
+        if not evicted:
+            return
+
+        self._compact(evicted)
+        if any(monster.is_admin_kill for monster in evicted):
+            backend.incr(ADMIN_KILLS_COUNTER)
+
+    def _compact(self, monsters: list):
+        """
+        Add evicted dead monsters to the history totals. Must hold the lock and a backend
+        transaction.
+        """
+        history = self.history()
+        buckets = list(history.get("lifespan_buckets") or [0] * len(LIFESPAN_BUCKETS))
+        groups = {(depth, monster_type): dead
+                  for depth, monster_type, dead in history.get("groups", ())}
+        lifespan_count = history.get("lifespan_count", 0)
+        lifespan_sum = history.get("lifespan_sum", 0.0)
+        last_death = history.get("last_death")
+        for monster in monsters:
+            group = (monster.depth, monster.type)
+            groups[group] = groups.get(group, 0) + 1
+            if monster.death_timestamp is not None:
+                died = monster.death_timestamp.timestamp()
+                last_death = died if last_death is None else max(last_death, died)
+            lifespan = _lifespan(monster)
+            if lifespan is None:
+                continue
+            lifespan_count += 1
+            lifespan_sum += lifespan
+            for position, bound in enumerate(LIFESPAN_BUCKETS):
+                if lifespan <= bound:
+                    buckets[position] += 1
+
+        self.backend.map_update(HISTORY, {
+            "dead": history.get("dead", 0) + len(monsters),
+            "admin_kills": history.get("admin_kills", 0)
+            + sum(1 for monster in monsters if monster.is_admin_kill),
+            "lifespan_count": lifespan_count,
+            "lifespan_sum": lifespan_sum,
+            "lifespan_buckets": buckets,
+            "groups": [[depth, monster_type, dead]
+                       for (depth, monster_type), dead in groups.items()],
+            "last_death": last_death,
+        })
+
+    def _evict_id(self, monster_id: int):
+        """
+        Remember an evicted monster ID, forgetting the oldest evictions beyond `max_evicted_ids`.
+        Must hold the lock.
+        """
+        evicted_ids = self._evicted_ids
+        evicted_ids.pop(monster_id, None)
+        evicted_ids[monster_id] = None
+        while len(evicted_ids) > self.max_evicted_ids:
+            del evicted_ids[next(iter(evicted_ids))]
+
+    def _remove(self, monster_id: int):
+        """
+        Drop a monster from this process's storage and indexes. Must hold the lock.
+
+        Returns:
+            MonsterRecord or None: The removed monster, or None if it was not stored.
+        """
+        monster = self._all.pop(monster_id, None)
+        if monster is None:
+            return None
+        self._active.pop(monster_id, None)
+        self._dead.pop(monster_id, None)
+        self._admin_kills.pop(monster_id, None)
+        self._unindex_names(monster)
+        self.index.remove(monster_id)
+        if self.columns is not None:
+            self.columns.remove(monster_id)
+        return monster
+
+    def _clear_local(self):
+        """
+        Drop every monster from this process's storage and indexes. Must hold the lock.
+        """
+        self._all.clear()
+        self._active.clear()
+        self._dead.clear()
+        self._admin_kills.clear()
+        self._by_pod_name.clear()
+        self._by_name.clear()
+        self._evicted_ids.clear()
+        self.index.clear()
+        if self.columns is not None:
+            self.columns.clear()
+
+    def _index_names(self, monster):
+        """
+        Add a monster's pod name and name to the lookup indexes.
+        """
+        if monster.pod_name:
+            self._by_pod_name[monster.pod_name] = monster.id
+        if monster.name:
+            self._by_name[monster.name] = monster.id
+
+    def _unindex_names(self, monster):
+        """
+        Remove a monster's pod name and name from the lookup indexes.
+        """
+        if self._by_pod_name.get(monster.pod_name) == monster.id:
+            del self._by_pod_name[monster.pod_name]
+        if self._by_name.get(monster.name) == monster.id:
+            del self._by_name[monster.name]
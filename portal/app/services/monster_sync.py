@@ -0,0 +1,365 @@
+"""
+This module defines the `MonsterSyncQueue` class, a write-behind queue that applies Monster
+custom resource operations to Kubernetes on a background worker thread.
+
+The monster routes used to call `KubernetesService` synchronously inside the request, so a slow
+API server (or the conflict retries in `update_monster_resource`) held up every ingest request.
+Routes now enqueue the operation and return immediately; the worker applies it later.
+
+Pending operations are keyed by monster name and coalesced:
+- Many pending updates for the same monster collapse into the latest one.
+- An update for a monster whose create has not been sent yet is folded into the create.
+- A delete cancels any pending create or update for that monster.
+- A create that arrives after a pending delete is sent after the delete.
+
+Calls that fail with a transient error (a connection error, or a 429 or 5xx response from the API
+server) are retried with exponential backoff, up to `MONSTER_SYNC_RETRY_ATTEMPTS` attempts. Other
+failures are logged and the operation is dropped.
+
+An update of a missing resource is skipped rather than creating it, so a deleted (e.g.
+admin-killed) monster is never brought back by a late update. Instead, the queue remembers the
+monsters whose create failed, and sends their next update as a create.
+
+`clear` (on game reset) drops the pending operations and waits for the operation being applied, so
+no write of the previous game lands after its resources are deleted. An operation waiting to
+retry is abandoned.
+
+The queue is drained when the application shuts down.
+
+Returns:
+    None: This module does not return any values.
+"""
+import atexit
+import threading
+from collections import OrderedDict
+from urllib3.exceptions import HTTPError
+from kubernetes.client.rest import ApiException
+
+# API server responses worth retrying: throttling and server-side failures
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Check whether a failed Kubernetes API call may succeed if retried.
+
+    `KubernetesService` wraps some API errors in other exceptions, so the causes are checked too.
+
+    Args:
+        error (BaseException): The exception raised by the call.
+
+    Returns:
+        bool: True for connection errors and 429 or 5xx responses.
+    """
+    while error is not None:
+        if isinstance(error, ApiException):
+            return error.status in RETRYABLE_STATUSES
+        if isinstance(error, HTTPError):
+            return True
+        error = error.__cause__
+    return False
+
+
+class _Abandoned(Exception):
+    """
+    Raised when an operation waiting to retry belongs to a game that was reset meanwhile.
+    """
+
+
+class _PendingOperation:
+    """
+    The coalesced work pending for a single Monster resource.
+
+    Attributes:
+        namespace (str): The Kubernetes namespace of the Monster resource.
+        delete (bool): Whether the resource should be deleted.
+        upsert (tuple or None): The ("create" | "update", monster_data) to apply after any delete.
+    """
+    __slots__ = ("namespace", "delete", "upsert")
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.delete = False
+        self.upsert = None
+
+
+class MonsterSyncQueue:
+    """
+    Background queue that applies create, update and delete operations for Monster resources.
+
+    Methods:
+        init_app: Bind the queue to a Flask app and start the worker thread.
+        enqueue_create: Queue the creation of a Monster resource.
+        enqueue_update: Queue an update of a Monster resource.
+        enqueue_delete: Queue the deletion of a Monster resource.
+        clear: Drop every pending operation and wait for the one being applied.
+        flush: Wait until every pending operation has been applied.
+        shutdown: Stop the worker after draining the queue.
+    """
+
+    def __init__(self, k8s_service, retry_attempts: int = 5, retry_backoff: float = 0.5):
+        """
+        Initialize the queue.
+
+        Args:
+            k8s_service (KubernetesService): The service used to apply operations.
+            retry_attempts (int): The maximum number of attempts of a call failing with a
+                transient error.
+            retry_backoff (float): The seconds to wait before the first retry, doubled before
+                every following one.
+        """
+        self.k8s_service = k8s_service
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self._pending = OrderedDict()
+        # Monsters whose create failed; their next update is sent as a create
+        self._failed_creates = set()
+        self._in_flight = 0
+        # Incremented by `clear`, so operations of a reset game stop retrying
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._app = None
+        self._shutdown_timeout = None
+
+    def init_app(self, app):
+        """
+        Bind the queue to a Flask app and start the worker thread.
+
+        The worker runs every operation inside the app context so that `KubernetesService` can
+        log through `current_app`. Calling this again with another app rebinds the worker.
+
+        Args:
+            app (Flask): The Flask application.
+        """
+        self._app = app
+        self._shutdown_timeout = app.config.get("MONSTER_SYNC_SHUTDOWN_TIMEOUT", 10)
+        self.retry_attempts = app.config.get("MONSTER_SYNC_RETRY_ATTEMPTS", self.retry_attempts)
+        self.retry_backoff = app.config.get("MONSTER_SYNC_RETRY_BACKOFF_SECONDS",
+                                            self.retry_backoff)
+
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="monster-sync", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.shutdown)
+
+    def enqueue_create(self, name: str, namespace: str, monster_data: dict):
+        """
+        Queue the creation of a Monster resource.
+
+        Args:
+            name (str): The name of the Monster resource.
+            namespace (str): The Kubernetes namespace of the resource.
+            monster_data (dict): The monster data for the resource spec.
+        """
+        with self._condition:
+            operation = self._get_operation(name, namespace)
+            operation.upsert = ("create", monster_data)
+            self._condition.notify()
+
+    def enqueue_update(self, name: str, namespace: str, monster_data: dict):
+        """
+        Queue an update of a Monster resource.
+
+        Replaces any pending update for the same monster. If the create for the monster is still
+        pending, or failed, the create is sent with the new data instead. Updates for a monster
+        with a pending delete are dropped.
+
+        Args:
+            name (str): The name of the Monster resource.
+            namespace (str): The Kubernetes namespace of the resource.
+            monster_data (dict): The monster data for the resource spec.
+        """
+        with self._condition:
+            operation = self._get_operation(name, namespace)
+            if operation.upsert and operation.upsert[0] == "create" \
+                    or (namespace, name) in self._failed_creates:
+                operation.upsert = ("create", monster_data)
+            elif operation.delete:
+                return
+            else:
+                operation.upsert = ("update", monster_data)
+            self._condition.notify()
+
+    def enqueue_delete(self, name: str, namespace: str):
+        """
+        Queue the deletion of a Monster resource, cancelling any pending create or update.
+
+        Args:
+            name (str): The name of the Monster resource.
+            namespace (str): The Kubernetes namespace of the resource.
+        """
+        with self._condition:
+            operation = self._get_operation(name, namespace)
+            operation.delete = True
+            operation.upsert = None
+            self._failed_creates.discard((namespace, name))
+            self._condition.notify()
+
+    def clear(self, timeout: float = None) -> bool:
+        """
+        Drop every pending operation and wait for the operation being applied, e.g. before all
+        resources are deleted on reset. An operation waiting to retry is abandoned.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait. Defaults to the app's
+                `MONSTER_SYNC_SHUTDOWN_TIMEOUT`.
+
+        Returns:
+            bool: True if no operation is being applied anymore, False if the timeout expired
+                first.
+        """
+        with self._condition:
+            self._pending.clear()
+            self._failed_creates.clear()
+            self._generation += 1
+            self._condition.notify_all()
+            idle = self._condition.wait_for(
+                lambda: not self._in_flight,
+                timeout if timeout is not None else self._shutdown_timeout,
+            )
+        if not idle and self._app is not None:
+            self._app.logger.warning(
+                "A Monster resource write was still being applied when the queue was cleared"
+            )
+        return idle
+
+    def pending_count(self) -> int:
+        """
+        Returns the number of monsters with pending operations.
+
+        Returns:
+            int: The number of monsters with pending operations.
+        """
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every pending operation has been applied.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait, or None to wait forever.
+
+        Returns:
+            bool: True if the queue is empty, False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def shutdown(self, timeout: float = None):
+        """
+        Stop the worker thread after draining the queue.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait for the queue to drain.
+                Defaults to the app's `MONSTER_SYNC_SHUTDOWN_TIMEOUT`.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout if timeout is not None else self._shutdown_timeout)
+            if thread.is_alive() and self._app is not None:
+                self._app.logger.warning(
+                    "Monster sync queue did not drain before shutdown; "
+                    "%d operations dropped", self.pending_count()
+                )
+
+    def _get_operation(self, name: str, namespace: str) -> _PendingOperation:
+        """
+        Returns the pending operation for a monster, creating it if needed. Must hold the lock.
+        """
+        key = (namespace, name)
+        operation = self._pending.get(key)
+        if operation is None:
+            operation = _PendingOperation(namespace)
+            self._pending[key] = operation
+        return operation
+
+    def _run(self):
+        """
+        Worker loop: apply pending operations in the order the monsters were first queued.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                (_, name), operation = self._pending.popitem(last=False)
+                self._in_flight += 1
+                generation = self._generation
+
+            try:
+                with self._app.app_context():
+                    self._apply(name, operation, generation)
+            finally:
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+    def _apply(self, name: str, operation: _PendingOperation, generation: int):
+        """
+        Apply a coalesced operation for one Monster resource, logging any failure.
+        """
+        namespace = operation.namespace
+        try:
+            if operation.delete:
+                self._call(generation, self.k8s_service.delete_monster_resource,
+                           name=name, namespace=namespace)
+                self._app.logger.info("Successfully deleted Monster resource: %s", name)
+
+            if operation.upsert:
+                action, monster_data = operation.upsert
+                if action == "create":
+                    method = self.k8s_service.create_monster_resource
+                else:
+                    method = self.k8s_service.update_monster_resource
+                self._call(generation, method,
+                           name=name, namespace=namespace, monster_data=monster_data)
+                if action == "create":
+                    with self._condition:
+                        self._failed_creates.discard((namespace, name))
+        except _Abandoned:
+            self._app.logger.info("Dropped Monster resource write of a reset game: %s", name)
+        except Exception as e:  # pylint: disable=broad-except
+            self._app.logger.error("Failed to sync Monster resource %s: %s", name, e)
+            if operation.upsert and operation.upsert[0] == "create":
+                with self._condition:
+                    # Not if a reset or a delete of the monster came in meanwhile
+                    key = (namespace, name)
+                    pending = self._pending.get(key)
+                    if self._generation == generation and not (pending and pending.delete):
+                        self._failed_creates.add(key)
+
+    def _call(self, generation: int, method, **kwargs):
+        """
+        Call a `KubernetesService` method, retrying transient failures with exponential backoff
+        while the game the operation belongs to is not reset.
+        """
+        attempt = 1
+        while True:
+            try:
+                return method(**kwargs)
+            except Exception as e:  # pylint: disable=broad-except
+                if attempt >= self.retry_attempts or not is_retryable(e):
+                    raise
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                self._app.logger.warning(
+                    "Transient error syncing Monster resource %s (attempt %d of %d), retrying in "
+                    "%.1fs: %s", kwargs["name"], attempt, self.retry_attempts, delay, e
+                )
+            with self._condition:
+                if self._condition.wait_for(lambda: self._generation != generation, delay):
+                    raise _Abandoned()
+            attempt += 1
@@ -0,0 +1,229 @@
+"""
+This module defines the `MonstiesService` class, which manages the monstie Deployments and Pods
+in the `monsties` namespace through the Kubernetes AppsV1 and CoreV1 APIs.
+
+The monsties dashboard polls the deployments-and-pods view every second from every open tab.
+Rather than listing Deployments and Pods on every poll, the service keeps Deployments, ReplicaSets
+and Pods in watch-backed informers and serves one shared view that is only rebuilt after one of them
+changes. Until the informers have synced, the view is built from a direct list of each kind.
+A view whose build overlapped a change is returned to its caller but not kept, so the next caller
+sees the change.
+
+Pods are matched to Deployments through their ownerReferences (Pod -> ReplicaSet -> Deployment).
+The ReplicaSet and Pod informers index their objects by owner, so the view is built in time linear
+in the number of objects.
+
+All API calls go through the portal's shared API client and connection pool.
+
+Returns:
+    None: This module does not return any values.
+"""
+import threading
+from kubernetes import client
+from app.services.informer import Informer, owner_index
+
+
+class MonstiesService:
+    """
+    Service class for managing monstie Deployments and Pods.
+
+    Methods:
+        deployments_pods: Get the Deployments in the namespace with the Pods they own.
+        create_deployment: Create a monstie Deployment.
+        delete_deployment: Delete a monstie Deployment.
+        delete_pod: Delete a monstie Pod.
+    """
+
+    def __init__(self, api_client: client.ApiClient, namespace: str = "monsties", on_change=None):
+        """
+        Initialize the service.
+
+        Args:
+            api_client (client.ApiClient): The shared Kubernetes API client.
+            namespace (str): The namespace holding the monstie Deployments.
+            on_change (callable): Called with no arguments after a Deployment, ReplicaSet or Pod
+                changes.
+        """
+        self.namespace = namespace
+        self.on_change = on_change
+        self.apps_api = client.AppsV1Api(api_client)
+        self.core_api = client.CoreV1Api(api_client)
+
+        self._deployments = Informer(
+            self.apps_api, "list_namespaced_deployment", namespace, on_change=self._invalidate
+        )
+        self._replica_sets = Informer(
+            self.apps_api, "list_namespaced_replica_set", namespace, on_change=self._invalidate
+        )
+        self._replica_sets.add_index("deployment", owner_index("Deployment"))
+        self._pods = Informer(
+            self.core_api, "list_namespaced_pod", namespace, on_change=self._invalidate
+        )
+        self._pods.add_index("replicaset", owner_index("ReplicaSet"))
+        self._view = None
+        # Incremented by every change, so a view built from older informer state is not kept
+        self._generation = 0
+        self._view_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _invalidate(self):
+        """
+        Drop the cached view after a Deployment, ReplicaSet or Pod changes.
+        """
+        with self._view_lock:
+            self._generation += 1
+            self._view = None
+        if self.on_change is not None:
+            self.on_change()
+
+    def deployments_pods(self) -> dict:
+        """
+        Get the Deployments in the namespace with the Pods they own.
+
+        The informers are started on first use. Once they have synced, the view is served from
+        memory and shared by every caller.
+
+        Returns:
+            dict: Deployment names mapped to their replica count and a list of pod names
+            and phases.
+
+        Raises:
+            client.exceptions.ApiException: If the informers have not synced and listing fails.
+        """
+        informers = (self._deployments, self._replica_sets, self._pods)
+        for informer in informers:
+            informer.start()
+
+        if not all(informer.has_synced() for informer in informers):
+            sanitize = self.apps_api.api_client.sanitize_for_serialization
+            deployments = sanitize(self.apps_api.list_namespaced_deployment(self.namespace))
+            replica_sets = group_by_owner(
+                sanitize(self.apps_api.list_namespaced_replica_set(self.namespace)).get("items", []),
+                "Deployment",
+            )
+            pods = group_by_owner(
+                sanitize(self.core_api.list_namespaced_pod(self.namespace)).get("items", []),
+                "ReplicaSet",
+            )
+            return build_deployments_pods(
+                deployments.get("items", []),
+                lambda name: replica_sets.get(name, []),
+                lambda name: pods.get(name, []),
+            )
+
+        view = self._view
+        if view is None:
+            # One caller builds the view at a time; the others wait and share it
+            with self._build_lock:
+                with self._view_lock:
+                    view, generation = self._view, self._generation
+                if view is None:
+                    view = build_deployments_pods(
+                        self._deployments.items(),
+                        lambda name: self._replica_sets.by_index("deployment", name),
+                        lambda name: self._pods.by_index("replicaset", name),
+                    )
+                    with self._view_lock:
+                        # A change while building may not be in the view: keep it only if none
+                        if self._generation == generation:
+                            self._view = view
+        return view
+
+    def create_deployment(self, name: str, image: str = "nginx", replicas: int = 2):
+        """
+        Create a monstie Deployment, equivalent to `kubectl create deployment`.
+
+        Args:
+            name (str): The name of the Deployment.
+            image (str): The container image.
+            replicas (int): The number of replicas.
+
+        Raises:
+            client.exceptions.ApiException: If there is an error with the API request.
+        """
+        labels = {"app": name}
+        body = {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "metadata": {"name": name, "labels": labels},
+            "spec": {
+                "replicas": replicas,
+                "selector": {"matchLabels": labels},
+                "template": {
+                    "metadata": {"labels": labels},
+                    "spec": {"containers": [{"name": image.split("/")[-1].split(":")[0], "image": image}]},
+                },
+            },
+        }
+        self.apps_api.create_namespaced_deployment(self.namespace, body)
+
+    def delete_deployment(self, name: str):
+        """
+        Delete a monstie Deployment.
+
+        Args:
+            name (str): The name of the Deployment.
+
+        Raises:
+            client.exceptions.ApiException: If there is an error with the API request.
+        """
+        self.apps_api.delete_namespaced_deployment(name, self.namespace)
+
+    def delete_pod(self, name: str):
+        """
+        Delete a monstie Pod.
+
+        Args:
+            name (str): The name of the Pod.
+
+        Raises:
+            client.exceptions.ApiException: If there is an error with the API request.
+        """
+        self.core_api.delete_namespaced_pod(name, self.namespace)
+
+
+def group_by_owner(objects: list, kind: str) -> dict:
+    """
+    Group objects by the names of their owners of a kind.
+
+    Args:
+        objects (list): Kubernetes objects as plain dictionaries.
+        kind (str): The owner kind (e.g. "ReplicaSet").
+
+    Returns:
+        dict: Owner names mapped to the list of objects they own.
+    """
+    owners = owner_index(kind)
+    grouped = {}
+    for obj in objects:
+        for owner in owners(obj):
+            grouped.setdefault(owner, []).append(obj)
+    return grouped
+
+
+def build_deployments_pods(deployments: list, replica_sets_for, pods_for) -> dict:
+    """
+    Group Pods under the Deployments that own them through their ReplicaSets.
+
+    Args:
+        deployments (list): Deployment objects as plain dictionaries.
+        replica_sets_for (callable): Returns the ReplicaSets owned by a Deployment name.
+        pods_for (callable): Returns the Pods owned by a ReplicaSet name.
+
+    Returns:
+        dict: Deployment names mapped to their replica count and a list of pod names and phases.
+    """
+    deployment_map = {}
+    for deployment in deployments:
+        deployment_name = deployment["metadata"]["name"]
+        pods = [
+            {"name": pod["metadata"]["name"], "status": pod.get("status", {}).get("phase")}
+            for replica_set in replica_sets_for(deployment_name)
+            for pod in pods_for(replica_set["metadata"]["name"])
+        ]
+        deployment_map[deployment_name] = {
+            "replicas": deployment["spec"].get("replicas", 1),
+            "pods": pods
+        }
+
+    return deployment_map
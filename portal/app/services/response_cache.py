@@ -0,0 +1,119 @@
+"""
+This module defines the `ResponseCache` class, which keeps the encoded body of read responses so
+identical polls of unchanged data are answered without rebuilding or re-serializing anything.
+
+Each entry is tagged with the store versions it was built from (see `app.services.versions`). An
+entry is only served while its tag matches the current versions, so a mutation invalidates every
+response built from the store it changed. Concurrent misses for the same key are single-flighted:
+one request builds the response while the others wait for it.
+
+The cache holds at most `max_entries` responses and evicts the least recently used one.
+
+Returns:
+    None: This module does not return any values.
+"""
+import threading
+from collections import OrderedDict
+from flask import Response
+
+
+class _Flight:
+    """
+    A response being built for one key and tag, which concurrent requests wait for.
+    """
+    __slots__ = ("tag", "done", "entry")
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.done = threading.Event()
+        self.entry = None
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of encoded response bodies, tagged with store versions.
+
+    Methods:
+        get: Return the cached response for a key, building it on a miss.
+        clear: Drop every cached response.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached responses.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, tag: str, build) -> Response:
+        """
+        Return the cached response for a key, building it if the cached one has another tag.
+
+        Only 200 responses are cached; other responses are returned to the caller that built them
+        and rebuilt by every waiting request.
+
+        Args:
+            key (str): The cache key (e.g. the request path and query string).
+            tag (str): The store versions the response must be built from.
+            build (callable): Builds the response.
+
+        Returns:
+            Response: The cached or newly built response.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == tag:
+                self._entries.move_to_end(key)
+                return self._response(entry)
+
+            flight = self._flights.get(key)
+            leader = flight is None or flight.tag != tag
+            if leader:
+                flight = _Flight(tag)
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.entry is not None:
+                return self._response(flight.entry)
+            return build()
+
+        try:
+            response = build()
+            if not isinstance(response, tuple) and response.status_code == 200:
+                headers = [
+                    (name, value) for name, value in response.headers.items()
+                    if name not in ("Content-Type", "Content-Length")
+                ]
+                flight.entry = (tag, response.get_data(), response.mimetype, headers)
+                with self._lock:
+                    self._entries[key] = flight.entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return response
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def clear(self):
+        """
+        Drop every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _response(entry: tuple) -> Response:
+        """
+        Build a response from a cached (tag, body, mimetype, headers) entry.
+        """
+        _, body, mimetype, headers = entry
+        return Response(body, mimetype=mimetype, headers=headers)
@@ -0,0 +1,207 @@
+"""
+This module defines the thread-safe containers that hold the portal's in-memory game state, so the
+portal can serve requests from several threads, workers or replicas at once.
+
+- `SnapshotDict`: A dictionary read as whole snapshots. Writes are atomic; readers never block and
+  always see a consistent snapshot, even while a write is in progress.
+- `SequenceMap`: A `SnapshotDict` of sequence numbers (e.g. the last delta applied to each
+  entity), which can be advanced only from the values the caller expects.
+- `ClaimQueue`: Items waiting to be claimed (e.g. new monstie pod names), plus the items already
+  claimed. Adding and claiming are atomic, so two pollers never claim the same item.
+
+The containers keep their data in the state backend (see `app.services.state_backend`), so the
+values they hold must be JSON-serializable. Snapshots returned by these containers are shared
+between threads and must not be modified.
+
+Returns:
+    None: This module does not return any values.
+"""
+from app.services.state_backend import get_backend
+
+
+class SnapshotDict:
+    """
+    Named dictionary stored in the state backend, whose readers never see a partial write.
+
+    Methods:
+        snapshot: Get the current contents.
+        get: Get the value of a key.
+        update: Set several keys at once.
+        set: Set one key.
+        clear: Remove every key.
+    """
+
+    def __init__(self, name: str, initial: dict = None):
+        """
+        Initialize the dictionary.
+
+        Args:
+            name (str): The name of the map in the state backend.
+            initial (dict): The contents until the first write.
+        """
+        self.name = name
+        self._initial = dict(initial or {})
+
+    def snapshot(self) -> dict:
+        """
+        Get the current contents. The returned dict is never modified by later writes.
+
+        Returns:
+            dict: The contents at the time of the call.
+        """
+        data = get_backend().map_snapshot(self.name)
+        return self._initial if data is None else data
+
+    def get(self, key, default=None):
+        """
+        Get the value of a key.
+
+        Args:
+            key: The key.
+            default: The value returned if the key is missing.
+
+        Returns:
+            The value, or `default` if the key is missing.
+        """
+        return self.snapshot().get(key, default)
+
+    def __getitem__(self, key):
+        return self.snapshot()[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.snapshot()
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def __bool__(self) -> bool:
+        return bool(self.snapshot())
+
+    def items(self):
+        return self.snapshot().items()
+
+    def values(self):
+        return self.snapshot().values()
+
+    def update(self, values: dict):
+        """
+        Set several keys at once; readers see either none or all of them.
+
+        Args:
+            values (dict): The keys and values to set.
+        """
+        get_backend().map_update(self.name, values)
+
+    def set(self, key, value):
+        """
+        Set one key.
+
+        Args:
+            key: The key.
+            value: The value.
+        """
+        self.update({key: value})
+
+    def clear(self):
+        """
+        Remove every key.
+        """
+        get_backend().map_clear(self.name)
+
+
+class SequenceMap(SnapshotDict):
+    """
+    Named dictionary of sequence numbers stored in the state backend, advanced atomically.
+
+    Methods:
+        advance: Set keys whose current sequence matches the expected one.
+    """
+
+    def advance(self, updates: dict) -> set:
+        """
+        Set keys to new sequence numbers, but only the keys still at the sequence the caller read,
+        so two writers starting from the same sequence never both advance it.
+
+        Args:
+            updates (dict): The keys mapped to their (expected, new) sequence numbers.
+
+        Returns:
+            set: The keys that were advanced.
+        """
+        backend = get_backend()
+        with backend.transaction():
+            current = backend.map_snapshot(self.name) or self._initial
+            advanced = {key for key, (expected, _) in updates.items()
+                        if current.get(key) == expected}
+            if advanced:
+                backend.map_update(self.name, {key: updates[key][1] for key in advanced})
+        return advanced
+
+
+class ClaimQueue:
+    """
+    Named queue stored in the state backend: items waiting to be claimed, and the items already
+    claimed, updated atomically.
+
+    Methods:
+        add: Add an item waiting to be claimed.
+        claim: Claim every waiting item.
+        pending: Get the items waiting to be claimed.
+        claimed: Get the items already claimed.
+        clear: Remove every item.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the queue.
+
+        Args:
+            name (str): The name of the queue in the state backend.
+        """
+        self.name = name
+
+    def add(self, item, unique: bool = False) -> bool:
+        """
+        Add an item waiting to be claimed.
+
+        Args:
+            item: The item.
+            unique (bool): Skip the item if it is already waiting or claimed.
+
+        Returns:
+            bool: True if the item was added.
+        """
+        return get_backend().queue_add(self.name, item, unique)
+
+    def claim(self) -> tuple:
+        """
+        Claim every waiting item, moving it to the claimed items.
+
+        Returns:
+            tuple: The items claimed by this call.
+        """
+        return get_backend().queue_claim(self.name)
+
+    def pending(self) -> tuple:
+        """
+        Get the items waiting to be claimed.
+
+        Returns:
+            tuple: The items.
+        """
+        return get_backend().queue_items(self.name, claimed=False)
+
+    def claimed(self) -> tuple:
+        """
+        Get the items already claimed.
+
+        Returns:
+            tuple: The items.
+        """
+        return get_backend().queue_items(self.name, claimed=True)
+
+    def clear(self):
+        """
+        Remove every waiting and claimed item.
+        """
+        get_backend().queue_clear(self.name)
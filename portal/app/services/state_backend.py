@@ -0,0 +1,757 @@
+"""
+This module defines the backends that hold the portal's game state, so several gunicorn workers
+can serve the same game.
+
+The stores in `app.services.state`, the store version counters and the monster registry keep their
+data in the backend returned by `get_backend()`, chosen at startup by the `STATE_BACKEND` setting:
+- `MemoryBackend` ("memory", the default): Process memory. Only one worker can serve the game.
+- `SQLiteBackend` ("sqlite"): A SQLite database in WAL mode at `STATE_SQLITE_PATH`, shared by every
+  process that opens the same file. Readers never block writers, and writes are serialized by
+  SQLite's write lock. WAL mode needs shared memory, so every process must run on the same host:
+  the workers of one portal Pod, never several portal replicas sharing a network volume.
+
+A backend provides:
+- Maps: Named dictionaries of JSON values, read as whole snapshots and updated atomically.
+- Queues: Named lists of items waiting to be claimed, plus the items already claimed.
+- Counters: Named integers, e.g. the store versions used for ETags.
+- Records (shared backends only): Named tables of JSON documents keyed by ID. Every write gets an
+  increasing sequence number, so each process can replay the changes made by the others into its
+  own in-memory indexes (see `MonsterRegistry`). Deleting a record leaves a tombstone (a record
+  with empty data) so the other processes replay the deletion too.
+- An event log (shared backends only): The change events published by every process, each with an
+  increasing sequence number, which each process tails to feed its own dashboards (see
+  `EventBroker`). Only the last `EVENT_LOG_SIZE` events are kept.
+
+Returns:
+    None: This module does not return any values.
+"""
+import abc
+import contextlib
+import json
+import sqlite3
+import threading
+import uuid
+
+# Events kept in a shared backend's event log; a process further behind resyncs its dashboards
+EVENT_LOG_SIZE = 1024
+
+
+class StateBackend(abc.ABC):
+    """
+    Interface of the game state backends. A backend that is not shared rejects the record and
+    event log methods with `NotImplementedError`.
+
+    Attributes:
+        shared (bool): Whether the state is shared with other processes, which must then replay
+            the records they did not write.
+        token (str): Identifies the state; ETags built from counters of another state never match.
+
+    Methods:
+        transaction: Group several operations; other writers wait until the group ends.
+        map_snapshot: Get the contents of a map.
+        map_update: Set several keys of a map.
+        map_clear: Remove every key of a map.
+        queue_add: Add an item to a queue.
+        queue_claim: Claim every waiting item of a queue.
+        queue_items: Get the waiting or claimed items of a queue.
+        queue_clear: Remove every item of a queue.
+        incr: Increment counters.
+        counters: Get the values of counters.
+        record_put: Store a record (shared backends only).
+        record_delete: Delete a record, leaving a tombstone (shared backends only).
+        record_changes: Get the records written since a sequence number (shared backends only).
+        record_clear: Remove every record of a table (shared backends only).
+        event_append: Append an event to the event log (shared backends only).
+        event_changes: Get the events appended since a sequence number (shared backends only).
+        event_latest: Get the sequence number of the last event (shared backends only).
+    """
+    shared = False
+    token = ""
+
+    @abc.abstractmethod
+    def transaction(self):
+        """
+        Group several operations; other writers wait until the group ends.
+        """
+
+    @abc.abstractmethod
+    def map_snapshot(self, name: str):
+        """
+        Get the contents of a map.
+        """
+
+    @abc.abstractmethod
+    def map_update(self, name: str, values: dict):
+        """
+        Set several keys of a map.
+        """
+
+    @abc.abstractmethod
+    def map_clear(self, name: str):
+        """
+        Remove every key of a map.
+        """
+
+    @abc.abstractmethod
+    def queue_add(self, name: str, item, unique: bool = False) -> bool:
+        """
+        Add an item to a queue.
+        """
+
+    @abc.abstractmethod
+    def queue_claim(self, name: str) -> tuple:
+        """
+        Claim every waiting item of a queue.
+        """
+
+    @abc.abstractmethod
+    def queue_items(self, name: str, claimed: bool) -> tuple:
+        """
+        Get the waiting or claimed items of a queue.
+        """
+
+    @abc.abstractmethod
+    def queue_clear(self, name: str):
+        """
+        Remove every item of a queue.
+        """
+
+    @abc.abstractmethod
+    def incr(self, *names: str):
+        """
+        Increment counters.
+        """
+
+    @abc.abstractmethod
+    def counters(self, names) -> dict:
+        """
+        Get the values of counters.
+        """
+
+    @abc.abstractmethod
+    def record_put(self, table: str, key: int, data: str) -> int:
+        """
+        Store a record.
+        """
+
+    @abc.abstractmethod
+    def record_delete(self, table: str, key: int) -> int:
+        """
+        Delete a record, leaving a tombstone.
+        """
+
+    @abc.abstractmethod
+    def record_changes(self, table: str, since: int) -> tuple:
+        """
+        Get the records written since a sequence number.
+        """
+
+    @abc.abstractmethod
+    def record_clear(self, table: str) -> int:
+        """
+        Remove every record of a table.
+        """
+
+    @abc.abstractmethod
+    def event_append(self, event_type: str, data: str) -> int:
+        """
+        Append an event to the event log.
+        """
+
+    @abc.abstractmethod
+    def event_changes(self, since: int) -> list:
+        """
+        Get the events appended since a sequence number.
+        """
+
+    @abc.abstractmethod
+    def event_latest(self) -> int:
+        """
+        Get the sequence number of the last event.
+        """
+
+
+class MemoryBackend(StateBackend):
+    """
+    Game state kept in process memory.
+
+    Maps are copy-on-write: a write builds a new dict and swaps it in, so readers take the current
+    dict without locking and never see a partial update. Snapshots must not be modified.
+
+    Writes hold the state's write lock, which a transaction holds until it ends, so the writes of
+    other threads wait for the transaction like they wait for another worker's SQLite transaction.
+    Writes made in a transaction are visible to readers as soon as they are made, though, and an
+    exception does not undo them.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty state.
+        """
+        self.token = uuid.uuid4().hex[:8]
+        self._maps = {}
+        self._queues = {}
+        self._counters = {}
+        # The write lock, re-entrant so writes can be made inside a transaction
+        self._lock = threading.RLock()
+
+    def transaction(self):
+        """
+        Hold the write lock, so other threads write only once the transaction ends.
+        """
+        return self._lock
+
+    def map_snapshot(self, name: str):
+        """
+        Get the contents of a map.
+
+        Args:
+            name (str): The map name.
+
+        Returns:
+            dict or None: The contents, or None if the map was never written.
+        """
+        return self._maps.get(name)
+
+    def map_update(self, name: str, values: dict):
+        """
+        Set several keys of a map; readers see either none or all of them.
+
+        Args:
+            name (str): The map name.
+            values (dict): The keys and values to set.
+        """
+        with self._lock:
+            data = dict(self._maps.get(name) or {})
+            data.update(values)
+            self._maps[name] = data
+
+    def map_clear(self, name: str):
+        """
+        Remove every key of a map.
+
+        Args:
+            name (str): The map name.
+        """
+        with self._lock:
+            self._maps[name] = {}
+
+    def queue_add(self, name: str, item, unique: bool = False) -> bool:
+        """
+        Add an item waiting to be claimed.
+
+        Args:
+            name (str): The queue name.
+            item: The item.
+            unique (bool): Skip the item if it is already waiting or claimed.
+
+        Returns:
+            bool: True if the item was added.
+        """
+        with self._lock:
+            pending, claimed = self._queues.get(name, ((), ()))
+            if unique and (item in pending or item in claimed):
+                return False
+            self._queues[name] = (pending + (item,), claimed)
+            return True
+
+    def queue_claim(self, name: str) -> tuple:
+        """
+        Claim every waiting item, moving it to the claimed items.
+
+        Args:
+            name (str): The queue name.
+
+        Returns:
+            tuple: The items claimed by this call.
+        """
+        with self._lock:
+            pending, claimed = self._queues.get(name, ((), ()))
+            if pending:
+                self._queues[name] = ((), claimed + pending)
+            return pending
+
+    def queue_items(self, name: str, claimed: bool) -> tuple:
+        """
+        Get the waiting or claimed items of a queue.
+
+        Args:
+            name (str): The queue name.
+            claimed (bool): Whether to get the claimed items rather than the waiting ones.
+
+        Returns:
+            tuple: The items.
+        """
+        return self._queues.get(name, ((), ()))[1 if claimed else 0]
+
+    def queue_clear(self, name: str):
+        """
+        Remove every waiting and claimed item of a queue.
+
+        Args:
+            name (str): The queue name.
+        """
+        with self._lock:
+            self._queues.pop(name, None)
+
+    def incr(self, *names: str):
+        """
+        Increment counters.
+
+        Args:
+            *names (str): The counter names.
+        """
+        with self._lock:
+            for name in names:
+                self._counters[name] = self._counters.get(name, 0) + 1
+
+    def counters(self, names) -> dict:
+        """
+        Get the values of counters.
+
+        Args:
+            names (iterable): The counter names.
+
+        Returns:
+            dict: The value of each counter, zero if it was never incremented.
+        """
+        # Reads take no lock, like map reads, so they never wait for a transaction
+        return {name: self._counters.get(name, 0) for name in names}
+
+    @staticmethod
+    def _not_shared(*_):
+        """
+        Reject the record and event log methods: the state of a single process has no other
+        process to replay its records or tail its events.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError("The memory backend is not shared; records and the event log "
+                                  "need a shared STATE_BACKEND")
+
+    record_put = record_delete = record_changes = record_clear = _not_shared
+    event_append = event_changes = event_latest = _not_shared
+
+
+class SQLiteBackend(StateBackend):
+    """
+    Game state kept in a SQLite database in WAL mode, shared by every process that opens it.
+
+    Each thread uses its own connection. Map snapshots are cached per process and only reloaded
+    when the map's version changes.
+    """
+    shared = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS maps (
+            name TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS queues (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, item TEXT NOT NULL,
+            claimed INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS queues_name ON queues (name, claimed);
+        CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS records (
+            tbl TEXT NOT NULL, key INTEGER NOT NULL, seq INTEGER NOT NULL, data TEXT NOT NULL,
+            PRIMARY KEY (tbl, key)
+        );
+        CREATE INDEX IF NOT EXISTS records_seq ON records (tbl, seq);
+        CREATE TABLE IF NOT EXISTS events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, data TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path (str): The database file. Every process sharing the state must use the same one.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._maps = {}
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(self._SCHEMA)
+        connection.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('token', ?)", (uuid.uuid4().hex[:8],)
+        )
+        self.token = connection.execute("SELECT value FROM meta WHERE key = 'token'").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; transactions are opened explicitly by `transaction`
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Group several operations in one write transaction. Transactions can be nested; only the
+        outermost one commits.
+        """
+        connection = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield connection
+            finally:
+                self._local.depth -= 1
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def map_snapshot(self, name: str):
+        """
+        Get the contents of a map, reloading it only if another write changed it.
+
+        Args:
+            name (str): The map name.
+
+        Returns:
+            dict or None: The contents, or None if the map was never written.
+        """
+        row = self._connection().execute(
+            "SELECT version FROM maps WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        cached = self._maps.get(name)
+        if cached is not None and cached[0] == row[0]:
+            return cached[1]
+
+        row = self._connection().execute(
+            "SELECT version, data FROM maps WHERE name = ?", (name,)
+        ).fetchone()
+        data = json.loads(row[1])
+        if not getattr(self._local, "depth", 0):
+            # Inside a transaction the contents may not be committed yet and could be rolled back
+            self._maps[name] = (row[0], data)
+        return data
+
+    def map_update(self, name: str, values: dict):
+        """
+        Set several keys of a map; readers see either none or all of them.
+
+        Args:
+            name (str): The map name.
+            values (dict): The keys and JSON-serializable values to set.
+        """
+        with self.transaction() as connection:
+            row = connection.execute("SELECT data FROM maps WHERE name = ?", (name,)).fetchone()
+            data = json.loads(row[0]) if row else {}
+            data.update(values)
+            self._write_map(connection, name, data)
+
+    def map_clear(self, name: str):
+        """
+        Remove every key of a map.
+
+        Args:
+            name (str): The map name.
+        """
+        with self.transaction() as connection:
+            self._write_map(connection, name, {})
+
+    @staticmethod
+    def _write_map(connection: sqlite3.Connection, name: str, data: dict):
+        """
+        Replace the contents of a map and increment its version.
+        """
+        connection.execute(
+            "INSERT INTO maps (name, version, data) VALUES (?, 1, ?) "
+            "ON CONFLICT (name) DO UPDATE SET version = version + 1, data = excluded.data",
+            (name, json.dumps(data)),
+        )
+
+    def queue_add(self, name: str, item, unique: bool = False) -> bool:
+        """
+        Add an item waiting to be claimed.
+
+        Args:
+            name (str): The queue name.
+            item: The JSON-serializable item.
+            unique (bool): Skip the item if it is already waiting or claimed.
+
+        Returns:
+            bool: True if the item was added.
+        """
+        encoded = json.dumps(item)
+        with self.transaction() as connection:
+            if unique and connection.execute(
+                "SELECT 1 FROM queues WHERE name = ? AND item = ?", (name, encoded)
+            ).fetchone():
+                return False
+            connection.execute("INSERT INTO queues (name, item) VALUES (?, ?)", (name, encoded))
+            return True
+
+    def queue_claim(self, name: str) -> tuple:
+        """
+        Claim every waiting item, moving it to the claimed items.
+
+        Args:
+            name (str): The queue name.
+
+        Returns:
+            tuple: The items claimed by this call.
+        """
+        with self.transaction() as connection:
+            rows = connection.execute(
+                "SELECT seq, item FROM queues WHERE name = ? AND claimed = 0 ORDER BY seq", (name,)
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    "UPDATE queues SET claimed = 1 WHERE name = ? AND claimed = 0 AND seq <= ?",
+                    (name, rows[-1][0]),
+                )
+        return tuple(json.loads(item) for _, item in rows)
+
+    def queue_items(self, name: str, claimed: bool) -> tuple:
+        """
+        Get the waiting or claimed items of a queue.
+
+        Args:
+            name (str): The queue name.
+            claimed (bool): Whether to get the claimed items rather than the waiting ones.
+
+        Returns:
+            tuple: The items.
+        """
+        rows = self._connection().execute(
+            "SELECT item FROM queues WHERE name = ? AND claimed = ? ORDER BY seq",
+            (name, int(claimed)),
+        ).fetchall()
+        return tuple(json.loads(item) for item, in rows)
+
+    def queue_clear(self, name: str):
+        """
+        Remove every waiting and claimed item of a queue.
+
+        Args:
+            name (str): The queue name.
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM queues WHERE name = ?", (name,))
+
+    def incr(self, *names: str):
+        """
+        Increment counters.
+
+        Args:
+            *names (str): The counter names.
+        """
+        with self.transaction() as connection:
+            for name in names:
+                self._incr(connection, name)
+
+    @staticmethod
+    def _incr(connection: sqlite3.Connection, name: str) -> int:
+        """
+        Increment a counter and return its new value.
+        """
+        connection.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+        return connection.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+    def counters(self, names) -> dict:
+        """
+        Get the values of counters.
+
+        Args:
+            names (iterable): The counter names.
+
+        Returns:
+            dict: The value of each counter, zero if it was never incremented.
+        """
+        names = list(names)
+        values = dict.fromkeys(names, 0)
+        rows = self._connection().execute(
+            f"SELECT name, value FROM counters WHERE name IN ({', '.join('?' * len(names))})",
+            names,
+        ).fetchall()
+        values.update(rows)
+        return values
+
+    def record_put(self, table: str, key: int, data: str) -> int:
+        """
+        Store a record, replacing the record with the same key.
+
+        Args:
+            table (str): The record table (e.g. "monsters").
+            key (int): The record key.
+            data (str): The JSON-encoded record.
+
+        Returns:
+            int: The record's sequence number.
+        """
+        with self.transaction() as connection:
+            seq = self._incr(connection, f"records:{table}")
+            connection.execute(
+                "INSERT INTO records (tbl, key, seq, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (tbl, key) DO UPDATE SET seq = excluded.seq, data = excluded.data",
+                (table, key, seq, data),
+            )
+            return seq
+
+    def record_delete(self, table: str, key: int) -> int:
+        """
+        Delete a record, replacing it with a tombstone (empty data) that `record_changes` returns
+        to the processes replaying the table.
+
+        Args:
+            table (str): The record table.
+            key (int): The record key.
+
+        Returns:
+            int: The tombstone's sequence number.
+        """
+        return self.record_put(table, key, "")
+
+    def record_changes(self, table: str, since: int) -> tuple:
+        """
+        Get the records written after a sequence number.
+
+        Args:
+            table (str): The record table.
+            since (int): The last sequence number already seen.
+
+        Returns:
+            tuple: The table generation (incremented by `record_clear`) and the list of
+            (seq, key, data) records, in sequence order. Deleted records have empty data.
+        """
+        # Read the generation last: if the table was cleared meanwhile, the caller sees the new
+        # generation and replays the table from the start
+        rows = self._connection().execute(
+            "SELECT seq, key, data FROM records WHERE tbl = ? AND seq > ? ORDER BY seq",
+            (table, since),
+        ).fetchall()
+        generation = self.counters([f"generation:{table}"])[f"generation:{table}"]
+        return generation, rows
+
+    def record_clear(self, table: str) -> int:
+        """
+        Remove every record of a table.
+
+        Args:
+            table (str): The record table.
+
+        Returns:
+            int: The new table generation.
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM records WHERE tbl = ?", (table,))
+            return self._incr(connection, f"generation:{table}")
+
+    def event_append(self, event_type: str, data: str) -> int:
+        """
+        Append an event to the event log, dropping the events beyond `EVENT_LOG_SIZE`. Inside a
+        transaction, the event becomes visible to the other processes when the transaction
+        commits.
+
+        Args:
+            event_type (str): The event name.
+            data (str): The JSON-encoded event payload.
+
+        Returns:
+            int: The event's sequence number.
+        """
+        with self.transaction() as connection:
+            seq = connection.execute(
+                "INSERT INTO events (type, data) VALUES (?, ?)", (event_type, data)
+            ).lastrowid
+            connection.execute("DELETE FROM events WHERE seq <= ?", (seq - EVENT_LOG_SIZE,))
+            return seq
+
+    def event_changes(self, since: int) -> list:
+        """
+        Get the events appended after a sequence number.
+
+        Args:
+            since (int): The last sequence number already seen.
+
+        Returns:
+            list: The (seq, event type, data) events, in sequence order.
+        """
+        return self._connection().execute(
+            "SELECT seq, type, data FROM events WHERE seq > ? ORDER BY seq", (since,)
+        ).fetchall()
+
+    def event_latest(self) -> int:
+        """
+        Get the sequence number of the last event.
+
+        Returns:
+            int: The sequence number, or 0 if no event was appended.
+        """
+        return self._connection().execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+
+_backend = MemoryBackend()
+
+
+def get_backend() -> StateBackend:
+    """
+    Get the backend holding the game state.
+
+    Returns:
+        StateBackend: The backend chosen by `init_app`, or a `MemoryBackend` before that.
+    """
+    return _backend
+
+
+def set_backend(backend: StateBackend):
+    """
+    Replace the backend holding the game state.
+
+    Args:
+        backend (StateBackend): The new backend.
+    """
+    global _backend  # pylint: disable=global-statement
+    _backend = backend
+
+
+def init_app(app):
+    """
+    Choose the game state backend from the app configuration.
+
+    Args:
+        app (Flask): The app, configured with `STATE_BACKEND` and `STATE_SQLITE_PATH`.
+
+    Raises:
+        ValueError: If `STATE_BACKEND` is not a known backend.
+    """
+    name = app.config.get("STATE_BACKEND", "memory")
+    if name == "memory":
+        if _backend.shared:
+            set_backend(MemoryBackend())
+    elif name == "sqlite":
+        set_backend(SQLiteBackend(app.config["STATE_SQLITE_PATH"]))
+    else:
+        raise ValueError(f"Unknown STATE_BACKEND: {name}")
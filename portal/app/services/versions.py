@@ -0,0 +1,137 @@
+"""
+This module defines the `StoreVersions` class, which keeps a version counter for each in-memory
+store, and the `versioned` decorator, which uses those counters to answer conditional GET requests.
+
+Every route that mutates a store bumps its counter. Read endpoints decorated with `versioned` send a
+weak ETag built from the counters of the stores they read; when a request's `If-None-Match` still
+matches, the endpoint returns 304 without calling the view or serializing anything. Browsers send
+`If-None-Match` automatically for responses they have cached, so polling clients benefit without
+any change.
+
+The counters live in the state backend (see `app.services.state_backend`). ETags include the
+backend's token, chosen when its state is created, so a tag from another state never matches.
+
+Views decorated with `versioned(..., cache=True)` also keep their encoded body in a `ResponseCache`
+tagged with the same versions, so requests without a matching ETag are answered from memory until
+one of the stores changes.
+
+Returns:
+    None: This module does not return any values.
+"""
+import functools
+from flask import Response, current_app, request
+from app.services.response_cache import ResponseCache
+from app.services.state_backend import get_backend
+
+# Store names, one per group of in-memory data with its own version counter
+PLAYER = "player"
+ITEMS = "items"
+PACK = "pack"
+GAME_STATE = "gamestate"
+GAME_STATS = "gamestats"
+MONSTERS = "monsters"
+MONSTIES = "monsties"
+
+
+class StoreVersions:
+    """
+    Version counters for the in-memory stores, kept in the state backend so every worker sharing
+    the state sends the same ETags.
+
+    Methods:
+        bump: Increment the counters of one or more stores after they change.
+        version: Get the current counter of a store.
+        versions: Get the current counters of several stores.
+        etag: Build the ETag value for a set of stores.
+    """
+
+    def bump(self, *stores: str):
+        """
+        Increment the counters of one or more stores after they change.
+
+        Args:
+            *stores (str): The names of the stores that changed.
+        """
+        get_backend().incr(*(f"version:{store}" for store in stores))
+
+    def version(self, store: str) -> int:
+        """
+        Get the current counter of a store.
+
+        Args:
+            store (str): The name of the store.
+
+        Returns:
+            int: The number of times the store has changed.
+        """
+        name = f"version:{store}"
+        return get_backend().counters([name])[name]
+
+    def versions(self, *stores: str) -> list:
+        """
+        Get the current counters of several stores in one backend read.
+
+        Args:
+            *stores (str): The names of the stores.
+
+        Returns:
+            list: The counter of each store, in the same order.
+        """
+        names = [f"version:{store}" for store in stores]
+        counters = get_backend().counters(names)
+        return [counters[name] for name in names]
+
+    def etag(self, *stores: str) -> str:
+        """
+        Build the (unquoted) ETag value for the current versions of a set of stores.
+
+        Args:
+            *stores (str): The names of the stores a response is built from.
+
+        Returns:
+            str: The ETag value.
+        """
+        backend = get_backend()
+        counters = backend.counters([f"version:{store}" for store in stores])
+        versions = "-".join(f"{store}{counters[f'version:{store}']}" for store in stores)
+        return f"{backend.token}-{versions}"
+
+
+store_versions = StoreVersions()
+response_cache = ResponseCache()
+
+
+def versioned(*stores: str, cache: bool = False):
+    """
+    Decorate a GET view so it sends a weak ETag and answers matching requests with 304.
+
+    The ETag is computed before the view runs, so a change made while the response is being built
+    only makes the next request refetch.
+
+    Args:
+        *stores (str): The names of the stores the view reads.
+        cache (bool): Whether to keep the encoded response in the response cache, keyed by
+            request path and query string, until one of the stores changes.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = store_versions.etag(*stores)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            elif cache and current_app.config.get("RESPONSE_CACHE_ENABLED", True):
+                response = response_cache.get(
+                    request.full_path, etag, lambda: view(*args, **kwargs)
+                )
+            else:
+                response = view(*args, **kwargs)
+            if isinstance(response, tuple) or response.status_code not in (200, 304):
+                return response
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,62 @@
+/**
+ * Seconds a page polls before opening the stream again when the portal refused it.
+ */
+const EVENTS_REFUSED_RETRY_SECONDS = 10;
+
+/**
+ * Subscribes to the portal's change event stream.
+ *
+ * Each handler is called with the parsed event data. When the stream (re)connects or the
+ * portal asks for a resync, `onResync` is called so the page can fetch its full state again.
+ * Browsers without EventSource fall back to calling `onResync` every second, and so does a
+ * page whose stream the portal refused (it serves a limited number of streams), until it
+ * opens the stream again.
+ *
+ * @param {Object} handlers - Event types mapped to handler functions.
+ * @param {Function} onResync - Fetches the page's full state.
+ */
+function subscribeToEvents(handlers, onResync) {
+    if (!window.EventSource) {
+        setInterval(onResync, 1000);
+        onResync();
+        return null;
+    }
+
+    const source = new EventSource('/events');
+    source.addEventListener('open', onResync);
+    source.addEventListener('resync', onResync);
+    source.addEventListener('reset', onResync);
+    source.addEventListener('error', () => {
+        // A closed source was refused (e.g. a 503); a source that is reconnecting is left alone
+        if (source.readyState !== EventSource.CLOSED) return;
+        const poll = setInterval(onResync, 1000);
+        onResync();
+        setTimeout(() => {
+            clearInterval(poll);
+            subscribeToEvents(handlers, onResync);
+        }, EVENTS_REFUSED_RETRY_SECONDS * 1000);
+    });
+
+    Object.entries(handlers).forEach(([eventType, handler]) => {
+        source.addEventListener(eventType, event => handler(JSON.parse(event.data)));
+    });
+
+    return source;
+}
+
+/**
+ * Coalesces calls to a function so it runs at most once every `wait` milliseconds.
+ *
+ * @param {Function} fn - The function to run.
+ * @param {number} wait - The minimum number of milliseconds between runs.
+ */
+function coalesce(fn, wait = 250) {
+    let timer = null;
+    return () => {
+        if (timer) return;
+        timer = setTimeout(() => {
+            timer = null;
+            fn();
+        }, wait);
+    };
+}
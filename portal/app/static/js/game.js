@@ -84,12 +84,11 @@ function updateGameStatsInfo(gameStats) {
     });
 }
 
-setInterval(() => fetchData('/gamestate/data', updateGameStateInfo), 1000);
-setInterval(() => fetchData('/gamestats/data', updateGameStatsInfo), 1000);
-
-window.onload = () => {
-    Promise.all([
-        fetchData('/gamestate/data', updateGameStateInfo),
-        fetchData('/gamestats/data', updateGameStatsInfo)
-    ]);
-};
+// Refetch game state and stats only when the portal reports a change
+subscribeToEvents({
+    gamestate: coalesce(() => fetchData('/gamestate/data', updateGameStateInfo)),
+    gamestats: coalesce(() => fetchData('/gamestats/data', updateGameStatsInfo))
+}, () => Promise.all([
+    fetchData('/gamestate/data', updateGameStateInfo),
+    fetchData('/gamestats/data', updateGameStatsInfo)
+]));
@@ -2,6 +2,11 @@ let activeMonstersData = [];
 let deadMonstersData = [];
 let allMonstersData = [];
 
+// Monsters by id, patched in place from the event stream
+const activeMonsters = new Map();
+const deadMonsters = new Map();
+const allMonsters = new Map();
+
 async function fetchMonsterData() {
     /**
      * Fetches data for live monsters, dead monsters, and all monsters from the server.
@@ -21,12 +26,39 @@ async function fetchMonsterData() {
         const allMonstersResponse = await fetch('/monsters/all');
         allMonstersData = await allMonstersResponse.json();
 
+        [[activeMonsters, activeMonstersData], [deadMonsters, deadMonstersData], [allMonsters, allMonstersData]]
+            .forEach(([monsters, data]) => {
+                monsters.clear();
+                data.forEach(monster => monsters.set(monster.id, monster));
+            });
+
         // Apply any filters that have been set
         applyFilters();
     } catch (error) {
         console.error('Error fetching monster data:', error);
     }
 }
+
+function applyMonsterEvent(monster, isDead) {
+    /**
+     * Patches the stored monster data with a monster from the event stream and schedules
+     * a redraw of the tables.
+     */
+    if (isDead) {
+        activeMonsters.delete(monster.id);
+        deadMonsters.set(monster.id, monster);
+    } else {
+        activeMonsters.set(monster.id, monster);
+    }
+    allMonsters.set(monster.id, monster);
+
+    activeMonstersData = Array.from(activeMonsters.values());
+    deadMonstersData = Array.from(deadMonsters.values());
+    allMonstersData = Array.from(allMonsters.values());
+    redrawTables();
+}
+
+const redrawTables = coalesce(applyFilters);
     
 function applyFilters() {
     /**
@@ -158,12 +190,12 @@ function updateTables(activeMonsters, deadMonsters, allMonsters) {
     });
 }
 
-setInterval(fetchMonsterData, 1000);
-
-// Fetch data initially
-window.onload = () => {
-    fetchMonsterData();
-};
+// Patch the tables from the event stream instead of polling every second
+subscribeToEvents({
+    'monster-spawned': monster => applyMonsterEvent(monster, false),
+    'monster-updated': monster => applyMonsterEvent(monster, false),
+    'monster-died': monster => applyMonsterEvent(monster, true)
+}, fetchMonsterData);
 
 // Add event listeners to buttons
 document.getElementById('apply-filters').addEventListener('click', applyFilters);
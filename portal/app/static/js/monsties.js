@@ -130,10 +130,14 @@ document.getElementById('create-deployment').addEventListener('click', async ()
     }
 });
 
-setInterval(fetchDeploymentsAndPods, 1000);
-setInterval(fetchMonsties, 1000);
-
-window.onload = () => {
+// Refetch only when the portal reports a change to the Deployments, Pods or monsters
+const refreshMonsties = coalesce(fetchMonsties);
+subscribeToEvents({
+    'monsties': coalesce(fetchDeploymentsAndPods),
+    'monster-spawned': refreshMonsties,
+    'monster-updated': refreshMonsties,
+    'monster-died': refreshMonsties
+}, () => {
     fetchDeploymentsAndPods();
     fetchMonsties();
-};
+});
@@ -99,6 +99,10 @@ function updatePlayerInfo(playerInfo) {
     populateSection(modifierKeys, playerInfo, modifiersDiv);
 }
 
-// Fetch and update data every second
-setInterval(fetchPlayerData, 1000);
-window.onload = fetchPlayerData;
+// Refetch player data only when the portal reports a change
+const refreshPlayerData = coalesce(fetchPlayerData);
+subscribeToEvents({
+    player: refreshPlayerData,
+    items: refreshPlayerData,
+    pack: refreshPlayerData
+}, fetchPlayerData);
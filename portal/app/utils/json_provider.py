@@ -0,0 +1,130 @@
+"""
+This module defines the `PortalJSONProvider` class, the Flask JSON provider of the portal. It
+parses request bodies and encodes responses (`request.json`, `jsonify`, `app.json.dumps`) with
+orjson when it is installed, and with the standard library otherwise.
+
+Both encoders emit the same documents:
+- Datetimes are written as ISO 8601 strings (the format the list endpoints accept in their time
+  filters), instead of Flask's default HTTP dates.
+- Pydantic models are written as their `model_dump()`.
+
+orjson is optional. Without it, `ORJSON_AVAILABLE` is False and the provider behaves like Flask's
+default one apart from the two points above.
+
+Returns:
+    None: This module does not return any values.
+"""
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+class PortalJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, with a standard library fallback.
+
+    Attributes:
+        use_orjson (bool): Whether orjson encodes and decodes the documents.
+
+    Methods:
+        dumps: Serialize data as JSON.
+        loads: Deserialize data as JSON.
+        response: Build a JSON response.
+    """
+
+    use_orjson = ORJSON_AVAILABLE
+
+    @staticmethod
+    def default(o):
+        """
+        Convert the values the encoders do not support natively.
+
+        Args:
+            o: The value to convert.
+
+        Returns:
+            The JSON-serializable form of the value.
+
+        Raises:
+            TypeError: If the value is not JSON serializable.
+        """
+        if isinstance(o, BaseModel):
+            return o.model_dump()
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj: The data to serialize.
+            **kwargs: Arguments for `json.dumps`. Any argument makes the standard library encode
+                the data.
+
+        Returns:
+            str: The JSON document.
+        """
+        if self.use_orjson and not kwargs:
+            try:
+                return self._encode(obj, False).decode()
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits: let the standard library try
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s (str | bytes): The JSON document.
+            **kwargs: Arguments for `json.loads`. Any argument makes the standard library decode
+                the document.
+
+        Returns:
+            The deserialized data.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize the arguments as JSON and wrap them in a response, like `flask.jsonify`.
+
+        Returns:
+            Response: The JSON response, indented in debug mode unless `compact` is set.
+        """
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        try:
+            body = self._encode(obj, pretty)
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _encode(self, obj, pretty: bool) -> bytes:
+        """
+        Encode data with orjson, with the options matching the provider's settings.
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
@@ -0,0 +1,26 @@
+"""
+This package defines the configuration classes of the portal, one per `FLASK_CONFIG` value.
+
+Returns:
+    None: This package does not return any values.
+"""
+from werkzeug.utils import import_string
+
+CONFIGS = {
+    "development": "config.development.DevelopmentConfig",
+    "production": "config.production.ProductionConfig",
+    "default": "config.default.Config",
+}
+
+
+def load_config(name: str = None) -> type:
+    """
+    Get the configuration class for a `FLASK_CONFIG` value.
+
+    Args:
+        name (str): The configuration name. Unknown names and None use the default configuration.
+
+    Returns:
+        type: The configuration class.
+    """
+    return import_string(CONFIGS.get(name, CONFIGS["default"]))
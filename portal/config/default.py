@@ -13,3 +13,73 @@ class Config:
 
     PROMETHEUS_METRICS_PATH = "/metrics"
     PROMETHEUS_PORT = 5000
+
+    # Seconds to wait for queued Monster resource writes to drain on shutdown, and for the write
+    # being applied to finish on game reset
+    MONSTER_SYNC_SHUTDOWN_TIMEOUT = int(os.getenv("MONSTER_SYNC_SHUTDOWN_TIMEOUT", "10"))
+
+    # Attempts of a Monster resource write failing with a transient API error, and the seconds
+    # before the first retry (doubled before every following one)
+    MONSTER_SYNC_RETRY_ATTEMPTS = int(os.getenv("MONSTER_SYNC_RETRY_ATTEMPTS", "5"))
+    MONSTER_SYNC_RETRY_BACKOFF_SECONDS = float(
+        os.getenv("MONSTER_SYNC_RETRY_BACKOFF_SECONDS", "0.5")
+    )
+
+    # Keep a watch-backed local cache of Monster resources so reads make no API calls
+    MONSTER_CR_CACHE_ENABLED = os.getenv("MONSTER_CR_CACHE_ENABLED", "false").lower() == "true"
+
+    # Largest page size accepted by the paginated monster list endpoints
+    MONSTER_PAGE_MAX_LIMIT = int(os.getenv("MONSTER_PAGE_MAX_LIMIT", "1000"))
+
+    # Keep the encoded body of the main read endpoints until their data changes
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+
+    # Skip ingest payloads identical to the last one their route accepted
+    INGEST_DEDUP_ENABLED = os.getenv("INGEST_DEDUP_ENABLED", "true").lower() == "true"
+
+    # Server-Sent Events stream: keep-alive interval and per-dashboard queue size
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+    # Each open stream holds a server thread: streams served at once per worker (keep it below
+    # SERVER_THREADS so ingest requests always find a thread), and the seconds before a stream is
+    # closed for the browser to reconnect
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "4"))
+    EVENTS_STREAM_MAX_SECONDS = int(os.getenv("EVENTS_STREAM_MAX_SECONDS", "300"))
+    # With a shared STATE_BACKEND: how often a worker with dashboards reads the backend's event
+    # log, and how long the other workers keep appending events after it last said it listens
+    EVENTS_POLL_SECONDS = float(os.getenv("EVENTS_POLL_SECONDS", "0.2"))
+    EVENTS_LISTENER_TTL_SECONDS = float(os.getenv("EVENTS_LISTENER_TTL_SECONDS", "30"))
+
+    # Dead monsters kept in memory (0 for no limit); older ones are compacted into running totals
+    DEAD_MONSTER_MAX_COUNT = int(os.getenv("DEAD_MONSTER_MAX_COUNT", "5000"))
+    DEAD_MONSTER_MAX_AGE_SECONDS = int(os.getenv("DEAD_MONSTER_MAX_AGE_SECONDS", "3600"))
+    # Evicted monster IDs remembered so late game updates do not bring those monsters back
+    DEAD_MONSTER_MAX_EVICTED_IDS = int(os.getenv("DEAD_MONSTER_MAX_EVICTED_IDS", "10000"))
+
+    # Largest number of depth and type label values of the labeled monster metrics; the other
+    # depths and types are reported under the "other" label value
+    METRICS_MAX_DEPTH_LABELS = int(os.getenv("METRICS_MAX_DEPTH_LABELS", "40"))
+    METRICS_MAX_TYPE_LABELS = int(os.getenv("METRICS_MAX_TYPE_LABELS", "25"))
+
+    # Where the game state is kept: "memory" (one worker only) or "sqlite" (a WAL database
+    # shared by every worker that opens STATE_SQLITE_PATH). SQLite WAL only works between
+    # processes on one host, so it shares the state between the workers of one Pod, not between
+    # portal replicas.
+    STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+    STATE_SQLITE_PATH = os.getenv("STATE_SQLITE_PATH", "/tmp/portal-state.db")
+
+    # Largest request body accepted, in bytes (Flask answers larger requests with 413)
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(8 * 1024 * 1024)))
+
+    # Production server (gunicorn with gthread workers, see gunicorn.conf.py). More than one worker
+    # needs a shared STATE_BACKEND.
+    ALLOW_DEV_SERVER = True
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("PORT", "5000"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+    # Each open dashboard event stream holds a thread, up to EVENTS_MAX_STREAMS per worker
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", "8"))
+    SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "5"))
+    SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "30"))
+    SERVER_LIMIT_REQUEST_LINE = int(os.getenv("SERVER_LIMIT_REQUEST_LINE", "4094"))
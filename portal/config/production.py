@@ -1,3 +1,4 @@
+import os
 from config.default import Config
 
 class ProductionConfig(Config):
@@ -6,3 +7,11 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     PROMETHEUS_PORT = 5000
+
+    ALLOW_DEV_SERVER = False
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", "16"))
+    # Half of the threads at most serve dashboard event streams; the rest stay free for ingest
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "8"))
+    # Longer than the 60 second idle timeout of common proxies, so they close idle connections
+    # first and never send a request on a connection the portal is closing
+    SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "75"))
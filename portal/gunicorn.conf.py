@@ -0,0 +1,61 @@
+"""
+Gunicorn configuration for the portal's production server:
+
+    gunicorn -c gunicorn.conf.py run:app
+
+The server settings come from the configuration class selected by `FLASK_CONFIG` (see `config/`),
+so they are tuned in the same place as the app and can be overridden with the same environment
+variables (SERVER_WORKERS, SERVER_THREADS, SERVER_KEEPALIVE, SERVER_BACKLOG, ...).
+
+Workers use the gthread worker class: each worker serves `SERVER_THREADS` requests at once, and
+idle keep-alive connections wait in the worker's event loop without holding a thread.
+
+Returns:
+    None: This module does not return any values.
+"""
+import os
+import tempfile
+from config import load_config
+
+_config = load_config(os.getenv("FLASK_CONFIG", "production"))
+
+bind = f"{_config.SERVER_HOST}:{_config.SERVER_PORT}"
+worker_class = "gthread"
+workers = _config.SERVER_WORKERS
+threads = _config.SERVER_THREADS
+keepalive = _config.SERVER_KEEPALIVE
+backlog = _config.SERVER_BACKLOG
+timeout = _config.SERVER_TIMEOUT
+limit_request_line = _config.SERVER_LIMIT_REQUEST_LINE
+# Leave time for the queued Monster resource writes to drain on shutdown
+graceful_timeout = _config.MONSTER_SYNC_SHUTDOWN_TIMEOUT + 5
+accesslog = "-"
+errorlog = "-"
+
+if workers > 1:
+    # Every worker writes its metrics to this directory so /metrics can aggregate them. It must
+    # be set before prometheus_client is imported, so before any worker loads the app.
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="portal-prometheus-")
+    )
+
+
+def on_starting(server):
+    """
+    Refuse to start several workers that would each keep their own copy of the game state. With a
+    shared backend, the workers also share the dashboard events through its event log.
+    """
+    if workers > 1 and _config.STATE_BACKEND == "memory":
+        raise RuntimeError(
+            "SERVER_WORKERS > 1 needs a shared STATE_BACKEND (e.g. sqlite); "
+            "use SERVER_THREADS to serve more requests from one worker."
+        )
+
+
+def child_exit(server, worker):
+    """
+    Drop the live gauges of a worker that exited from the aggregated metrics.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess  # pylint: disable=import-outside-toplevel
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,7 +1,8 @@
-from app import create_app
+from app import create_app, check_dev_server
 
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
-
+    # Production serves `run:app` with gunicorn (see gunicorn.conf.py)
+    check_dev_server(app)
+    app.run(host="0.0.0.0", port=app.config["SERVER_PORT"], debug=True)
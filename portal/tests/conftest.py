@@ -1,11 +1,28 @@
+from unittest import mock
 import pytest
 from app import create_app
+from app.services import state_backend
+from app.services.state_backend import MemoryBackend
+
 
 @pytest.fixture
 def app():
-    # Create a test instance of the Flask app
-    app = create_app(config_name="development")
-    yield app  # This ensures the app is available for the client fixture
+    # The routes build their Kubernetes API clients when they are imported; no test reaches a
+    # cluster, so loading the cluster configuration is skipped
+    with mock.patch("kubernetes.config.load_incluster_config"), \
+            mock.patch("kubernetes.config.load_kube_config"):
+        app = create_app(config_name="development")
+
+    from app.routes import monsters
+    previous = state_backend.get_backend()
+    state_backend.set_backend(MemoryBackend())
+    monsters.monster_registry.clear()
+    # Monster resource writes go to a mock instead of the API server
+    with mock.patch.object(monsters, "k8s_service"), \
+            mock.patch.object(monsters.monster_sync, "k8s_service"):
+        yield app  # This ensures the app is available for the client fixture
+        monsters.monster_sync.flush(timeout=5)
+    state_backend.set_backend(previous)
 
 @pytest.fixture
 def client(app):
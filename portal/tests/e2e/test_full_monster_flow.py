@@ -23,7 +23,7 @@ Yields:
 """
 import pytest
 from app import create_app
-from app.routes.monsters import active_monsters
+from app.routes.monsters import monster_registry
 
 
 @pytest.fixture
@@ -66,7 +66,7 @@ def reset_monsters_data():
     This fixture automatically clears the monsters data in memory before
     each test is run to ensure that each test starts with a clean state.
     """
-    active_monsters.clear()
+    monster_registry.clear()
 
 
 def test_monster_creation_flow(test_client):
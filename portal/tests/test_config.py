@@ -0,0 +1,25 @@
+"""
+Tests for the configuration classes and the development server check.
+"""
+import pytest
+from flask import Flask
+from app import check_dev_server
+from config import load_config
+from config.default import Config
+from config.production import ProductionConfig
+
+
+def test_unknown_config_names_use_the_default_config():
+    assert load_config("production") is ProductionConfig
+    assert load_config(None) is Config
+    assert load_config("staging") is Config
+
+
+def test_production_refuses_the_development_server():
+    app = Flask(__name__)
+    app.config.from_object(load_config("development"))
+    check_dev_server(app)
+
+    app.config.from_object(load_config("production"))
+    with pytest.raises(RuntimeError):
+        check_dev_server(app)
@@ -0,0 +1,75 @@
+"""
+Tests for the delta ingest protocol: sequence ordering, field merging, the delta models and the
+atomic sequence map.
+"""
+import pytest
+from pydantic import ValidationError
+from app.models.delta import Delta, DeltaEntry, ResyncSequences
+from app.services import state_backend
+from app.services.delta import follow_sequence, merge_fields
+from app.services.state import SequenceMap
+from app.services.state_backend import MemoryBackend, SQLiteBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    backend = MemoryBackend() if request.param == "memory" \
+        else SQLiteBackend(str(tmp_path / "state.db"))
+    previous = state_backend.get_backend()
+    state_backend.set_backend(backend)
+    yield backend
+    state_backend.set_backend(previous)
+
+
+def entries(*sequences):
+    return [DeltaEntry(seq=seq, fields={"hp": seq, "position": {"x": seq}}) for seq in sequences]
+
+
+def test_nested_fields_are_merged_one_level_deep():
+    base = {"hp": 5, "position": {"x": 1, "y": 2}, "slot": {"kind": "sword"}}
+
+    merged = merge_fields(base, {"position": {"x": 4}, "slot": None, "hp": 3})
+
+    assert merged == {"hp": 3, "position": {"x": 4, "y": 2}, "slot": None}
+    assert base["position"] == {"x": 1, "y": 2}
+
+
+def test_out_of_order_entries_are_applied_in_sequence():
+    sequence, fields, stale, gap = follow_sequence(entries(7, 5, 6, 4), last=4)
+
+    assert (sequence, stale, gap) == (7, [4], False)
+    assert fields == {"hp": 7, "position": {"x": 7}}
+
+
+def test_a_gap_stops_the_run():
+    sequence, fields, stale, gap = follow_sequence(entries(5, 7), last=4)
+    assert (sequence, fields["hp"], gap) == (5, 5, True)
+
+    assert follow_sequence(entries(6), last=4) == (None, {}, [], True)
+    assert follow_sequence(entries(3, 4), last=4) == (None, {}, [3, 4], False)
+
+
+def test_entities_without_a_baseline_need_a_resync():
+    assert follow_sequence(entries(1), last=None) == (None, {}, [], True)
+
+
+def test_delta_models():
+    delta = Delta(player={"seq": 3, "fields": {"gold": 1}},
+                  monsters=[{"id": 7, "seq": 1, "fields": {}}])
+    assert [entry.seq for entry in delta.player] == [3]
+
+    with pytest.raises(ValidationError):
+        Delta(monsters=[{"seq": 1, "fields": {}}])
+    with pytest.raises(ValidationError):
+        Delta(items={"seq": 1, "fields": {}})
+    assert ResyncSequences(player=2, monsters={"7": 40}).monsters == {7: 40}
+
+
+def test_sequences_only_advance_from_the_expected_value(backend):
+    sequences = SequenceMap("test-sequences")
+    sequences.update({"player": 4})
+
+    advanced = sequences.advance({"player": (4, 6), "pack": (None, 1), "gamestate": (2, 3)})
+    assert advanced == {"player", "pack"}
+    assert sequences.advance({"player": (4, 5)}) == set()
+    assert sequences.snapshot() == {"player": 6, "pack": 1}
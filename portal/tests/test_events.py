@@ -0,0 +1,111 @@
+"""
+Tests for the `EventBroker` that feeds the `/events` Server-Sent Events stream.
+"""
+from unittest import mock
+import pytest
+from app.services import state_backend
+from app.services.events import EventBroker
+from app.services.state_backend import SQLiteBackend
+
+
+def test_payload_is_only_built_when_someone_listens():
+    broker = EventBroker()
+    calls = []
+
+    broker.publish("player", lambda: calls.append(1) or {})
+    assert calls == []
+
+    subscription = broker.subscribe()
+    broker.publish("monster-died", lambda: calls.append(1) or {"id": 7})
+
+    assert calls == [1]
+    message = subscription.get(timeout=1)
+    assert "event: monster-died\n" in message
+    assert 'data: {"id": 7}\n\n' in message
+
+
+def test_overflowing_subscriber_is_asked_to_resync():
+    broker = EventBroker(max_queued=2)
+    subscription = broker.subscribe()
+
+    for _ in range(3):
+        broker.publish("player")
+
+    assert "event: resync\n" in subscription.get(timeout=1)
+    assert subscription.get(timeout=0.01) is None
+
+    broker.unsubscribe(subscription)
+    assert not broker.has_subscribers()
+
+
+@pytest.fixture
+def shared(tmp_path):
+    # Two workers sharing one SQLite file, each with its own broker
+    path = str(tmp_path / "state.db")
+    return [EventBroker(poll_interval=0.05, backend=SQLiteBackend(path)) for _ in range(2)]
+
+
+def test_events_reach_the_dashboards_of_every_worker(shared):
+    publisher, listener = shared
+    publisher.publish("player")
+    subscription = listener.subscribe()
+
+    publisher.publish("monster-died", lambda: {"id": 7})
+    publisher.publish("gamestate")
+
+    message = subscription.get(timeout=2)
+    assert "event: monster-died\n" in message and 'data: {"id": 7}\n\n' in message
+    assert "event: gamestate\n" in subscription.get(timeout=2)
+    # The event published before anyone listened was not even appended
+    assert subscription.get(timeout=0.2) is None
+    assert publisher.backend.event_latest() == 2
+
+
+def test_nothing_is_appended_without_listeners(shared):
+    publisher, _ = shared
+    calls = []
+
+    publisher.publish("monster-died", lambda: calls.append(1) or {})
+
+    assert calls == [] and publisher.backend.event_latest() == 0
+
+
+def test_a_worker_behind_the_trimmed_log_resyncs(shared):
+    publisher, listener = shared
+    listener.poll_interval = 60
+    subscription = listener.subscribe()
+
+    with mock.patch.object(state_backend, "EVENT_LOG_SIZE", 2):
+        for _ in range(4):
+            publisher.publish("player")
+    listener._wake.set()  # pylint: disable=protected-access
+
+    assert "event: resync\n" in subscription.get(timeout=2)
+    assert "id: 3\nevent: player\n" in subscription.get(timeout=2)
+    assert "id: 4\nevent: player\n" in subscription.get(timeout=2)
+
+
+def test_a_worker_serves_a_limited_number_of_streams(app, client):
+    from app.services.events import event_broker
+    app.config["EVENTS_MAX_STREAMS"] = 1
+    event_broker.init_app(app)
+
+    first = client.get("/events", buffered=False)
+    refused = client.get("/events", buffered=False)
+    assert first.status_code == 200
+    assert refused.status_code == 503 and refused.headers["Retry-After"] == "10"
+    refused.close()
+
+    first.close()
+    again = client.get("/events", buffered=False)
+    assert again.status_code == 200
+    again.close()
+    assert not event_broker.has_subscribers()
+
+
+def test_streams_are_closed_after_their_lifetime(app, client):
+    app.config["EVENTS_STREAM_MAX_SECONDS"] = 0.1
+
+    response = client.get("/events")
+
+    assert response.get_data(as_text=True) == "retry: 3000\n\n"
@@ -0,0 +1,173 @@
+"""
+Tests for the /ingest/tick endpoint, which stores a combined game snapshot.
+"""
+import threading
+import time
+from unittest import mock
+from app.services import state_backend
+from app.services.state_backend import SQLiteBackend
+from tests.test_monster_validation import payload
+
+PLAYER = {
+    "gold": 10, "depth_level": 2, "deepest_level": 3, "current_hp": 20, "max_hp": 40,
+    "strength": 12, "player_turn_number": 100, "xpxp_this_turn": 0, "stealth_range": 14,
+    "disturbed": False, "regen_per_turn": 1, "weakness_amount": 0, "poison_amount": 0,
+    "clairvoyance": 0, "stealth_bonus": 0, "regeneration_bonus": 0, "light_multiplier": 1,
+    "awareness_bonus": 0, "transference": 0, "wisdom_bonus": 0, "reaping": 0,
+}
+
+
+def tick(**sections):
+    data = {
+        "player": PLAYER,
+        "monsters": [payload(1), payload(2)],
+        "gamestate": {"current_depth": 2, "absolute_turn_number": 100},
+        "gamestats": {"games_played": 4},
+    }
+    data.update(sections)
+    return data
+
+
+def test_a_full_tick_stores_every_section(client):
+    response = client.post("/ingest/tick", json=tick())
+
+    assert response.status_code == 200
+    assert response.get_json()["sections"] == ["player", "monsters", "gamestate", "gamestats"]
+    assert client.get("/player/data").get_json()["gold"] == 10
+    assert [m["id"] for m in client.get("/monsters/active").get_json()] == [1, 2]
+    assert client.get("/gamestate/data").get_json()["current_depth"] == 2
+    assert client.get("/gamestats/data").get_json()["games_played"] == 4
+
+
+def test_a_partial_tick_only_stores_its_sections(client):
+    client.post("/ingest/tick", json=tick())
+
+    response = client.post("/ingest/tick", json={"player": {**PLAYER, "gold": 25}})
+
+    assert response.get_json()["sections"] == ["player"]
+    assert client.get("/player/data").get_json()["gold"] == 25
+    assert client.get("/gamestate/data").get_json()["current_depth"] == 2
+    assert len(client.get("/monsters/active").get_json()) == 2
+
+
+def test_an_invalid_section_rejects_the_whole_tick(client):
+    response = client.post("/ingest/tick", json=tick(gamestats={"games_played": "many"}))
+
+    assert response.status_code == 400
+    assert list(response.get_json()["sections"]) == ["gamestats"]
+    assert client.get("/player/data").get_json() == {}
+    assert client.get("/monsters/active").get_json() == []
+    assert client.get("/gamestate/data").status_code == 404
+
+    response = client.post("/ingest/tick", json={"player": PLAYER, "score": 1})
+    assert response.status_code == 400
+    assert response.get_json()["sections"] == ["score"]
+
+
+def test_other_workers_see_all_of_a_tick_or_none_of_it(client, tmp_path):
+    from app.routes import ingest
+    state_backend.set_backend(SQLiteBackend(str(tmp_path / "state.db")))
+    other_worker = SQLiteBackend(str(tmp_path / "state.db"))
+    seen = []
+
+    def apply_section(section, validated):
+        apply(section, validated)
+        seen.append((other_worker.map_snapshot("player"),
+                     other_worker.counters(["version:gamestate"])["version:gamestate"]))
+
+    apply = ingest._apply_section
+    with mock.patch.object(ingest, "_apply_section", apply_section):
+        assert client.post("/ingest/tick", json=tick()).status_code == 200
+
+    assert seen == [(None, 0)] * 4
+    assert other_worker.map_snapshot("player")["gold"] == 10
+    assert other_worker.counters(["version:gamestate"])["version:gamestate"] == 1
+
+
+def test_deltas_follow_the_resynced_sequences(client):
+    response = client.post("/ingest/resync", json={
+        "player": PLAYER, "monsters": [payload(1), payload(2)],
+        "seq": {"player": 1, "monsters": {"1": 1, "2": 1}},
+    })
+    assert response.status_code == 200
+
+    response = client.post("/ingest/delta", json={
+        "player": [{"seq": 3, "fields": {"current_hp": 15}}, {"seq": 2, "fields": {"gold": 30}}],
+        "monsters": [{"id": 1, "seq": 2, "fields": {"hp": 1}}, {"id": 2, "seq": 3, "fields": {}},
+                     {"id": 3, "seq": 1, "fields": {}}],
+    })
+
+    body = response.get_json()
+    assert body["applied"] == ["player", "monsters/1"]
+    assert body["resync"] == ["monsters/2", "monsters/3"]
+    player = client.get("/player/data").get_json()
+    assert (player["gold"], player["current_hp"]) == (30, 15)
+    assert {m["id"]: m["hp"] for m in client.get("/monsters/active").get_json()}[1] == 1
+
+
+def test_concurrent_deltas_are_merged_one_after_the_other(app, client):
+    from app.routes import ingest
+    client.post("/ingest/resync", json={"player": PLAYER, "seq": {"player": 1}})
+    merge, other = ingest._merge_document, []
+
+    def merge_document(section, fields):
+        if not other:
+            # A delta for the same entity arrives while this one is being merged
+            other.append(threading.Thread(target=lambda: other.append(
+                app.test_client().post("/ingest/delta", json={"player": [
+                    {"seq": 2, "fields": {"gold": 99}}, {"seq": 3, "fields": {"current_hp": 5}},
+                ]}).get_json())))
+            other[0].start()
+            time.sleep(0.1)
+        return merge(section, fields)
+
+    with mock.patch.object(ingest, "_merge_document", merge_document):
+        first = client.post("/ingest/delta", json={"player": {"seq": 2, "fields": {"gold": 50}}})
+        other[0].join(timeout=5)
+
+    assert first.get_json()["applied"] == ["player"]
+    assert other[1]["stale"] == [{"entity": "player", "seq": 2}]
+    assert other[1]["applied"] == ["player"]
+    player = client.get("/player/data").get_json()
+    assert (player["gold"], player["current_hp"]) == (50, 5)
+
+
+def test_a_tick_after_an_admin_kill_does_not_bring_the_monster_back(client):
+    from app.routes import monsters
+    service = monsters.monster_sync.k8s_service
+    client.post("/ingest/tick", json=tick())
+    assert client.get("/monsters/admin-kill/1").status_code == 200
+    monsters.monster_sync.flush(timeout=5)
+
+    # The game has not seen the kill yet and still reports the monster alive
+    assert client.post("/ingest/tick", json=tick()).status_code == 200
+    monsters.monster_sync.flush(timeout=5)
+
+    assert service.delete_monster_resource.call_args.kwargs["name"] == payload(1)["name"]
+    assert [call.kwargs["name"] for call in service.update_monster_resource.call_args_list] == \
+        [payload(2)["name"]]
+    assert service.create_monster_resource.call_count == 2
+
+
+def test_monster_deltas_only_validate_the_changed_fields(client):
+    client.post("/ingest/resync", json={"monsters": [payload(1), payload(2)],
+                                        "seq": {"monsters": {"1": 1, "2": 1}}})
+
+    response = client.post("/ingest/delta", json={"monsters": [
+        {"id": 1, "seq": 2, "fields": {"hp": "many"}},
+        {"id": 2, "seq": 2, "fields": {"position": {"x": 9}}},
+    ]})
+    assert response.status_code == 400
+    assert list(response.get_json()["entities"]) == ["monsters/1"]
+
+    response = client.post("/ingest/delta", json={"monsters": [
+        {"id": 2, "seq": 2, "fields": {"position": {"x": 9}}},
+        {"id": 1, "seq": 2, "fields": {"id": 5}},
+    ]})
+    assert response.get_json()["entities"] == {"monsters/1": "Unknown fields: id"}
+
+    client.post("/ingest/delta", json={"monsters": [
+        {"id": 2, "seq": 2, "fields": {"position": {"x": 9}}},
+    ]})
+    monster = {m["id"]: m for m in client.get("/monsters/active").get_json()}[2]
+    assert monster["position"] == {"x": 9, "y": payload(2)["position"]["y"]}
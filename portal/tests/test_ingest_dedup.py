@@ -0,0 +1,112 @@
+"""
+Tests for the `deduplicated` decorator that skips unchanged ingest payloads.
+"""
+import pytest
+from flask import Flask, jsonify, request
+from app.services import state_backend
+from app.services.ingest_dedup import ingest_dedup, deduplicated, TICK
+from app.services.state import SnapshotDict
+from app.services.state_backend import MemoryBackend, SQLiteBackend
+from app.services.versions import store_versions, PLAYER, PACK
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    backend = MemoryBackend() if request.param == "memory" \
+        else SQLiteBackend(str(tmp_path / "state.db"))
+    previous = state_backend.get_backend()
+    state_backend.set_backend(backend)
+    yield backend
+    state_backend.set_backend(previous)
+
+
+def make_client(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    player = SnapshotDict("player")
+    calls = []
+
+    @app.route("/update", methods=["POST"])
+    @deduplicated(PLAYER)
+    def update():
+        calls.append(request.json)
+        if "hp" not in request.json:
+            return jsonify({"error": "hp is required"}), 400
+        player.update(request.json)
+        store_versions.bump(PLAYER)
+        return jsonify({"status": "success"}), 200
+
+    @app.route("/tick", methods=["POST"])
+    @deduplicated(TICK, PLAYER, PACK)
+    def tick():
+        calls.append(request.json)
+        store_versions.bump(PLAYER)
+        return jsonify({"status": "success"})
+
+    return app.test_client(), player, calls
+
+
+def test_unchanged_payloads_are_skipped_and_counted(backend):
+    client, player, calls = make_client()
+
+    for _ in range(3):
+        response = client.post("/update", json={"hp": 10})
+        assert response.status_code == 200
+    client.post("/update", json={"hp": 9})
+    response = client.post("/update", json={"hp": 9})
+
+    assert response.get_json()["message"] == "payload unchanged"
+    assert calls == [{"hp": 10}, {"hp": 9}]
+    assert player["hp"] == 9
+    assert ingest_dedup.counts()[PLAYER] == 3
+
+
+def test_other_writes_to_the_store_invalidate_the_last_payload(backend):
+    client, player, calls = make_client()
+    client.post("/update", json={"hp": 10})
+
+    # e.g. a game reset or the tick route writing the player
+    player.clear()
+    store_versions.bump(PLAYER)
+    client.post("/update", json={"hp": 10})
+    client.post("/tick", json={"player": {"hp": 10}})
+    client.post("/update", json={"hp": 10})
+
+    assert len(calls) == 4
+    assert player["hp"] == 10
+    assert ingest_dedup.counts()[PLAYER] == 0
+
+
+def test_rejected_payloads_are_not_recorded(backend):
+    client, _, calls = make_client()
+
+    for _ in range(2):
+        assert client.post("/update", json={"gold": 1}).status_code == 400
+
+    assert len(calls) == 2
+
+
+def test_payloads_are_not_recorded_when_another_write_interleaves(backend):
+    client, _, calls = make_client()
+
+    @client.application.route("/racing", methods=["POST"])
+    @deduplicated(PLAYER)
+    def racing():
+        calls.append(request.json)
+        store_versions.bump(PLAYER)
+        store_versions.bump(PLAYER)  # another worker's write landed at the same time
+        return jsonify({"status": "success"})
+
+    client.post("/racing", json={"hp": 10})
+    client.post("/racing", json={"hp": 10})
+
+    assert len(calls) == 2
+
+
+def test_dedup_can_be_disabled(backend):
+    client, _, calls = make_client(INGEST_DEDUP_ENABLED=False)
+
+    client.post("/update", json={"hp": 10})
+    client.post("/update", json={"hp": 10})
+
+    assert len(calls) == 2
@@ -0,0 +1,66 @@
+"""
+Tests for the portal's JSON provider, with orjson and with the standard library fallback.
+"""
+from datetime import datetime, timezone
+import pytest
+from flask import Flask, jsonify, request
+from app.utils.json_provider import ORJSON_AVAILABLE, PortalJSONProvider
+from tests.test_monster_registry import monster
+
+ENCODERS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not ORJSON_AVAILABLE, reason="orjson is not installed"))]
+
+
+def make_app(use_orjson: bool) -> Flask:
+    app = Flask(__name__)
+    app.json = PortalJSONProvider(app)
+    app.json.use_orjson = use_orjson
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify(request.json)
+
+    return app
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_datetimes_and_models_are_encoded_natively(use_orjson):
+    app = make_app(use_orjson)
+    spawned = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    model = monster(3)
+    data = {"b": spawned, "a": datetime(2024, 5, 1, tzinfo=timezone.utc), "m": model}
+
+    with app.app_context():
+        document = app.json.loads(app.json.dumps(data))
+        body = jsonify(data).get_data()
+
+    assert list(document) == ["a", "b", "m"]
+    assert document["b"] == "2024-05-01T12:30:15.250000"
+    assert document["a"] == "2024-05-01T00:00:00+00:00"
+    assert document["m"]["name"] == model.name
+    assert document["m"]["spawn_timestamp"] == model.spawn_timestamp.isoformat()
+    assert app.json.loads(body) == document
+
+
+def test_both_encoders_emit_the_same_document():
+    if not ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    data = {"monsters": [monster(1), monster(2).model_dump()], "big": 2 ** 70, "none": None}
+    documents = []
+    for use_orjson in (True, False):
+        app = make_app(use_orjson)
+        with app.app_context():
+            documents.append(jsonify(data).get_data())
+
+    assert documents[0] == documents[1]
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_request_bodies_are_parsed(use_orjson):
+    client = make_app(use_orjson).test_client()
+
+    response = client.post("/echo", json={"hp": 5, "names": ["rat"]})
+    assert response.get_json() == {"hp": 5, "names": ["rat"]}
+
+    response = client.post("/echo", data="{not json", content_type="application/json")
+    assert response.status_code == 400
@@ -0,0 +1,129 @@
+"""
+Tests for the Monster resource writes and the reset delete of `KubernetesService`, against a
+mocked CustomObjectsApi.
+"""
+import threading
+import time
+from unittest import mock
+import pytest
+from flask import Flask
+from kubernetes.client.rest import ApiException
+from app.services.k8s_service import KubernetesService, MANAGED_BY_LABEL, MANAGED_BY_VALUE
+
+NAMESPACE = "dungeon-master-system"
+
+
+@pytest.fixture
+def service():
+    with mock.patch("app.services.k8s_service.get_api_client"), \
+            mock.patch("app.services.k8s_service.client.CustomObjectsApi"), \
+            Flask(__name__).app_context():
+        yield KubernetesService(write_mode="patch")
+
+
+def monster_data(**fields):
+    data = {"id": 7, "name": "rat-7", "hp": 5, "max_hp": 10, "is_dead": False,
+            "death_timestamp": None, "position": {"x": 1, "y": 2}}
+    data.update(fields)
+    return data
+
+
+def test_updates_are_merge_patches_without_null_fields(service):
+    service.update_monster_resource("rat-7", NAMESPACE, monster_data())
+
+    body = service.api.patch_namespaced_custom_object.call_args.kwargs["body"]
+    assert body["spec"]["hp"] == 5
+    assert body["spec"]["position"] == {"x": 1, "y": 2}
+    assert "deathTimestamp" not in body["spec"] and "podName" not in body["spec"]
+    service.api.get_namespaced_custom_object.assert_not_called()
+    service.api.create_namespaced_custom_object.assert_not_called()
+
+
+def test_an_update_of_a_missing_resource_is_skipped(service):
+    # E.g. an admin-killed monster whose resource was deleted, still reported alive by the game
+    service.api.patch_namespaced_custom_object.side_effect = ApiException(status=404)
+
+    service.update_monster_resource("rat-7", NAMESPACE, monster_data(hp=3))
+
+    service.api.create_namespaced_custom_object.assert_not_called()
+
+
+def test_a_create_of_an_existing_resource_is_not_an_error(service):
+    service.api.create_namespaced_custom_object.side_effect = ApiException(status=409)
+    service.create_monster_resource("rat-7", NAMESPACE, monster_data())
+
+    body = service.api.create_namespaced_custom_object.call_args.kwargs["body"]
+    assert body["metadata"]["name"] == "rat-7"
+    assert body["metadata"]["labels"][MANAGED_BY_LABEL] == MANAGED_BY_VALUE
+    service.api.get_namespaced_custom_object.assert_not_called()
+
+
+def test_other_api_errors_are_raised(service):
+    service.api.patch_namespaced_custom_object.side_effect = ApiException(status=500)
+    with pytest.raises(ApiException):
+        service.update_monster_resource("rat-7", NAMESPACE, monster_data())
+
+    service.api.create_namespaced_custom_object.side_effect = ApiException(status=422)
+    with pytest.raises(RuntimeError):
+        service.create_monster_resource("rat-7", NAMESPACE, monster_data())
+
+
+def resource(name, labeled=True, terminating=False):
+    metadata = {"name": name, "labels": {MANAGED_BY_LABEL: MANAGED_BY_VALUE} if labeled else {}}
+    if terminating:
+        metadata["deletionTimestamp"] = "2024-05-01T00:00:00Z"
+    return {"metadata": metadata}
+
+
+def deleted_names(service):
+    return sorted(call.args[0] if call.args else call.kwargs["name"]
+                  for call in service.api.delete_namespaced_custom_object.call_args_list)
+
+
+def test_reset_deletes_the_labeled_resources_in_one_call(service):
+    service.api.list_namespaced_custom_object.return_value = {"items": [
+        resource("rat-1"), resource("legacy-rat", labeled=False),
+        resource("old-rat", labeled=False, terminating=True),
+    ]}
+
+    service.delete_all_monsters_in_namespace(NAMESPACE)
+
+    selector = service.api.delete_collection_namespaced_custom_object.call_args.kwargs[
+        "label_selector"]
+    assert selector == f"{MANAGED_BY_LABEL}={MANAGED_BY_VALUE}"
+    # Only the resources the collection delete did not cover are deleted one by one
+    assert deleted_names(service) == ["legacy-rat"]
+
+
+def test_reset_falls_back_to_a_bounded_pool_of_single_deletes(service):
+    service.delete_workers = 2
+    names = [f"rat-{index}" for index in range(8)]
+    service.api.delete_collection_namespaced_custom_object.side_effect = ApiException(status=403)
+    service.api.list_namespaced_custom_object.return_value = {
+        "items": [resource(name) for name in names]
+    }
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def delete(**_):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    service.api.delete_namespaced_custom_object.side_effect = delete
+
+    service.delete_all_monsters_in_namespace(NAMESPACE)
+
+    assert deleted_names(service) == sorted(names)
+    assert peak[0] == 2
+
+
+def test_reset_raises_the_first_failed_single_delete(service):
+    service.api.delete_collection_namespaced_custom_object.side_effect = ApiException(status=403)
+    service.api.list_namespaced_custom_object.return_value = {"items": [resource("rat-1")]}
+    service.api.delete_namespaced_custom_object.side_effect = ApiException(status=500)
+
+    with pytest.raises(ApiException):
+        service.delete_all_monsters_in_namespace(NAMESPACE)
@@ -0,0 +1,126 @@
+"""
+Tests for the scrape-time game metrics built by `GameCollector`.
+"""
+from prometheus_client import CollectorRegistry, generate_latest
+from app.services.ingest_dedup import IngestDedup
+from app.services.metrics import GameCollector
+from app.services.monster_registry import MonsterRegistry
+from app.services.state import SnapshotDict
+from tests.test_monster_registry import monster
+
+
+def collector():
+    return GameCollector(SnapshotDict("test-player"), SnapshotDict("test-gamestate"),
+                         SnapshotDict("test-gamestats"), SnapshotDict("test-items"),
+                         MonsterRegistry())
+
+
+def scrape(game_collector) -> dict:
+    registry = CollectorRegistry()
+    registry.register(game_collector)
+    return {
+        sample.name: sample.value
+        for family in registry.collect() for sample in family.samples
+        if not sample.labels or sample.name.endswith("_bucket") and sample.labels["le"] == "60"
+    }
+
+
+def test_values_are_read_from_the_stores_at_scrape_time():
+    game_collector = collector()
+    assert "brogue_player_gold" not in scrape(game_collector)
+
+    game_collector.player.update({"gold": 120, "depth_level": 3})
+    game_collector.game_state.update({"game_has_ended": True})
+    game_collector.equipped_items.update({"weapon": {"damage": {"min": 2, "max": 4}},
+                                          "armor": None})
+    samples = scrape(game_collector)
+
+    assert samples["brogue_player_gold"] == 120
+    assert samples["brogue_depth_level"] == 3
+    assert samples["brogue_game_has_ended"] == 1
+    assert samples["brogue_weapon_damage_max"] == 4
+    assert "brogue_armor_defense" not in samples
+    assert "brogue_games_played" not in samples
+
+    game_collector.player.update({"gold": 130})
+    assert scrape(game_collector)["brogue_player_gold"] == 130
+
+
+def test_monster_metrics_follow_the_registry():
+    game_collector = collector()
+    registry = game_collector.monsters
+    registry.upsert(monster(1))
+    registry.upsert(monster(2))
+    registry.upsert(monster(3))
+    registry.mark_dead(2)
+    registry.mark_dead(3)
+
+    samples = scrape(game_collector)
+
+    assert samples["brogue_monster_count_total"] == 3
+    assert samples["brogue_monster_death_count_total"] == 2
+    assert samples["brogue_monster_lifespan_seconds_count"] == 2
+    assert samples["brogue_monster_lifespan_seconds_bucket"] == 2
+    assert samples["brogue_last_monster_created_timestamp"] == \
+        registry.get(3).spawn_timestamp.timestamp()
+    assert samples["brogue_last_monster_death_timestamp"] == \
+        registry.get(3).death_timestamp.timestamp()
+
+    registry.clear()
+    samples = scrape(game_collector)
+    assert samples["brogue_monster_count_total"] == 0
+    assert "brogue_last_monster_death_timestamp" not in samples
+
+
+def test_metric_names_are_unique():
+    game_collector = collector()
+    game_collector.player.update({"gold": 1})
+    registry = CollectorRegistry()
+    registry.register(game_collector)
+
+    names = [family.name for family in registry.collect()]
+
+    assert len(names) == len(set(names))
+    assert b"brogue_monster_count_total" in generate_latest(registry)
+
+
+def test_depth_and_type_labels_are_capped():
+    game_collector = collector()
+    game_collector.max_depth_labels = 2
+    game_collector.max_type_labels = 1
+    registry = game_collector.monsters
+    for monster_id, depth, monster_type in ((1, 1, "rat"), (2, 1, "rat"), (3, 2, "rat"),
+                                            (4, 2, "goblin"), (5, 3, "jackal")):
+        registry.upsert(monster(monster_id, depth=depth, type=monster_type, hp=5))
+    registry.mark_dead(5)
+
+    families = {family.name: family for family in game_collector.collect()}
+    alive = {(s.labels["depth"], s.labels["type"]): s.value
+             for s in families["brogue_monsters_alive"].samples}
+    deaths = {(s.labels["depth"], s.labels["type"]): s.value
+              for s in families["brogue_monster_deaths"].samples}
+
+    assert alive == {("1", "rat"): 2, ("2", "rat"): 1, ("2", "other"): 1, ("other", "other"): 0}
+    assert deaths[("other", "other")] == 1
+    assert families["brogue_monster_hp"].samples[0].value == 10
+    assert families["brogue_monster_metric_series_dropped"].samples[0].value == 0
+
+    # Depths 1 and 2 tie and depth 1 is kept: (2, goblin) and (3, jackal) now share a series
+    game_collector.max_depth_labels = 1
+    families = {family.name: family for family in game_collector.collect()}
+    assert families["brogue_monster_metric_series_dropped"].samples[0].value == 1
+
+
+def test_deduplicated_ingest_payloads_are_counted_per_stream():
+    game_collector = collector()
+    assert "brogue_ingest_deduplicated" not in {f.name for f in game_collector.collect()}
+
+    game_collector.ingest = IngestDedup()
+    before = game_collector.ingest.counts()["pack"]
+    game_collector.ingest.deduplicated("pack")
+    families = {family.name: family for family in game_collector.collect()}
+    samples = {s.labels["stream"]: s.value for s in families["brogue_ingest_deduplicated"].samples
+               if s.name.endswith("_total")}
+
+    assert samples["pack"] == before + 1
+    assert set(samples) == {"player", "monsters", "items", "pack", "gamestate", "gamestats", "tick"}
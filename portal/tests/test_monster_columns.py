@@ -0,0 +1,57 @@
+"""
+Tests for the NumPy column store and stats in `app.services.monster_columns`.
+"""
+import pytest
+from app.services.monster_registry import MonsterRegistry
+from app.services.state_backend import MemoryBackend
+from tests.test_monster_registry import monster
+from tests.test_monster_validation import payload
+
+np = pytest.importorskip("numpy")
+
+
+def test_stats_group_the_stored_monsters():
+    registry = MonsterRegistry(MemoryBackend())
+    registry.upsert(monster(1, depth=1, hp=4))
+    registry.upsert(monster(2, depth=1, hp=8))
+    registry.upsert(monster(3, depth=2, hp=6, type="goblin"))
+    registry.mark_dead(3)
+
+    stats = registry.stats(group_by="depth")
+    assert stats["count"] == 3
+    assert [(group["depth"], group["count"]) for group in stats["groups"]] == [(1, 2), (2, 1)]
+    assert stats["groups"][0]["hp"] == {"min": 4, "mean": 6.0, "max": 8}
+    assert stats["groups"][0]["mean_lifespan"] is None
+    assert stats["groups"][1]["mean_lifespan"] >= 0
+
+    stats = registry.stats(group_by="type", status="alive", bins=2)
+    assert [group["type"] for group in stats["groups"]] == ["rat"]
+    assert stats["histogram"]["counts"] == [1, 1]
+
+    with pytest.raises(ValueError):
+        registry.stats(field="name")
+
+
+def test_the_number_of_bins_is_capped(client):
+    client.post("/monsters/update", json=[payload(1)])
+
+    assert len(client.get("/monsters/stats?bins=1000").get_json()["histogram"]["counts"]) == 1000
+    for bins in ("0", "1001", "1000000000", "many"):
+        assert client.get(f"/monsters/stats?bins={bins}").status_code == 400
+
+
+def test_rows_stay_dense_when_monsters_are_dropped():
+    registry = MonsterRegistry(MemoryBackend(), max_dead=1)
+    for monster_id in range(1, 2000):
+        registry.upsert(monster(monster_id, hp=monster_id))
+    registry.mark_dead(1)
+    registry.mark_dead(2)
+
+    assert len(registry.columns) == 1998
+    stats = registry.stats(group_by="status")
+    assert [(group["status"], group["count"]) for group in stats["groups"]] == \
+        [("alive", 1997), ("dead", 1)]
+    assert stats["groups"][0]["hp"]["min"] == 3
+
+    registry.clear()
+    assert registry.stats()["count"] == 0
@@ -0,0 +1,45 @@
+"""
+Tests for the filtering and cursor pagination done by `MonsterIndex`.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.services.monster_index import MonsterIndex, DEPTH, STATUS, TYPE, ALIVE, DEAD
+
+
+def monster(monster_id, depth=1, monster_type="rat", is_dead=False, spawned=0, died=None):
+    return SimpleNamespace(
+        id=monster_id, depth=depth, type=monster_type, hp=5, is_dead=is_dead, is_admin_kill=False,
+        spawn_timestamp=datetime.fromtimestamp(spawned, timezone.utc),
+        death_timestamp=datetime.fromtimestamp(died, timezone.utc) if died is not None else None,
+    )
+
+
+def test_pages_follow_the_cursor():
+    index = MonsterIndex()
+    for monster_id in range(1, 8):
+        index.update(monster(monster_id, depth=monster_id % 2))
+
+    assert index.query({DEPTH: 1}, limit=2) == ([1, 3], 3)
+    assert index.query({DEPTH: 1}, cursor=3, limit=2) == ([5, 7], None)
+
+
+def test_reindexing_moves_monsters_between_keys():
+    index = MonsterIndex()
+    index.update(monster(1, monster_type="goblin"))
+    index.update(monster(2))
+
+    index.update(monster(1, monster_type="goblin", is_dead=True, died=50))
+
+    assert index.query({STATUS: ALIVE}) == ([2], None)
+    assert index.query({STATUS: DEAD, TYPE: "goblin"}) == ([1], None)
+    assert index.count(STATUS, ALIVE) == 1
+
+
+def test_time_windows():
+    index = MonsterIndex()
+    for monster_id, spawned in ((1, 10), (2, 20), (3, 30)):
+        index.update(monster(monster_id, spawned=spawned))
+
+    assert index.query(spawned=(15, None)) == ([2, 3], None)
+    assert index.query(spawned=(None, 20)) == ([1, 2], None)
+    assert index.query(died=(0, None)) == ([], None)
@@ -0,0 +1,43 @@
+"""
+Tests for the resourceVersion-aware store kept by `MonsterInformer`.
+"""
+from app.services.informer import MonsterInformer
+
+
+def monster(name, resource_version, hp=10):
+    return {"metadata": {"name": name, "resourceVersion": resource_version}, "spec": {"hp": hp}}
+
+
+def test_replace_all_marks_store_synced():
+    informer = MonsterInformer(api=None, namespace="dungeon-master-system")
+    assert not informer.has_synced()
+
+    informer.replace_all([monster("rat", "5"), monster("goblin", "6")], "6")
+
+    assert informer.has_synced()
+    assert informer.contains("rat")
+    assert sorted(m["metadata"]["name"] for m in informer.list()) == ["goblin", "rat"]
+
+
+def test_stale_events_do_not_overwrite_newer_objects():
+    informer = MonsterInformer(api=None, namespace="dungeon-master-system")
+    informer.replace_all([], "1")
+
+    informer.upsert(monster("rat", "10", hp=4))
+    informer._handle_event("MODIFIED", monster("rat", "9", hp=9))
+    assert informer.get("rat")["spec"]["hp"] == 4
+
+    informer._handle_event("DELETED", monster("rat", "8"))
+    assert informer.contains("rat")
+
+    informer._handle_event("DELETED", monster("rat", "11"))
+    assert not informer.contains("rat")
+
+
+def test_get_returns_a_copy():
+    informer = MonsterInformer(api=None, namespace="dungeon-master-system")
+    informer.replace_all([monster("rat", "1")], "1")
+
+    informer.get("rat")["spec"]["hp"] = 0
+
+    assert informer.get("rat")["spec"]["hp"] == 10
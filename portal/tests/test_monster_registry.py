@@ -0,0 +1,168 @@
+"""
+Tests for the monster transitions and lookup indexes kept by `MonsterRegistry`.
+"""
+import time
+from app.models.monsters import Monster, MonsterRecord
+from app.services.monster_index import ALIVE, DEAD
+from app.services.monster_registry import MonsterRegistry
+from app.services.state_backend import MemoryBackend
+
+
+def monster(monster_id, depth=1, is_dead=False, **fields):
+    data = {
+        "id": monster_id, "name": f"monster-{monster_id}", "pod_name": f"pod-{monster_id}",
+        "type": "rat", "hp": 5, "max_hp": 10, "depth": depth, "is_dead": is_dead,
+        "position": {"x": 1, "y": 2}, "attack_speed": 100, "movement_speed": 100,
+        "accuracy": 70, "defense": 0, "damage_min": 1, "damage_max": 3,
+        "turns_between_regen": 20,
+    }
+    data.update(fields)
+    return Monster(**data)
+
+
+def test_a_dead_update_moves_the_monster_out_of_the_active_monsters():
+    registry = MonsterRegistry()
+    assert registry.upsert(monster(1)) is True
+    spawned = registry.get(1).spawn_timestamp
+
+    assert registry.upsert(monster(1, is_dead=True)) is False
+
+    assert registry.active() == []
+    assert [m.id for m in registry.dead()] == [1]
+    assert registry.count(ALIVE) == 0 and registry.count(DEAD) == 1
+    assert registry.get(1).spawn_timestamp == spawned
+    assert registry.get(1).death_timestamp is not None
+
+
+def test_lookups_follow_renamed_pods_and_depths():
+    registry = MonsterRegistry()
+    registry.upsert(monster(1, depth=2))
+    registry.upsert(monster(2, depth=2))
+    registry.upsert(monster(1, depth=3, pod_name="pod-1b"))
+
+    assert registry.get_by_pod_name("pod-1") is None
+    assert registry.get_by_pod_name("pod-1b").id == 1
+    assert registry.get_by_name("monster-2").id == 2
+    assert registry.ids_at_depth(2) == [2]
+    assert registry.ids_at_depth(3) == [1]
+    assert {monster_id: m.pod_name for monster_id, m in registry.get_many([1, 2, 5]).items()} == \
+        {1: "pod-1b", 2: "pod-2"}
+
+
+def test_admin_kills_survive_later_updates_and_reset():
+    registry = MonsterRegistry()
+    registry.upsert(monster(1))
+
+    killed = registry.mark_dead(1, admin_kill=True)
+    assert killed.is_dead and killed.is_admin_kill
+    assert registry.mark_dead(1) is None
+    assert registry.admin_kill_ids() == [1]
+    version = registry.admin_kills_version
+
+    registry.upsert(monster(1, is_dead=True))
+    assert registry.is_admin_kill(1) and registry.get(1).is_admin_kill
+    assert registry.get(1).death_timestamp == killed.death_timestamp
+
+    registry.clear()
+    assert len(registry) == 0 and registry.get_by_pod_name("pod-1") is None
+    assert registry.admin_kill_ids() == [] and registry.admin_kills_version > version
+
+
+def test_group_totals_follow_hp_and_deaths():
+    registry = MonsterRegistry()
+    registry.upsert(monster(1, depth=2, hp=4))
+    registry.upsert(monster(2, depth=2, hp=6))
+    registry.upsert(monster(1, depth=2, hp=3))
+    assert registry.groups() == {(2, "rat"): (2, 0, 9)}
+
+    registry.mark_dead(2)
+    registry.upsert(monster(1, depth=3, hp=3))
+    assert registry.groups() == {(2, "rat"): (0, 1, 0), (3, "rat"): (1, 0, 3)}
+
+    registry.clear()
+    assert registry.groups() == {}
+
+
+def test_old_dead_monsters_are_compacted_into_the_history():
+    registry = MonsterRegistry(MemoryBackend(), max_dead=2)
+    for monster_id in range(1, 6):
+        registry.upsert(monster(monster_id, depth=1 + monster_id % 2))
+    for monster_id in (1, 2, 3):
+        registry.mark_dead(monster_id, admin_kill=monster_id == 1)
+
+    assert [m.id for m in registry.dead()] == [2, 3]
+    assert registry.get(1) is None and registry.admin_kill_ids() == []
+    assert registry.count(DEAD) == 3 and registry.created_count() == 5
+    assert registry.history()["admin_kills"] == 1
+    assert registry.groups()[(2, "rat")] == (1, 2, 5)
+    buckets, count, _ = registry.lifespans()
+    assert count == 3 and buckets[0] == 3
+
+    # A late update of the evicted monster does not bring it back
+    assert registry.upsert(monster(1, is_dead=True)) is None
+    assert len(registry) == 4
+
+    registry.clear()
+    assert registry.count(DEAD) == 0 and registry.history() == {}
+    assert registry.upsert(monster(1)) is True
+
+
+def test_only_the_latest_evicted_ids_are_kept():
+    registry = MonsterRegistry(MemoryBackend(), max_dead=1, max_evicted_ids=3)
+    for monster_id in (9, 2, 7, 4, 5, 1):
+        registry.upsert(monster(monster_id, is_dead=True))
+
+    assert [m.id for m in registry.dead()] == [1]
+    assert list(registry._evicted_ids) == [7, 4, 5]  # pylint: disable=protected-access
+    # Late updates of the latest evictions are ignored; an older eviction comes back as new
+    assert registry.upsert(monster(5, is_dead=True)) is None
+    assert registry.upsert(monster(9)) is True
+    assert registry.upsert(monster(3)) is True
+
+
+def test_patches_keep_the_timestamps_and_admin_kills_like_upserts():
+    registry = MonsterRegistry(MemoryBackend())
+    registry.upsert(monster(1, depth=2))
+    registry.upsert(monster(2))
+    registry.mark_dead(2, admin_kill=True)
+    spawned = registry.get(1).spawn_timestamp
+
+    moved, = registry.patch({1: {"x": 7, "spawn_timestamp": None}})
+    assert (moved.x, moved.y, moved.spawn_timestamp) == (7, 2, spawned)
+    assert registry.get(1) is moved and registry.active() == [moved]
+
+    died, killed = registry.patch({1: {"is_dead": True, "depth": 3}, 2: {"is_admin_kill": False},
+                                   5: {"hp": 1}})
+    assert died.death_timestamp is not None and registry.ids_at_depth(3) == [1]
+    assert registry.count(DEAD) == 2 and killed.is_admin_kill
+    assert registry.patch({1: {"is_dead": True}})[0].death_timestamp == died.death_timestamp
+
+
+def test_dead_monsters_older_than_the_max_age_are_evicted():
+    registry = MonsterRegistry(MemoryBackend(), max_dead_age=0.05)
+    registry.upsert(monster(1))
+    registry.upsert(monster(2))
+    registry.mark_dead(1)
+    assert registry.history() == {}
+
+    time.sleep(0.1)
+    registry.upsert(monster(3, is_dead=True))
+
+    assert [m.id for m in registry.dead()] == [3]
+    assert registry.history()["dead"] == 1
+    assert registry.latest_times()[1] == registry.get(3).death_timestamp.timestamp()
+
+
+def test_records_serialize_like_the_validated_monster():
+    registry = MonsterRegistry()
+    received = monster(1, namespace="dungeon")
+    registry.upsert(received)
+
+    record = registry.mark_dead(1)
+
+    assert isinstance(record, MonsterRecord)
+    assert record.dict() == received.model_copy(
+        update={"is_dead": True, "death_timestamp": record.death_timestamp}).model_dump()
+    assert MonsterRecord.from_monster(Monster.model_validate_json(record.to_json())).dict() \
+        == record.dict()
+    assert registry.get(1).position.x == 1 and registry.get(1) is record
@@ -0,0 +1,199 @@
+"""
+Tests for the `MonsterSyncQueue` write-behind queue.
+
+The Kubernetes service is replaced by a recorder that blocks on its first call, so operations
+queued while the worker is busy can be checked for coalescing.
+"""
+import threading
+import time
+from flask import Flask
+from kubernetes.client.rest import ApiException
+from app.services.monster_sync import MonsterSyncQueue
+
+NAMESPACE = "dungeon-master-system"
+
+
+class RecordingService:
+    """Records every Monster resource call and blocks the first one until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def _record(self, *call):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        self.calls.append(call)
+
+    def create_monster_resource(self, name, namespace, monster_data):
+        self._record("create", name, monster_data["hp"])
+
+    def update_monster_resource(self, name, namespace, monster_data):
+        self._record("update", name, monster_data["hp"])
+
+    def delete_monster_resource(self, name, namespace):
+        self._record("delete", name)
+
+
+def make_queue():
+    service = RecordingService()
+    queue = MonsterSyncQueue(service)
+    queue.init_app(Flask(__name__))
+    return queue, service
+
+
+def test_updates_are_coalesced_into_latest():
+    queue, service = make_queue()
+    queue.enqueue_update("busy", NAMESPACE, {"hp": 0})
+    assert service.started.wait(5)
+
+    for hp in range(1, 6):
+        queue.enqueue_update("rat", NAMESPACE, {"hp": hp})
+    assert queue.pending_count() == 1
+
+    service.release.set()
+    assert queue.flush(5)
+    assert service.calls == [("update", "busy", 0), ("update", "rat", 5)]
+    queue.shutdown(5)
+
+
+def test_update_is_folded_into_pending_create():
+    queue, service = make_queue()
+    queue.enqueue_update("busy", NAMESPACE, {"hp": 0})
+    assert service.started.wait(5)
+
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 10})
+    queue.enqueue_update("rat", NAMESPACE, {"hp": 7})
+
+    service.release.set()
+    assert queue.flush(5)
+    assert service.calls[1:] == [("create", "rat", 7)]
+    queue.shutdown(5)
+
+
+def test_delete_cancels_pending_writes():
+    queue, service = make_queue()
+    queue.enqueue_update("busy", NAMESPACE, {"hp": 0})
+    assert service.started.wait(5)
+
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 10})
+    queue.enqueue_update("rat", NAMESPACE, {"hp": 7})
+    queue.enqueue_delete("rat", NAMESPACE)
+    queue.enqueue_update("rat", NAMESPACE, {"hp": 3})
+
+    service.release.set()
+    assert queue.flush(5)
+    assert service.calls[1:] == [("delete", "rat")]
+    queue.shutdown(5)
+
+
+def test_shutdown_drains_queue():
+    queue, service = make_queue()
+    service.release.set()
+    for index in range(10):
+        queue.enqueue_create(f"monster-{index}", NAMESPACE, {"hp": index})
+
+    queue.shutdown(5)
+    assert len(service.calls) == 10
+    assert queue.pending_count() == 0
+
+
+class FlakyService:
+    """Fails every create with the given errors, in order, then succeeds."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.attempts = 0
+        self.calls = []
+
+    def create_monster_resource(self, name, namespace, monster_data):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.calls.append(("create", name, monster_data["hp"]))
+
+    def update_monster_resource(self, name, namespace, monster_data):
+        self.calls.append(("update", name, monster_data["hp"]))
+
+    def delete_monster_resource(self, name, namespace):
+        self.calls.append(("delete", name))
+
+
+def make_flaky_queue(*errors, backoff=0.01):
+    service = FlakyService(*errors)
+    queue = MonsterSyncQueue(service, retry_attempts=3, retry_backoff=backoff)
+    queue.init_app(Flask(__name__))
+    return queue, service
+
+
+def test_clear_waits_for_the_write_being_applied():
+    queue, service = make_queue()
+    queue.enqueue_create("old-game", NAMESPACE, {"hp": 1})
+    assert service.started.wait(5)
+    queue.enqueue_create("queued", NAMESPACE, {"hp": 2})
+
+    threading.Timer(0.1, service.release.set).start()
+    assert queue.clear(5)
+
+    assert service.calls == [("create", "old-game", 1)]
+    queue.shutdown(5)
+
+
+def test_transient_failures_are_retried_with_backoff():
+    wrapped = RuntimeError("Failed to create Monster resource")
+    wrapped.__cause__ = ApiException(status=503)
+    queue, service = make_flaky_queue(ApiException(status=429), wrapped)
+
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 1})
+    assert queue.flush(5)
+
+    assert service.attempts == 3
+    queue.shutdown(5)
+
+
+def test_other_failures_and_exhausted_retries_are_not_retried():
+    queue, service = make_flaky_queue(ApiException(status=422))
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 1})
+    assert queue.flush(5)
+    assert service.attempts == 1
+
+    queue, service = make_flaky_queue(*[ApiException(status=500)] * 5)
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 1})
+    assert queue.flush(5)
+    assert service.attempts == 3
+
+
+def test_a_reset_abandons_a_write_waiting_to_retry():
+    queue, service = make_flaky_queue(ApiException(status=503), backoff=30)
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 1})
+    while service.attempts == 0:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    assert queue.clear(5)
+
+    assert time.monotonic() - started < 5
+    assert service.attempts == 1
+    queue.shutdown(5)
+
+
+def test_the_next_update_of_a_failed_create_creates_the_resource():
+    queue, service = make_flaky_queue(ApiException(status=422), ApiException(status=422))
+    queue.enqueue_create("rat", NAMESPACE, {"hp": 1})
+    queue.enqueue_create("bat", NAMESPACE, {"hp": 1})
+    assert queue.flush(5)
+
+    queue.enqueue_update("rat", NAMESPACE, {"hp": 2})
+    assert queue.flush(5)
+    queue.enqueue_update("rat", NAMESPACE, {"hp": 3})
+    # A deleted monster is not created again by a late update
+    queue.enqueue_delete("bat", NAMESPACE)
+    assert queue.flush(5)
+    queue.enqueue_update("bat", NAMESPACE, {"hp": 2})
+    assert queue.flush(5)
+
+    assert service.calls == [("create", "rat", 2), ("update", "rat", 3), ("delete", "bat"),
+                             ("update", "bat", 2)]
+    queue.shutdown(5)
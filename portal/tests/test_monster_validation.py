@@ -0,0 +1,35 @@
+"""
+Tests for the one-pass validation of monster payloads with `MONSTER_LIST`.
+"""
+import pytest
+from pydantic import ValidationError
+from app.models.monsters import MONSTER_LIST, monster_errors
+from tests.test_monster_registry import monster
+
+
+def payload(monster_id, **fields):
+    data = monster(monster_id).model_dump(exclude={"spawn_timestamp", "death_timestamp"})
+    data.update(fields)
+    return data
+
+
+def test_valid_payloads_are_stamped_with_a_spawn_time():
+    monsters = MONSTER_LIST.validate_python([payload(1), payload(2)])
+
+    assert [m.id for m in monsters] == [1, 2]
+    assert all(m.spawn_timestamp is not None for m in monsters)
+
+
+def test_errors_are_reported_per_item():
+    with pytest.raises(ValidationError) as error:
+        MONSTER_LIST.validate_python([payload(1), payload(2, hp="x"), payload(3, position={"x": 1})])
+
+    assert [(e["index"], e["field"]) for e in monster_errors(error.value)] == \
+        [(1, "hp"), (2, "position.y")]
+
+
+def test_a_payload_that_is_not_a_list_is_rejected():
+    with pytest.raises(ValidationError) as error:
+        MONSTER_LIST.validate_python({"id": 1})
+
+    assert monster_errors(error.value)[0]["index"] is None
@@ -0,0 +1,41 @@
+"""
+Tests for the monster routes: the admin-kill set the game polls every tick.
+"""
+from app.services import state_backend
+from app.services.state_backend import MemoryBackend
+from tests.test_monster_validation import payload
+
+
+def test_the_admin_kill_set_is_answered_with_304_until_it_changes(client):
+    client.post("/monsters/update", json=[payload(1), payload(2)])
+
+    response = client.get("/monsters/admin-kills/set")
+    assert response.status_code == 200
+    assert response.get_json()["ids"] == []
+    version = response.get_json()["version"]
+    assert client.get(f"/monsters/admin-kills/set?since={version}").status_code == 304
+
+    client.get("/monsters/admin-kill/2")
+
+    response = client.get(f"/monsters/admin-kills/set?since={version}")
+    assert response.status_code == 200
+    assert response.get_json()["ids"] == [2]
+    assert response.get_json()["version"] != version
+
+
+def test_a_version_from_before_a_restart_never_matches(client):
+    client.post("/monsters/update", json=[payload(1)])
+    client.get("/monsters/admin-kill/1")
+    version = client.get("/monsters/admin-kills/set").get_json()["version"]
+
+    # A restarted portal counts its admin kills from zero again
+    from app.routes import monsters
+    state_backend.set_backend(MemoryBackend())
+    monsters.monster_registry.clear()
+    client.post("/monsters/update", json=[payload(3)])
+    client.get("/monsters/admin-kill/3")
+
+    response = client.get(f"/monsters/admin-kills/set?since={version}")
+    assert response.status_code == 200
+    assert response.get_json()["ids"] == [3]
+    assert client.get("/monsters/admin-kills/set?since=garbage").status_code == 200
@@ -0,0 +1,80 @@
+"""
+Tests for the monsties routes: the pod names waiting for the game, and the Deployment and Pod
+operations served by `MonstiesService`.
+"""
+from unittest import mock
+import pytest
+from kubernetes.client.rest import ApiException
+from tests.test_monster_validation import payload
+
+
+@pytest.fixture
+def service(app):
+    from app.routes import monsties
+    with mock.patch.object(monsties, "monsties_service") as service:
+        yield service
+
+
+def test_added_pod_names_are_claimed_once(client):
+    client.post("/monsties/add", json={"pod-name": "monstie-a"})
+    client.get("/monsties/add/monstie-b")
+    client.get("/monsties/add/monstie-b")
+
+    assert client.get("/monsties/new").get_json() == {"pod-names": ["monstie-a", "monstie-b"]}
+    assert client.get("/monsties/new").get_json() == {"pod-names": []}
+    assert client.get("/monsties/list").get_json() == ["monstie-a", "monstie-b"]
+
+    client.post("/monsties/reset")
+    assert client.get("/monsties/list").get_json() == []
+
+
+def test_the_list_answers_unchanged_polls_with_304(client):
+    response = client.get("/monsties/list")
+    etag = response.headers["ETag"]
+    assert client.get("/monsties/list", headers={"If-None-Match": etag}).status_code == 304
+
+    client.get("/monsties/add/monstie-a")
+    client.get("/monsties/new")
+    assert client.get("/monsties/list", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_data_lists_the_live_monsties(client):
+    client.post("/monsters/update", json=[
+        payload(1, type="monstie"), payload(2, type="monstie"), payload(3),
+    ])
+    client.get("/monsters/admin-kill/2")
+
+    assert [m["id"] for m in client.get("/monsties/data").get_json()] == [1]
+
+
+def test_deployments_and_pods_come_from_the_service(client, service):
+    service.deployments_pods.return_value = {
+        "monstie": {"replicas": 2, "pods": [{"name": "monstie-abc", "status": "Running"}]}
+    }
+
+    response = client.get("/monsties/deployments-pods")
+
+    assert response.status_code == 200
+    assert response.get_json()["monstie"]["replicas"] == 2
+
+
+def test_deployment_and_pod_operations(client, service):
+    assert client.post("/monsties/create-deployment").status_code == 201
+    name = service.create_deployment.call_args.args[0]
+    assert name.startswith("monstie-deployment-")
+
+    assert client.post("/monsties/delete-deployment",
+                       json={"deployment-name": name}).status_code == 200
+    assert client.delete("/monsties/delete-pod/monstie-abc").status_code == 200
+    service.delete_deployment.assert_called_once_with(name)
+    service.delete_pod.assert_called_once_with("monstie-abc")
+
+    assert client.post("/monsties/delete-pod", json={}).status_code == 400
+
+
+def test_api_errors_are_reported(client, service):
+    service.delete_pod.side_effect = ApiException(status=404)
+    service.deployments_pods.side_effect = ApiException(status=503)
+
+    assert client.delete("/monsties/delete-pod/missing").status_code == 404
+    assert client.get("/monsties/deployments-pods").status_code == 500
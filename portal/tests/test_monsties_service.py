@@ -0,0 +1,123 @@
+"""
+Tests for the owner-reference grouping of monstie Pods under their Deployments, and for the
+shared deployments-and-pods view of `MonstiesService`.
+"""
+from unittest import mock
+import pytest
+from app.services import monsties_service
+from app.services.informer import Informer, owner_index
+from app.services.monsties_service import MonstiesService, build_deployments_pods, group_by_owner
+
+
+def obj(name, resource_version="1", owner_kind=None, owner=None, **fields):
+    metadata = {"name": name, "resourceVersion": resource_version}
+    if owner:
+        metadata["ownerReferences"] = [{"kind": owner_kind, "name": owner}]
+    return {"metadata": metadata, **fields}
+
+
+def deployment(name, replicas=2):
+    return obj(name, spec={"replicas": replicas})
+
+
+def replica_set(name, deployment_name):
+    return obj(name, owner_kind="Deployment", owner=deployment_name)
+
+
+def pod(name, replica_set_name, phase="Running", resource_version="1"):
+    return obj(name, resource_version, "ReplicaSet", replica_set_name, status={"phase": phase})
+
+
+def test_prefix_named_deployments_are_not_mixed_up():
+    deployments = [deployment("monstie"), deployment("monstie-deployment")]
+    replica_sets = group_by_owner(
+        [replica_set("monstie-deployment-5d8f", "monstie-deployment")], "Deployment"
+    )
+    pods = group_by_owner([pod("monstie-deployment-5d8f-abcde", "monstie-deployment-5d8f")],
+                          "ReplicaSet")
+
+    view = build_deployments_pods(
+        deployments, lambda name: replica_sets.get(name, []), lambda name: pods.get(name, [])
+    )
+
+    assert view["monstie"]["pods"] == []
+    assert view["monstie-deployment"]["pods"] == [
+        {"name": "monstie-deployment-5d8f-abcde", "status": "Running"}
+    ]
+
+
+def test_informer_index_follows_changes():
+    pods = Informer(api=None, list_method="list_namespaced_pod", namespace="monsties")
+    pods.add_index("replicaset", owner_index("ReplicaSet"))
+    pods.replace_all([pod("a", "rs-1"), pod("b", "rs-1")], "1")
+
+    assert sorted(p["metadata"]["name"] for p in pods.by_index("replicaset", "rs-1")) == ["a", "b"]
+
+    pods.upsert(pod("b", "rs-2", resource_version="2"))
+    pods.remove("a", "3")
+
+    assert pods.by_index("replicaset", "rs-1") == []
+    assert [p["metadata"]["name"] for p in pods.by_index("replicaset", "rs-2")] == ["b"]
+
+
+@pytest.fixture
+def service():
+    changes = []
+    with mock.patch.object(Informer, "start"), \
+            mock.patch.object(monsties_service.client, "AppsV1Api"), \
+            mock.patch.object(monsties_service.client, "CoreV1Api"):
+        service = MonstiesService(mock.MagicMock(), on_change=lambda: changes.append(1))
+        service.changes = changes
+        yield service
+
+
+def sync(service, pods):
+    # pylint: disable=protected-access
+    service._deployments.replace_all([deployment("monstie")], "1")
+    service._replica_sets.replace_all([replica_set("monstie-rs", "monstie")], "1")
+    service._pods.replace_all(pods, "1")
+
+
+def pod_names(view):
+    return sorted(p["name"] for p in view["monstie"]["pods"])
+
+
+def test_the_view_is_listed_until_the_informers_sync(service):
+    service.apps_api.api_client.sanitize_for_serialization = lambda value: value
+    service.apps_api.list_namespaced_deployment.return_value = {"items": [deployment("monstie")]}
+    service.apps_api.list_namespaced_replica_set.return_value = {
+        "items": [replica_set("monstie-rs", "monstie")]
+    }
+    service.core_api.list_namespaced_pod.return_value = {"items": [pod("a", "monstie-rs")]}
+
+    assert pod_names(service.deployments_pods()) == ["a"]
+    assert service.core_api.list_namespaced_pod.call_count == 1
+
+
+def test_the_view_is_shared_until_a_change(service):
+    sync(service, [pod("a", "monstie-rs")])
+
+    view = service.deployments_pods()
+    assert service.deployments_pods() is view
+    # pylint: disable=protected-access
+    service._pods.upsert(pod("b", "monstie-rs"))
+
+    assert pod_names(service.deployments_pods()) == ["a", "b"]
+    service.core_api.list_namespaced_pod.assert_not_called()
+    assert len(service.changes) == 4
+
+
+def test_a_view_built_before_a_change_is_not_kept(service):
+    sync(service, [pod("a", "monstie-rs")])
+    build = monsties_service.build_deployments_pods
+
+    def build_then_change(*args):
+        view = build(*args)
+        # The pod informer changes after the view read it
+        service._pods.upsert(pod("b", "monstie-rs"))  # pylint: disable=protected-access
+        return view
+
+    with mock.patch.object(monsties_service, "build_deployments_pods", build_then_change):
+        assert pod_names(service.deployments_pods()) == ["a"]
+
+    assert pod_names(service.deployments_pods()) == ["a", "b"]
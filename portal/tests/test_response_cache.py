@@ -0,0 +1,48 @@
+"""
+Tests for the tagged, single-flight `ResponseCache`.
+"""
+import threading
+from flask import Flask, jsonify
+from app.services.response_cache import ResponseCache
+
+
+def test_entries_are_served_until_the_tag_changes():
+    app = Flask(__name__)
+    cache = ResponseCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return jsonify({"builds": len(builds)})
+
+    with app.app_context():
+        assert cache.get("/data", "v1", build).get_json() == {"builds": 1}
+        assert cache.get("/data", "v1", build).get_json() == {"builds": 1}
+        assert cache.get("/data", "v2", build).get_json() == {"builds": 2}
+
+
+def test_concurrent_misses_build_once():
+    app = Flask(__name__)
+    cache = ResponseCache()
+    release = threading.Event()
+    builds = []
+    results = []
+
+    def build():
+        builds.append(1)
+        release.wait(5)
+        return jsonify({"ok": True})
+
+    def request():
+        with app.app_context():
+            results.append(cache.get("/data", "v1", build).get_json())
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(builds) == 1
+    assert results == [{"ok": True}] * 5
@@ -0,0 +1,108 @@
+"""
+Tests for the state containers in `app.services.state` and the backends they are stored in.
+"""
+import threading
+import pytest
+from app.services import state_backend
+from app.services.monster_index import DEAD
+from app.services.monster_registry import MonsterRegistry
+from app.services.state import ClaimQueue, SnapshotDict
+from app.services.state_backend import MemoryBackend, SQLiteBackend, StateBackend
+from tests.test_monster_registry import monster
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    backend = MemoryBackend() if request.param == "memory" \
+        else SQLiteBackend(str(tmp_path / "state.db"))
+    previous = state_backend.get_backend()
+    state_backend.set_backend(backend)
+    yield backend
+    state_backend.set_backend(previous)
+
+
+def test_snapshots_are_not_changed_by_later_writes(backend):
+    data = SnapshotDict("player", {"hp": 10})
+    snapshot = data.snapshot()
+
+    data.update({"hp": 5, "gold": 3})
+    assert snapshot == {"hp": 10}
+    assert data.snapshot() == {"hp": 5, "gold": 3}
+
+    data.clear()
+    assert not data and data.get("hp") is None
+
+
+def test_only_shared_backends_keep_records_and_events():
+    with pytest.raises(TypeError):
+        StateBackend()  # pylint: disable=abstract-class-instantiated
+
+    backend = MemoryBackend()
+    with pytest.raises(NotImplementedError):
+        backend.record_put("monsters", 1, "{}")
+    with pytest.raises(NotImplementedError):
+        backend.event_append("player", "{}")
+
+
+def test_concurrent_claims_never_return_an_item_twice(backend):
+    queue = ClaimQueue("monsties")
+    claims = []
+
+    def produce(start):
+        for item in range(start, start + 100):
+            queue.add(item)
+
+    def consume():
+        for _ in range(100):
+            claims.extend(queue.claim())
+
+    threads = [threading.Thread(target=produce, args=(start,)) for start in (0, 100)]
+    threads += [threading.Thread(target=consume) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    claims.extend(queue.claim())
+
+    assert sorted(claims) == list(range(200))
+    assert sorted(queue.claimed()) == list(range(200))
+    assert not queue.add(7, unique=True) and queue.pending() == ()
+
+
+def test_workers_sharing_a_database_see_each_others_monsters(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = MonsterRegistry(SQLiteBackend(path)), MonsterRegistry(SQLiteBackend(path))
+
+    first.upsert(monster(1))
+    first.upsert(monster(2, depth=3))
+    assert second.get_by_pod_name("pod-2").depth == 3
+
+    killed = second.mark_dead(1, admin_kill=True)
+    assert first.is_admin_kill(1) and first.count(DEAD) == 1
+    assert first.get(1).death_timestamp == killed.death_timestamp
+    assert first.admin_kills_version == second.admin_kills_version == 1
+
+    second.clear()
+    assert len(first) == 0
+    first.upsert(monster(3))
+    assert [m.id for m in second.all()] == [3]
+
+
+def test_evictions_are_replayed_by_the_other_workers(tmp_path):
+    path = str(tmp_path / "state.db")
+    first = MonsterRegistry(SQLiteBackend(path), max_dead=1)
+    second = MonsterRegistry(SQLiteBackend(path))
+
+    for monster_id in (1, 2, 3):
+        first.upsert(monster(monster_id))
+    assert second.count(DEAD) == 0
+    first.mark_dead(1)
+    first.mark_dead(2)
+
+    assert second.get(1) is None and second.get(2).is_dead
+    assert second.count(DEAD) == 2 and second.created_count() == 3
+    assert second.upsert(monster(1, is_dead=True)) is None
+
+    restarted = MonsterRegistry(SQLiteBackend(path))
+    assert sorted(m.id for m in restarted.all()) == [2, 3]
+    assert restarted.upsert(monster(1)) is None
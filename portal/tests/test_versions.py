@@ -0,0 +1,45 @@
+"""
+Tests for the store version counters and the `versioned` conditional GET decorator.
+"""
+from flask import Flask, jsonify
+from app.services.versions import store_versions, versioned
+
+STORE = "test-store"
+
+
+def make_client():
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/data")
+    @versioned(STORE)
+    def data():
+        calls.append(1)
+        return jsonify({"calls": len(calls)})
+
+    return app.test_client(), calls
+
+
+def test_matching_etag_skips_the_view():
+    client, calls = make_client()
+
+    response = client.get("/data")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert calls == [1]
+
+
+def test_bump_invalidates_the_etag():
+    client, calls = make_client()
+    etag = client.get("/data").headers["ETag"]
+
+    store_versions.bump(STORE)
+
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(calls) == 2